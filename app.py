@@ -1,23 +1,17 @@
+import os
 import streamlit as st
-import json
-from tempfile import NamedTemporaryFile
 from parser.text_extractor import extract_text_from_pdf
-from parser.structured_parser import parse_passage_and_questions
-from jinja2 import Environment, FileSystemLoader
-from xhtml2pdf import pisa
-from pathlib import Path
+from parser.structured_parser import parse_all_passages_and_questions
+from export.pdf_exporter import build_export_sets, export_pdf
+from export.crop_exporter import export_crops
 
+# PDF 조각을 동시에 만들 프로세스 수. Streamlit 스크립트 안에서 프로세스 풀을 띄우지 않도록 기본은 1 (순차 변환)
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", "1"))
 
-def render_pdf(data):
-    base_dir = Path(__file__).resolve().parent
-    env = Environment(loader=FileSystemLoader(base_dir))
-    template = env.get_template("template.html")
-    html_out = template.render(**data)
 
-    tmp_pdf = NamedTemporaryFile(delete=False, suffix=".pdf")
-    with open(tmp_pdf.name, "wb") as f:
-        pisa.CreatePDF(html_out, dest=f)
-    return tmp_pdf.name
+def render_pdf(data):
+    # 지문 세트별로 나누어 만든 PDF 조각을 이어 붙임 (템플릿/글꼴은 프로세스 안에서 재사용)
+    return export_pdf(data["title"], data["sets"], workers=EXPORT_WORKERS)
 
 
 st.title("문제지 PDF 자동 추출 및 수정")
@@ -26,49 +20,41 @@ pdf_file = st.file_uploader("PDF 업로드", type="pdf")
 title = st.text_input("문제지 제목", "산수유문제")
 
 if pdf_file and st.button("1️⃣ 텍스트 추출 및 파싱"):
-    tmp = NamedTemporaryFile(delete=False, suffix=".pdf")
-    tmp.write(pdf_file.read())
-    tmp.flush()
-
-    raw_text = extract_text_from_pdf(tmp.name)
-    passage, questions = parse_passage_and_questions(raw_text)
+    # 업로드한 PDF를 임시 파일 없이 메모리에서 바로 처리
+    pdf_bytes = pdf_file.getvalue()
+    raw_text = extract_text_from_pdf(pdf_bytes)
+    passages, questions = parse_all_passages_and_questions(raw_text)
+    # 원본 영역 PDF 내보내기에 사용
+    st.session_state.source = (pdf_bytes, passages, questions)
 
     st.session_state.parsed_data = {
         "title": title,
-        "paragraphs": [passage.content],
-        "questions": [
-            {"question": q.stem, "choices": q.choices or [], "answer": q.answer or ""}
-            for q in questions if q.metadata.type == "multiple_choice"
-        ],
-        "oxQuestions": [
-            {"question": q.stem, "answer": q.answer or ""}
-            for q in questions if q.metadata.type == "ox"
-        ]
+        "sets": build_export_sets(passages, questions)
     }
     st.success("✅ 파싱 완료! 아래에서 수정하고 PDF를 생성하세요.")
 
 if "parsed_data" in st.session_state:
     data = st.session_state.parsed_data
 
-    st.subheader("📘 지문")
-    data["paragraphs"][0] = st.text_area(
-        "지문 내용", value=data["paragraphs"][0], height=150)
-
-    st.subheader("📗 객관식 문제")
-    for i, q in enumerate(data["questions"]):
-        q["question"] = st.text_input(
-            f"{i+1}. 질문", value=q["question"], key=f"q_{i}")
-        for j, choice in enumerate(q["choices"]):
-            q["choices"][j] = st.text_input(
-                f" - 선택지 {j+1}", value=choice, key=f"q_{i}_c_{j}")
+    for i, set_data in enumerate(data["sets"]):
+        st.subheader(f"📘 지문 {set_data['question_range'] or i + 1}")
+        set_data["passage"] = st.text_area(
+            "지문 내용", value=set_data["passage"], height=150, key=f"p_{i}")
 
-    st.subheader("📙 OX 문제")
-    for i, ox in enumerate(data["oxQuestions"]):
-        ox["question"] = st.text_input(
-            f"OX {i+1}. 질문", value=ox["question"], key=f"ox_{i}")
+        for j, q in enumerate(set_data["questions"]):
+            q["text"] = st.text_input(
+                f"{q['number']}. 질문", value=q["text"], key=f"q_{i}_{j}")
+            for k, choice in enumerate(q["choices"]):
+                q["choices"][k] = st.text_input(
+                    f" - 선택지 {k+1}", value=choice, key=f"q_{i}_{j}_c_{k}")
 
     if st.button("📄 PDF 생성 및 다운로드"):
-        pdf_path = render_pdf(data)
-        with open(pdf_path, "rb") as f:
-            st.download_button(
-                "📥 PDF 다운로드", f, file_name=f"{data['title']}.pdf", mime="application/pdf")
+        pdf_bytes = render_pdf(data)
+        st.download_button(
+            "📥 PDF 다운로드", pdf_bytes, file_name=f"{data['title']}.pdf", mime="application/pdf")
+
+    if "source" in st.session_state and st.button("✂️ 원본 영역으로 PDF 생성 (빠름, 수정 내용 미반영)"):
+        source_pdf, passages, questions = st.session_state.source
+        st.download_button(
+            "📥 원본 영역 PDF 다운로드", export_crops(source_pdf, passages, questions),
+            file_name=f"{data['title']}_원본.pdf", mime="application/pdf")
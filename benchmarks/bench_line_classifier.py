@@ -0,0 +1,80 @@
+"""
+줄 분류기 벤치마크
+기존 방식(줄마다 should_skip_line의 정규식 8개 + is_passage_start_enhanced + is_question_start)과
+미리 컴파일한 통합 분류기 classify_line의 속도를 비교하고, 두 방식의 분류 결과가 같은지 확인합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.bench_line_classifier [--input 텍스트파일] [--repeat 반복횟수]
+"""
+
+import argparse
+import re
+import time
+from parser.structured_parser import (
+    classify_line, parse_all_passages_and_questions,
+    LINE_SKIP, LINE_PASSAGE_START, LINE_QUESTION_START, LINE_BODY,
+)
+
+DEFAULT_INPUT = "data/passage_question_sets/extracted_full_text.txt"
+
+def legacy_classify_line(text: str) -> str:
+    """개선 전 파서가 줄마다 수행하던 판별 과정을 그대로 재현합니다."""
+    skip_patterns = [
+        r"^\d{4}학년도 대학수학능력시험 문제지$",
+        r"^제\d+\s*교시$",
+        r"^홀수형$",
+        r"^짝수형$",
+        r"^\d+\s*/\s*\d+$",
+        r"이 문제지에 관한 저작권은",
+        r"확인 사항",
+        r"자신이 선택한 과목인지 확인하시오"
+    ]
+    if any(re.search(p, text) for p in skip_patterns):
+        return LINE_SKIP
+    if re.match(r'^\s*\[(\d+)[~∼～-](\d+)\]\s*(.*)', text):
+        return LINE_PASSAGE_START
+    if re.match(r"^\d{1,2}\s*[.)]", text):
+        return LINE_QUESTION_START
+    return LINE_BODY
+
+def time_best(func, lines, rounds: int) -> float:
+    """rounds번 실행한 중 가장 빠른 시간을 반환합니다."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="줄 분류기 벤치마크")
+    parser.add_argument("--input", default=DEFAULT_INPUT, help="분류할 텍스트 파일")
+    parser.add_argument("--repeat", type=int, default=20, help="텍스트를 이어 붙일 횟수")
+    parser.add_argument("--rounds", type=int, default=5, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        text = f.read()
+    lines = [line.strip() for line in text.splitlines() if line.strip()] * args.repeat
+
+    mismatches = [line for line in lines[:len(lines) // args.repeat] if legacy_classify_line(line) != classify_line(line)[0]]
+    if mismatches:
+        print(f"[ERROR] 분류 결과 불일치 {len(mismatches)}줄: {mismatches[:3]}")
+        raise SystemExit(1)
+
+    legacy = time_best(legacy_classify_line, lines, args.rounds)
+    compiled = time_best(classify_line, lines, args.rounds)
+    print(f"[INFO] 입력: {args.input} x {args.repeat} ({len(lines)}줄)")
+    print(f"[INFO] 기존 분류: {legacy * 1000:.1f} ms ({len(lines) / legacy:,.0f} 줄/초)")
+    print(f"[INFO] 통합 분류: {compiled * 1000:.1f} ms ({len(lines) / compiled:,.0f} 줄/초)")
+    print(f"[INFO] 속도 향상: {legacy / compiled:.2f}배")
+
+    full_text = text * args.repeat
+    start = time.perf_counter()
+    passages, questions = parse_all_passages_and_questions(full_text)
+    elapsed = time.perf_counter() - start
+    print(f"[INFO] 전체 파싱: {elapsed * 1000:.1f} ms (지문 {len(passages)}개, 문제 {len(questions)}개)")
+
+if __name__ == "__main__":
+    main()
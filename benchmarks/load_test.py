@@ -0,0 +1,128 @@
+"""
+HTTP 추출 서비스 부하 테스트
+data/raw PDF들을 돌아가며 동시에 업로드하여 처리량(요청/초, 쪽/초), 응답 시간 분포, 429 거절 수를 측정합니다.
+--url을 주지 않으면 임시 폴더를 쓰는 서비스를 이 프로세스 안에서 띄워 측정합니다. (캐시 미사용)
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.load_test --requests 40 --concurrency 8 --workers 2
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --requests 40 --concurrency 8
+"""
+
+import argparse
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from urllib.parse import quote
+
+import fitz  # PyMuPDF
+
+from utils.http_service import ExtractionService, ExtractionRequestHandler, create_server
+
+DEFAULT_INPUTS = "data/raw/*.pdf"
+
+class QuietRequestHandler(ExtractionRequestHandler):
+    """요청마다 로그를 출력하지 않는 핸들러"""
+
+    def log_message(self, format, *args):
+        pass
+
+def post_pdf(url: str, pdf_bytes: bytes, title: str) -> Tuple[int, float]:
+    """PDF 한 개를 업로드하고 (HTTP 상태 코드, 응답 시간)을 반환합니다."""
+    request = urllib.request.Request(f"{url}/extract?title={quote(title)}", data=pdf_bytes,
+                                     headers={"Content-Type": "application/pdf"}, method="POST")
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            json.loads(response.read())
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    return status, time.perf_counter() - start
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def run_load(url: str, pdfs: List[Tuple[str, bytes, int]], requests: int, concurrency: int) -> Dict:
+    """requests개의 업로드를 concurrency개씩 동시에 보내고 결과를 요약합니다."""
+    jobs = [pdfs[i % len(pdfs)] for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda job: post_pdf(url, job[1], job[0]) + (job[2],), jobs))
+    elapsed = time.perf_counter() - start
+
+    ok = [(seconds, pages) for status, seconds, pages in results if status == 200]
+    latencies = [seconds for seconds, _ in ok]
+    summary = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "ok": len(ok),
+        "rejected_429": sum(1 for status, _, _ in results if status == 429),
+        "errors": sum(1 for status, _, _ in results if status not in (200, 429)),
+        "requests_per_second": round(len(ok) / elapsed, 2),
+        "pages_per_second": round(sum(pages for _, pages in ok) / elapsed, 1)
+    }
+    if latencies:
+        summary.update({
+            "latency_p50": round(percentile(latencies, 0.5), 3),
+            "latency_p95": round(percentile(latencies, 0.95), 3),
+            "latency_max": round(max(latencies), 3)
+        })
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP 추출 서비스 부하 테스트")
+    parser.add_argument("--url", help="측정할 서비스 주소 (생략 시 서비스를 직접 띄움)")
+    parser.add_argument("--inputs", default=DEFAULT_INPUTS, help="업로드할 PDF glob 패턴")
+    parser.add_argument("--requests", type=int, default=40, help="전체 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--workers", type=int, default=2, help="직접 띄운 서비스의 작업 프로세스 수")
+    parser.add_argument("--max-pending", type=int, help="직접 띄운 서비스의 동시 요청 상한 (기본: 작업 프로세스 수 x 2)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    pdfs = []
+    for pdf_path in sorted(glob.glob(args.inputs)):
+        with open(pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            pages = doc.page_count
+        pdfs.append((os.path.splitext(os.path.basename(pdf_path))[0], pdf_bytes, pages))
+    if not pdfs:
+        print(f"[ERROR] PDF가 없습니다: {args.inputs}")
+        raise SystemExit(1)
+
+    server = service = None
+    with tempfile.TemporaryDirectory() as output_root:
+        url = args.url
+        if url is None:
+            service = ExtractionService(args.workers, args.max_pending, output_root, cache_dir=None)
+            server = create_server("127.0.0.1", 0, service, QuietRequestHandler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            print(f"[INFO] 서비스 시작: {url} (작업 프로세스 {service.workers}개, 동시 요청 {service.max_pending}개)")
+        try:
+            summary = run_load(url.rstrip("/"), pdfs, args.requests, args.concurrency)
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+                service.shutdown()
+
+    for key, value in summary.items():
+        print(f"[INFO] {key}: {value}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+data/raw PDF 벤치마크
+텍스트 추출, 지문/문제 파싱, 블록 좌표 추출, 이미지 추출 함수들과 전체 파이프라인(run_extraction)을 PDF마다 별도 프로세스에서 실행하여
+실행 시간(여러 번 중 최솟값), 최대 RSS, 페이지당 처리량을 측정하고 저장된 기준값과 비교합니다.
+기준값보다 허용 범위 이상 느려지거나 메모리를 더 쓰면 종료 코드 1로 끝납니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.run_benchmarks                     # 측정 후 benchmarks/baseline.json과 비교
+    python -m benchmarks.run_benchmarks --update-baseline   # 현재 측정값을 기준값으로 저장
+    python -m benchmarks.run_benchmarks --scale 120         # 문제지를 이어 붙인 120쪽 이상 합성 PDF도 측정
+
+기준값은 측정한 컴퓨터에 따라 달라지므로, 다른 환경에서는 --update-baseline으로 먼저 기준값을 만드세요.
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List
+
+import fitz  # PyMuPDF
+
+from parser.text_extractor import extract_text_from_pdf
+from parser.structured_parser import (
+    parse_all_passages_and_questions, get_content_blocks_with_coords, DocumentLayout,
+    extract_question_image, extract_choices_image, extract_passage_image, extract_all_images,
+)
+from utils.pipeline import run_extraction
+
+DEFAULT_INPUTS = "data/raw/*.pdf"
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+
+# --- 측정 대상 ---
+# 각 함수는 (측정하지 않는) 준비 작업을 한 뒤, 측정할 작업을 수행하는 함수를 반환합니다.
+
+def case_extract_text(pdf_path: str, workdir: str) -> Callable[[], None]:
+    return lambda: extract_text_from_pdf(pdf_path)
+
+def case_parse(pdf_path: str, workdir: str) -> Callable[[], None]:
+    text = extract_text_from_pdf(pdf_path)
+    return lambda: parse_all_passages_and_questions(text)
+
+def case_content_blocks(pdf_path: str, workdir: str) -> Callable[[], None]:
+    return lambda: get_content_blocks_with_coords(pdf_path)
+
+def _image_case(pdf_path: str, workdir: str, extract_one) -> Callable[[], None]:
+    passages, questions = parse_all_passages_and_questions(extract_text_from_pdf(pdf_path))
+    targets = passages if extract_one is extract_passage_image else questions
+
+    def run():
+        with DocumentLayout(pdf_path) as layout:
+            for target in targets:
+                extract_one(pdf_path, target, workdir, layout=layout)
+    return run
+
+def case_question_images(pdf_path: str, workdir: str) -> Callable[[], None]:
+    return _image_case(pdf_path, workdir, extract_question_image)
+
+def case_choices_images(pdf_path: str, workdir: str) -> Callable[[], None]:
+    return _image_case(pdf_path, workdir, extract_choices_image)
+
+def case_passage_images(pdf_path: str, workdir: str) -> Callable[[], None]:
+    return _image_case(pdf_path, workdir, extract_passage_image)
+
+def case_all_images(pdf_path: str, workdir: str) -> Callable[[], None]:
+    passages, questions = parse_all_passages_and_questions(extract_text_from_pdf(pdf_path))
+    return lambda: extract_all_images(pdf_path, passages, questions, workdir)
+
+def case_pipeline(pdf_path: str, workdir: str) -> Callable[[], None]:
+    # 텍스트 추출, 파싱, 이미지 추출 전체 (페이지 분석 결과를 이미지 추출에 재사용)
+    return lambda: run_extraction(pdf_path, workdir)
+
+CASES = {
+    "extract_text_from_pdf": case_extract_text,
+    "parse_all_passages_and_questions": case_parse,
+    "get_content_blocks_with_coords": case_content_blocks,
+    "extract_question_image": case_question_images,
+    "extract_choices_image": case_choices_images,
+    "extract_passage_image": case_passage_images,
+    "extract_all_images": case_all_images,
+    "run_extraction": case_pipeline,
+}
+
+# --- 측정 ---
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _measure_in_child(case_name: str, pdf_path: str, repeat: int) -> Dict:
+    """작업 프로세스에서 한 항목을 측정합니다. 프로세스마다 최대 RSS를 따로 얻기 위해 새 프로세스에서 실행됩니다."""
+    with tempfile.TemporaryDirectory() as workdir:
+        run = CASES[case_name](pdf_path, workdir)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+    with fitz.open(pdf_path) as doc:
+        pages = doc.page_count
+    return {
+        "seconds": round(best, 6),
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "pages": pages,
+        "pages_per_second": round(pages / best, 2) if best > 0 else None
+    }
+
+def measure(case_name: str, pdf_path: str, repeat: int) -> Dict:
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_measure_in_child, case_name, pdf_path, repeat).result()
+
+def build_synthetic_pdf(pdf_paths: List[str], min_pages: int, output_path: str) -> int:
+    """입력 PDF들을 min_pages쪽 이상이 될 때까지 반복하여 이어 붙인 합성 PDF를 만듭니다."""
+    with fitz.open() as merged:
+        while merged.page_count < min_pages:
+            for pdf_path in pdf_paths:
+                with fitz.open(pdf_path) as src:
+                    merged.insert_pdf(src)
+        merged.save(output_path)
+        return merged.page_count
+
+# --- 기준값 비교 ---
+
+def compare(results: Dict, baseline: Dict, time_tolerance: float, rss_tolerance: float, min_seconds: float) -> List[str]:
+    """기준값 대비 회귀 항목을 문자열 목록으로 반환합니다."""
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        slower = result["seconds"] - base["seconds"]
+        if result["seconds"] > base["seconds"] * (1 + time_tolerance) and slower > min_seconds:
+            regressions.append(f"{key}: 시간 {base['seconds']:.4f}s -> {result['seconds']:.4f}s")
+        if result["peak_rss_bytes"] > base["peak_rss_bytes"] * (1 + rss_tolerance):
+            regressions.append(f"{key}: RSS {base['peak_rss_bytes'] / 2**20:.1f}MB -> {result['peak_rss_bytes'] / 2**20:.1f}MB")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 추출 파이프라인 벤치마크")
+    parser.add_argument("--inputs", default=DEFAULT_INPUTS, help="측정할 PDF glob 패턴")
+    parser.add_argument("--cases", nargs="*", default=list(CASES), choices=list(CASES), help="측정할 항목")
+    parser.add_argument("--repeat", type=int, default=5, help="항목마다 반복 측정 횟수 (최솟값 사용)")
+    parser.add_argument("--scale", type=int, default=0, help="이 쪽수 이상으로 이어 붙인 합성 PDF도 측정 (0이면 생략)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--update-baseline", action="store_true", help="측정값을 기준값으로 저장")
+    parser.add_argument("--output", help="측정 결과 JSON 저장 경로")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="허용 시간 증가 비율")
+    parser.add_argument("--rss-tolerance", type=float, default=0.25, help="허용 RSS 증가 비율")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="이보다 작은 시간 증가는 회귀로 보지 않음")
+    args = parser.parse_args()
+
+    pdf_paths = sorted(glob.glob(args.inputs))
+    if not pdf_paths:
+        print(f"[ERROR] PDF가 없습니다: {args.inputs}")
+        raise SystemExit(1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        targets = {os.path.basename(pdf_path): pdf_path for pdf_path in pdf_paths}
+        if args.scale:
+            synthetic_path = os.path.join(tmp_dir, "synthetic.pdf")
+            pages = build_synthetic_pdf(pdf_paths, args.scale, synthetic_path)
+            targets[f"synthetic_{pages}p"] = synthetic_path
+
+        results = {}
+        for target_name, pdf_path in targets.items():
+            for case_name in args.cases:
+                key = f"{case_name}/{target_name}"
+                results[key] = measure(case_name, pdf_path, args.repeat)
+                result = results[key]
+                print(f"{key:<60} {result['seconds']:>9.4f}s {result['peak_rss_bytes'] / 2**20:>8.1f}MB "
+                      f"{result['pages_per_second'] or 0:>10.1f} 쪽/초")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] 기준값 저장됨: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"[WARNING] 기준값이 없습니다: {args.baseline} (--update-baseline으로 생성)")
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.time_tolerance, args.rss_tolerance, args.min_seconds)
+    if regressions:
+        print("[ERROR] 성능 회귀:")
+        for regression in regressions:
+            print(f" - {regression}")
+        raise SystemExit(1)
+    print("[INFO] 기준값 대비 회귀 없음")
+
+if __name__ == "__main__":
+    main()
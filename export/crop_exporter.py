@@ -0,0 +1,123 @@
+"""
+원본 영역 PDF 내보내기
+지문/문제/선택지 영역(find_*_region)을 래스터 이미지나 HTML을 거치지 않고 show_pdf_page(clip=...)로
+새 PDF 페이지에 그대로 옮겨 배치합니다. 원본의 벡터 글자와 도형, 글꼴이 그대로 유지됩니다.
+영역마다 원본 페이지 전체가 XObject로 한 번씩 포함되므로 파일 크기는 원본 PDF 크기에 가깝습니다
+"""
+
+import os
+from typing import List, Optional
+
+import fitz  # PyMuPDF
+
+from model.passage import Passage
+from model.question import Question
+from parser.pdf_source import PdfSource
+from parser.structured_parser import (
+    CropRegion, DocumentLayout,
+    find_question_region, find_choices_region, find_passage_region,
+)
+
+DEFAULT_PAPER = "a4"
+DEFAULT_MARGIN = 36  # pt (0.5 inch)
+DEFAULT_GAP = 12  # 영역 사이 간격 (pt)
+
+def collect_export_regions(layout: DocumentLayout, passages: List[Passage], questions: List[Question],
+                           include_choices: bool = True) -> List[CropRegion]:
+    """
+    내보낼 영역을 지문 세트 순서대로 모읍니다. (지문 -> 그 지문의 문제 본문 -> 선택지)
+    지문 목록에 없는 지문 ID의 문제들은 마지막에 순서대로 둡니다.
+    """
+    questions_by_passage = {}
+    for q in questions:
+        questions_by_passage.setdefault(q.passage_id, []).append(q)
+
+    ordered = []
+    for p in passages:
+        ordered.append(find_passage_region(layout, p))
+        for q in questions_by_passage.pop(p.passage_id, []):
+            ordered.append(find_question_region(layout, q))
+            if include_choices:
+                ordered.append(find_choices_region(layout, q))
+    for remaining in questions_by_passage.values():
+        for q in remaining:
+            ordered.append(find_question_region(layout, q))
+            if include_choices:
+                ordered.append(find_choices_region(layout, q))
+    return [region for region in ordered if region is not None and not region.bbox.is_empty]
+
+def compose_regions(src: fitz.Document, regions: List[CropRegion], paper: str = DEFAULT_PAPER,
+                    margin: float = DEFAULT_MARGIN, gap: float = DEFAULT_GAP) -> fitz.Document:
+    """
+    영역들을 새 문서의 페이지에 위에서 아래로 차례로 배치합니다.
+    영역은 원래 크기를 유지하되, 본문 폭이나 페이지 높이를 넘으면 비율을 유지하며 줄입니다.
+
+    Args:
+        src (fitz.Document): 원본 문서.
+        regions (List[CropRegion]): 배치할 영역 목록.
+        paper (str): 출력 용지 크기 (fitz.paper_rect 이름).
+        margin (float): 페이지 여백.
+        gap (float): 영역 사이 간격.
+
+    Returns:
+        fitz.Document: 새 문서. 호출한 쪽에서 닫아야 합니다.
+    """
+    out = fitz.open()
+    paper_rect = fitz.paper_rect(paper)
+    content_width = paper_rect.width - 2 * margin
+    content_bottom = paper_rect.height - margin
+    page = None
+    y = margin
+    for region in regions:
+        clip = region.bbox
+        scale = min(1.0, content_width / clip.width, (content_bottom - margin) / clip.height)
+        width, height = clip.width * scale, clip.height * scale
+        if page is None or y + height > content_bottom:
+            page = out.new_page(width=paper_rect.width, height=paper_rect.height)
+            y = margin
+        # 같은 원본 페이지는 한 번만 복사되고 영역마다 clip으로 잘라 보여짐
+        page.show_pdf_page(fitz.Rect(margin, y, margin + width, y + height), src, region.page, clip=clip)
+        y += height + gap
+    if page is None:
+        out.new_page(width=paper_rect.width, height=paper_rect.height)
+    return out
+
+def export_crops(pdf_path: PdfSource, passages: List[Passage], questions: List[Question],
+                 output_path: Optional[str] = None, include_choices: bool = True, paper: str = DEFAULT_PAPER,
+                 margin: float = DEFAULT_MARGIN, gap: float = DEFAULT_GAP,
+                 layout: Optional[DocumentLayout] = None) -> bytes:
+    """
+    선택한 지문과 문제의 원본 영역으로 PDF를 만듭니다.
+
+    Args:
+        pdf_path (PdfSource): 원본 PDF 파일 경로, PDF 바이트 또는 열린 fitz.Document.
+        passages (List[Passage]): 내보낼 지문 목록.
+        questions (List[Question]): 내보낼 문제 목록.
+        output_path (Optional[str]): 저장할 PDF 경로. None이면 저장하지 않음.
+        include_choices (bool): 선택지 영역 포함 여부.
+        paper (str): 출력 용지 크기 (e.g., "a4", "b4").
+        margin (float): 페이지 여백 (pt).
+        gap (float): 영역 사이 간격 (pt).
+        layout (Optional[DocumentLayout]): 미리 만들어 둔 문서 레이아웃. 없으면 새로 만듭니다.
+
+    Returns:
+        bytes: 완성된 PDF.
+    """
+    own_layout = layout is None
+    if own_layout:
+        layout = DocumentLayout(pdf_path)
+    try:
+        regions = collect_export_regions(layout, passages, questions, include_choices)
+        with compose_regions(layout.doc, regions, paper, margin, gap) as out:
+            pdf_bytes = out.tobytes(garbage=3, deflate=True)
+    finally:
+        if own_layout:
+            layout.close()
+
+    if output_path:
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(pdf_bytes)
+    return pdf_bytes
@@ -22,3 +22,31 @@ def export_to_ilobag_json(
         json.dump(data, f, ensure_ascii=False, indent=2)
 
     print(f"[INFO] JSON 파일이 저장되었습니다: {output_path}")
+
+
+def build_result_dict(set_title: str, passages: List[Passage], questions: List[Question]) -> dict:
+    """main.py가 출력하는 형태(지문, 문제, 요약 통계)의 결과 딕셔너리를 만듭니다."""
+    type_counts = {}
+    for q in questions:
+        q_type = q.metadata.type
+        type_counts[q_type] = type_counts.get(q_type, 0) + 1
+
+    return {
+        "set_title": set_title,
+        "passages": [p.to_dict() for p in passages],
+        "questions": [q.to_dict() for q in questions],
+        "summary": {
+            "total_passages": len(passages),
+            "total_questions": len(questions),
+            "question_types": type_counts
+        }
+    }
+
+
+def save_json(data: dict, output_path: str):
+    """결과 딕셔너리를 UTF-8 JSON 파일로 저장합니다."""
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,155 @@
+"""
+지문 세트 단위 분할 PDF 내보내기
+template.html 전체를 한 번에 xhtml2pdf로 변환하는 대신, 지문 세트 몇 개씩 나누어 PDF 조각을 만들고
+(가능하면 여러 프로세스에서 동시에) PyMuPDF insert_pdf로 이어 붙입니다.
+컴파일한 Jinja 템플릿과 등록한 글꼴은 프로세스 안에서 재사용합니다
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, List, Optional
+
+import fitz  # PyMuPDF
+from jinja2 import Environment, FileSystemLoader, Template
+from xhtml2pdf import pisa
+from xhtml2pdf.default import DEFAULT_FONT
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from model.passage import Passage
+from model.question import Question
+from parser.structured_parser import CHOICE_MARKERS
+
+TEMPLATE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_NAME = "template.html"
+DEFAULT_SETS_PER_CHUNK = 4
+MAX_QUESTIONS_PER_SET = 10  # 지문 없는 세트 하나에 넣을 최대 문제 수
+FONT_FAMILY = "Noto Sans KR"  # template.html의 font-family
+FONT_PATH_ENV = "EXPORT_FONT_PATH"  # 한글 TTF 글꼴 경로를 지정하는 환경 변수
+
+@lru_cache(maxsize=None)
+def get_template(template_dir: str = TEMPLATE_DIR, name: str = TEMPLATE_NAME) -> Template:
+    """컴파일한 Jinja 템플릿 (프로세스마다 한 번만 읽고 컴파일)"""
+    return Environment(loader=FileSystemLoader(template_dir)).get_template(name)
+
+@lru_cache(maxsize=None)
+def register_font(font_path: str, family: str = FONT_FAMILY) -> str:
+    """
+    TTF 글꼴을 한 번만 등록하고, 템플릿의 font-family 이름이 이 글꼴을 쓰도록 연결합니다.
+    조각마다 @font-face로 글꼴을 다시 읽지 않아도 됩니다.
+
+    Returns:
+        str: 등록된 글꼴 이름.
+    """
+    font_name = os.path.splitext(os.path.basename(font_path))[0]
+    pdfmetrics.registerFont(TTFont(font_name, font_path))
+    DEFAULT_FONT[family.lower()] = font_name
+    return font_name
+
+def _link_callback(uri: str, rel: str) -> str:
+    # 원격 스타일시트(웹 글꼴)는 xhtml2pdf가 쓸 수 없으므로 조각마다 내려받지 않고 빈 스타일시트로 대체
+    if uri.startswith(("http://", "https://")):
+        return "data:text/css;base64,"
+    return uri
+
+def _strip_choice_marker(choice: str) -> str:
+    # 템플릿이 선택지 번호(①~⑤)를 직접 붙이므로 추출된 선택지 앞의 번호는 제거
+    return choice.lstrip(CHOICE_MARKERS).strip()
+
+def build_export_sets(passages: List[Passage], questions: List[Question],
+                      max_questions_per_set: int = MAX_QUESTIONS_PER_SET) -> List[Dict]:
+    """
+    지문/문제 목록을 template.html이 사용하는 세트 목록으로 바꿉니다.
+    지문이 없는 문제들은 지문 ID별로 묶어 지문 내용이 빈 세트로 만들되, 문제지 전체가 한 세트(한 조각)가 되지 않도록
+    max_questions_per_set개씩 나눕니다. 지문이 있는 세트는 지문과 문제를 함께 두기 위해 나누지 않습니다.
+    """
+    passages_by_id = {p.passage_id: p for p in passages}
+    sets: Dict[Optional[str], Dict] = {}
+    for p in passages:
+        sets[p.passage_id] = {"question_range": p.question_range, "passage": p.content, "questions": []}
+    for q in questions:
+        if q.passage_id not in sets:
+            sets[q.passage_id] = {"question_range": None, "passage": "", "questions": []}
+        sets[q.passage_id]["questions"].append({
+            "type": q.metadata.type,
+            "number": q.question_number,
+            "text": q.stem,
+            "choices": [_strip_choice_marker(c) for c in q.choices or []]
+        })
+    # 지문 순서를 유지하고, 지문 없는 세트는 뒤에 둠
+    export_sets = [sets[pid] for pid in passages_by_id]
+    for pid, s in sets.items():
+        if pid in passages_by_id:
+            continue
+        loose = s["questions"]
+        export_sets.extend(dict(s, questions=loose[i:i + max_questions_per_set])
+                           for i in range(0, len(loose), max_questions_per_set))
+    return export_sets
+
+def render_chunk(title: Optional[str], sets: List[Dict], font_path: Optional[str] = None) -> bytes:
+    """
+    세트 몇 개를 PDF 조각 하나로 변환합니다. 작업 프로세스에서도 실행됩니다.
+
+    Args:
+        title (Optional[str]): 문제지 제목. 첫 조각에만 전달하여 머리말을 한 번만 출력합니다.
+        sets (List[Dict]): 이 조각에 들어갈 세트 목록.
+        font_path (Optional[str]): 한글 TTF 글꼴 경로.
+
+    Returns:
+        bytes: PDF 조각.
+    """
+    if font_path:
+        register_font(font_path)
+    html = get_template().render(title=title, sets=sets)
+    buffer = io.BytesIO()
+    result = pisa.CreatePDF(html, dest=buffer, link_callback=_link_callback, encoding="utf-8")
+    if result.err:
+        raise RuntimeError(f"PDF 조각 생성 실패 (오류 {result.err}개)")
+    return buffer.getvalue()
+
+def _append_fragment(merged: fitz.Document, fragment: bytes):
+    with fitz.open(stream=fragment, filetype="pdf") as doc:
+        merged.insert_pdf(doc)
+
+def export_pdf(title: str, sets: List[Dict], output_path: Optional[str] = None, workers: int = 1,
+               sets_per_chunk: int = DEFAULT_SETS_PER_CHUNK, font_path: Optional[str] = None) -> bytes:
+    """
+    세트 목록을 PDF로 내보냅니다. 세트 sets_per_chunk개씩 조각으로 나누어 변환한 뒤 순서대로 이어 붙입니다.
+
+    Args:
+        title (str): 문제지 제목.
+        sets (List[Dict]): build_export_sets 형태의 세트 목록.
+        output_path (Optional[str]): 저장할 PDF 경로. None이면 저장하지 않음.
+        workers (int): 조각을 동시에 변환할 프로세스 수. 1이면 현재 프로세스에서 순서대로 변환.
+        sets_per_chunk (int): 조각 하나에 넣을 세트 수.
+        font_path (Optional[str]): 한글 TTF 글꼴 경로. None이면 EXPORT_FONT_PATH 환경 변수 사용.
+
+    Returns:
+        bytes: 완성된 PDF.
+    """
+    font_path = font_path or os.environ.get(FONT_PATH_ENV)
+    # 조각마다 세트 번호가 1부터 다시 매겨지지 않도록 전체 기준 쪽 번호를 미리 기록
+    numbered_sets = [dict(s, page_number=i + 1) for i, s in enumerate(sets)]
+    chunks = [numbered_sets[i:i + sets_per_chunk] for i in range(0, len(numbered_sets), sets_per_chunk)] or [[]]
+    titles = [title] + [None] * (len(chunks) - 1)
+
+    with fitz.open() as merged:
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+                for fragment in executor.map(render_chunk, titles, chunks, repeat(font_path)):
+                    _append_fragment(merged, fragment)
+        else:
+            for chunk_title, chunk in zip(titles, chunks):
+                _append_fragment(merged, render_chunk(chunk_title, chunk, font_path))
+        pdf_bytes = merged.tobytes(garbage=3, deflate=True)
+
+    if output_path:
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(pdf_bytes)
+    return pdf_bytes
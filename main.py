@@ -1,8 +1,13 @@
 import argparse
 import os
 import json
-from parser.structured_parser import parse_all_passages_and_questions
-from parser.text_extractor import extract_text_from_pdf
+from export.json_exporter import build_result_dict, save_json
+from export.crop_exporter import export_crops
+from utils.batch import run_batch
+from utils.extraction_cache import ExtractionCache, DEFAULT_CACHE_DIR
+from utils.pipeline import run_extraction
+from parser.structured_parser import PARSE_LAYOUT, PARSE_TEXT
+from utils.profiling import RunProfile
 
 def save_test_log(text: str, filename: str):
     """주어진 텍스트를 지정된 파일에 저장합니다. (디버깅 및 로그용)"""
@@ -12,19 +17,6 @@ def save_test_log(text: str, filename: str):
 
 def save_by_type(questions, logdir):
     """파싱된 질문들을 유형별로 분류하여 별도의 JSON 파일로 저장합니다."""
-    def serialize(q):
-        # Question 객체를 JSON으로 저장 가능한 dict 형태로 변환
-        return {
-            "stem": q.stem,
-            "choices": q.choices,
-            "answer": q.answer,
-            "explanation": q.explanation,
-            "conditions": q.conditions,
-            "metadata": q.metadata.__dict__,
-            "passage_id": q.passage_id,
-            "question_number": q.question_number
-        }
-
     type_map = {}
     for q in questions:
         type_map.setdefault(q.metadata.type, []).append(q)
@@ -33,7 +25,7 @@ def save_by_type(questions, logdir):
         out_path = os.path.join(logdir, f"questions_{q_type}.json")
         os.makedirs(os.path.dirname(out_path), exist_ok=True)
         with open(out_path, "w", encoding="utf-8") as f:
-            json.dump([serialize(q) for q in qlist],
+            json.dump([q.to_dict() for q in qlist],
                       f, ensure_ascii=False, indent=2)
 
 def save_passages_log(passages, logdir):
@@ -56,62 +48,84 @@ def main():
     입력받은 PDF를 파싱하여 결과를 JSON으로 저장하고, 중간 로그를 남깁니다.
     """
     parser = argparse.ArgumentParser(description="PDF 국어 문제지 -> 구조화 JSON 변환 (복수 지문 지원)")
-    parser.add_argument("--input", required=True, help="입력 PDF 경로")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="입력 PDF 경로")
+    source.add_argument("--batch", help="일괄 변환할 PDF 디렉터리 또는 glob 패턴 (e.g., \"data/raw/*.pdf\")")
     parser.add_argument("--output", help="출력 JSON 파일 경로 (생략 시 stdout)")
-    parser.add_argument("--title", default="수능 국어 문제지", help="문제지 제목")
+    parser.add_argument("--outdir", default="./data/output", help="일괄 변환 시 JSON과 manifest를 저장할 폴더")
+    parser.add_argument("--force", action="store_true", help="일괄 변환 시 최신 상태인 출력도 다시 변환")
+    parser.add_argument("--title", help="문제지 제목 (기본: 수능 국어 문제지, 일괄 변환 시에는 파일 이름)")
+    parser.add_argument("--parse-mode", choices=[PARSE_TEXT, PARSE_LAYOUT], default=PARSE_TEXT,
+                        help="파싱 방식 (text: 열 순서 텍스트, layout: 본문 줄 좌표를 따라 파싱하며 영역 기록)")
+    parser.add_argument("--export-pdf", help="지문/문제/선택지 원본 영역을 그대로 옮겨 담은 PDF 저장 경로")
     parser.add_argument("--logdir", default="./data/testlog", help="중간 로그 저장 폴더")
+    parser.add_argument("--workers", type=int, default=1, help="프로세스 수 (단일 변환: 텍스트 병렬 추출, 일괄 변환: 동시에 변환할 파일 수)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="추출 결과 캐시 폴더")
+    parser.add_argument("--no-cache", action="store_true", help="캐시를 사용하지 않고 항상 새로 추출")
+    parser.add_argument("--profile-report", help="단계별 소요 시간 보고서(JSON) 경로 (기본: 로그 폴더/timing_report.json)")
+    parser.add_argument("--cprofile", action="store_true", help="보고서에 cProfile 함수별 누적 시간 포함")
+    parser.add_argument("--tracemalloc", action="store_true", help="보고서에 tracemalloc 최대 메모리 사용량 포함")
     args = parser.parse_args()
 
+    if args.batch:
+        if args.title:
+            parser.error("--title은 --batch와 함께 쓸 수 없습니다 (일괄 변환 시 제목은 각 파일 이름)")
+        print(f"[INFO] 일괄 변환: {args.batch} -> {args.outdir} (프로세스 {args.workers}개, 파싱 방식 {args.parse_mode})")
+        manifest = run_batch(args.batch, args.outdir, workers=args.workers,
+                             cache_dir=None if args.no_cache else args.cache_dir, force=args.force,
+                             parse_mode=args.parse_mode)
+        totals = manifest["totals"]
+        print(f"[INFO] 일괄 변환 완료: 변환 {totals['converted']}개, 건너뜀 {totals['skipped']}개, "
+              f"실패 {totals['failed']}개 ({manifest['total_seconds']}초)")
+        return
+
+    args.title = args.title or "수능 국어 문제지"
     print(f"[INFO] 입력 파일: {args.input}")
     print(f"[INFO] 제목: {args.title}")
     print(f"[INFO] 로그 폴더: {args.logdir}")
+    if args.workers > 1:
+        print(f"[INFO] 병렬 추출 프로세스 수: {args.workers}")
 
-    # 1. PDF에서 텍스트 추출
-    print("[INFO] PDF 텍스트 추출 중...")
-    text = extract_text_from_pdf(args.input)
-    save_test_log(text, os.path.join(args.logdir, "extracted_text.txt"))
-    
-    # 2. 텍스트에서 지문과 문제 파싱
-    print("[INFO] 지문 및 문제 파싱 중...")
-    passages, questions = parse_all_passages_and_questions(text)
-    print(f"[INFO] 파싱 완료: 지문 {len(passages)}개, 문제 {len(questions)}개")
-    
-    # 3. 파싱 결과 로그 저장
-    save_passages_log(passages, args.logdir)
-    save_by_type(questions, args.logdir)
+    profile = RunProfile(os.path.basename(args.input), use_cprofile=args.cprofile, use_tracemalloc=args.tracemalloc)
+    with profile:
+        # 1~2. PDF 텍스트 추출 및 지문/문제 파싱 (같은 PDF는 캐시된 결과 재사용)
+        print("[INFO] PDF 텍스트 추출 및 지문/문제 파싱 중...")
+        cache = None if args.no_cache else ExtractionCache(args.cache_dir)
+        text, passages, questions = run_extraction(args.input, cache=cache, workers=args.workers, profile=profile,
+                                                   parse_mode=args.parse_mode)
+        print(f"[INFO] 파싱 완료: 지문 {len(passages)}개, 문제 {len(questions)}개")
 
-    # 4. 최종 결과 JSON 데이터 생성
-    data = {
-        "set_title": args.title,
-        "passages": [p.to_dict() for p in passages],
-        "questions": [q.to_dict() for q in questions],
-        "summary": {
-            "total_passages": len(passages),
-            "total_questions": len(questions),
-            "question_types": {q_type: len(q_list) for q_type, q_list in {q.metadata.type: [] for q in questions}.items()}
-        }
-    }
-    # 문제 유형별 통계 다시 계산
-    type_counts = {}
-    for q in questions:
-        q_type = q.metadata.type
-        type_counts[q_type] = type_counts.get(q_type, 0) + 1
-    data["summary"]["question_types"] = type_counts
+        # 3. 추출 텍스트 및 파싱 결과 로그 저장
+        with profile.span("write_logs"):
+            save_test_log(text, os.path.join(args.logdir, "extracted_text.txt"))
+            save_passages_log(passages, args.logdir)
+            save_by_type(questions, args.logdir)
 
-    # 5. 최종 결과물 출력 또는 저장
-    if args.output:
-        out_path = args.output
-        if os.path.isdir(out_path):
-            os.makedirs(out_path, exist_ok=True)
-            out_path = os.path.join(out_path, f"{args.title}.json")
-        else:
-            os.makedirs(os.path.dirname(out_path), exist_ok=True)
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"[INFO] 최종 결과 저장됨: {out_path}")
-    else:
-        # 출력 경로가 없으면 콘솔에 JSON 출력
-        print(json.dumps(data, ensure_ascii=False, indent=2))
+        # 4. 최종 결과 JSON 데이터 생성
+        data = build_result_dict(args.title, passages, questions)
+
+        # 5. 최종 결과물 출력 또는 저장
+        with profile.span("write_json"):
+            if args.output:
+                out_path = args.output
+                if os.path.isdir(out_path):
+                    out_path = os.path.join(out_path, f"{args.title}.json")
+                save_json(data, out_path)
+                print(f"[INFO] 최종 결과 저장됨: {out_path}")
+            else:
+                # 출력 경로가 없으면 콘솔에 JSON 출력
+                print(json.dumps(data, ensure_ascii=False, indent=2))
+
+        # 6. (선택) 원본 영역 PDF 내보내기
+        if args.export_pdf:
+            with profile.span("export_pdf"):
+                export_crops(args.input, passages, questions, args.export_pdf)
+            print(f"[INFO] 원본 영역 PDF 저장됨: {args.export_pdf}")
+
+    report_path = args.profile_report or os.path.join(args.logdir, "timing_report.json")
+    profile.save(report_path)
+    stage_summary = ", ".join(f"{stage.name} {stage.seconds:.3f}초" for stage in profile.stages.values())
+    print(f"[INFO] 단계별 소요 시간: {stage_summary} (전체 {profile.total_seconds:.3f}초) -> {report_path}")
 
 if __name__ == '__main__':
     main()
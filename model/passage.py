@@ -1,14 +1,18 @@
+from dataclasses import dataclass
 from typing import Optional
 
+@dataclass(slots=True)
 class Passage:
-    def __init__(self, content: str, passage_id: str = None, question_range: str = None, instruction: str = None, image_path: str = None):
-        self.content = content
-        self.passage_id = passage_id or "passage_1"
-        self.question_range = question_range
-        self.instruction = instruction
-        self.image_path = image_path
+    content: str
+    passage_id: Optional[str] = None
+    question_range: Optional[str] = None
+    instruction: Optional[str] = None
+    image_path: Optional[str] = None
 
-    def to_dict(self):
+    def __post_init__(self):
+        self.passage_id = self.passage_id or "passage_1"
+
+    def to_dict(self) -> dict:
         return {
             "id": self.passage_id,
             "content": self.content,
@@ -16,3 +20,13 @@ class Passage:
             "instruction": self.instruction,
             "image_path": self.image_path
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Passage":
+        return cls(
+            content=data["content"],
+            passage_id=data.get("id"),
+            question_range=data.get("question_range"),
+            instruction=data.get("instruction"),
+            image_path=data.get("image_path")
+        )
@@ -1,28 +1,33 @@
+from dataclasses import dataclass
 from typing import Optional, Union, List
 
+@dataclass(slots=True, frozen=True)
 class Metadata:
-    def __init__(self, type: str, difficulty: str, points: Optional[str] = None):
-        self.type = type
-        self.difficulty = difficulty
-        self.points = points
+    type: str
+    difficulty: str
+    points: Optional[str] = None
 
-    def to_dict(self):
+    def to_dict(self) -> dict:
         return {
             "type": self.type,
             "difficulty": self.difficulty,
             "points": self.points
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "Metadata":
+        return cls(type=data["type"], difficulty=data["difficulty"], points=data.get("points"))
+
+@dataclass(slots=True)
 class Question:
-    def __init__(self, stem: str, metadata: Metadata, passage_id: str, question_number: int, choices: Optional[List[str]] = None, answer: Optional[str] = None, image_path: Optional[str] = None, choices_image_path: Optional[str] = None):
-        self.stem = stem
-        self.choices = choices
-        self.answer = answer
-        self.metadata = metadata
-        self.passage_id = passage_id
-        self.question_number = question_number
-        self.image_path = image_path
-        self.choices_image_path = choices_image_path
+    stem: str
+    metadata: Metadata
+    passage_id: str
+    question_number: int
+    choices: Optional[List[str]] = None
+    answer: Optional[str] = None
+    image_path: Optional[str] = None
+    choices_image_path: Optional[str] = None
 
     def to_dict(self) -> dict:
         return {
@@ -34,4 +39,17 @@ class Question:
             "question_number": self.question_number,
             "image_path": self.image_path,
             "choices_image_path": self.choices_image_path
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Question":
+        return cls(
+            stem=data["stem"],
+            metadata=Metadata.from_dict(data["metadata"]),
+            passage_id=data.get("passage_id"),
+            question_number=data.get("question_number"),
+            choices=data.get("choices"),
+            answer=data.get("answer"),
+            image_path=data.get("image_path"),
+            choices_image_path=data.get("choices_image_path")
+        )
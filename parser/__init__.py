@@ -1,8 +1,30 @@
-from .structured_parser import parse_all_passages_and_questions, extract_question_image
-from .text_extractor import extract_text_from_pdf
+from .structured_parser import parse_all_passages_and_questions, iter_passages_and_questions, extract_question_image, extract_all_images, DocumentLayout, parse_layout, iter_layout_items, extract_layout_images, LayoutItem
+from .text_extractor import extract_text_from_pdf, iter_text_from_pdf, iter_pages_from_pdf
+from .page_analysis import PageAnalysis, analyze_page
+from .layout_profile import LayoutProfile, get_layout_profile, set_layout_profile
+from .pdf_source import PdfSource, open_document
+from .incremental import IncrementalDocument, reparse_question
 
 __all__ = [
     "parse_all_passages_and_questions",
+    "iter_passages_and_questions",
     "extract_question_image",
+    "extract_all_images",
+    "DocumentLayout",
+    "parse_layout",
+    "iter_layout_items",
+    "extract_layout_images",
+    "LayoutItem",
     "extract_text_from_pdf",
+    "iter_text_from_pdf",
+    "iter_pages_from_pdf",
+    "PageAnalysis",
+    "analyze_page",
+    "LayoutProfile",
+    "get_layout_profile",
+    "set_layout_profile",
+    "PdfSource",
+    "open_document",
+    "IncrementalDocument",
+    "reparse_question",
 ]
@@ -0,0 +1,106 @@
+"""
+배열 기반 블록 표
+본문 블록(또는 줄)의 좌표, 페이지, 열을 NumPy 배열로 나란히 저장하여 정렬, 머리말/꼬리말 영역 필터링,
+열 판정, 영역 합치기를 블록마다 파이썬 객체를 만들지 않고 배열 연산으로 처리합니다.
+블록 텍스트는 기존처럼 딕셔너리 목록에 두고, 표의 i번째 행이 목록의 i번째 블록에 대응합니다
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+
+COL_LEFT = 0
+COL_MIDDLE = 1
+COL_RIGHT = 2
+COL_NAMES = ("left", "middle", "right")
+_COL_BY_NAME = {name: code for code, name in enumerate(COL_NAMES)}
+# 열 수별 왼쪽부터의 열 코드 (1단은 왼쪽 열 하나, 2단은 기존처럼 왼쪽/오른쪽)
+_COLUMN_LAYOUTS = {1: (COL_LEFT,), 2: (COL_LEFT, COL_RIGHT), 3: (COL_LEFT, COL_MIDDLE, COL_RIGHT)}
+
+def as_bboxes(bboxes: Sequence[Sequence[float]]) -> np.ndarray:
+    """좌표 목록을 (N, 4) float 배열(x0, y0, x1, y1)로 바꿉니다."""
+    return np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+
+def inside_band(bboxes: np.ndarray, top: float, bottom: float) -> np.ndarray:
+    """세로 범위 [top, bottom] 안에 완전히 들어가는 행의 마스크 (본문 블록 판정)"""
+    return (bboxes[:, 1] >= top) & (bboxes[:, 3] <= bottom)
+
+def overlaps_band(bboxes: np.ndarray, top: float, bottom: float) -> np.ndarray:
+    """세로 범위 (top, bottom)와 겹치는 행의 마스크 (본문 줄 판정)"""
+    return (bboxes[:, 1] < bottom) & (bboxes[:, 3] > top)
+
+def column_codes(bboxes: np.ndarray, boundaries: Sequence[float]) -> np.ndarray:
+    """
+    오른쪽 끝이 넘는 열 경계 수로 열을 정합니다. (2단이면 페이지 가운데를 넘을 때 오른쪽 열)
+
+    Args:
+        bboxes (np.ndarray): (N, 4) 좌표 배열.
+        boundaries (Sequence[float]): 왼쪽부터 열 사이 경계의 x좌표 (열 수 - 1개, 최대 2개).
+    """
+    codes = np.asarray(_COLUMN_LAYOUTS[len(boundaries) + 1], dtype=np.int8)
+    return codes[np.searchsorted(np.asarray(boundaries, dtype=np.float64), bboxes[:, 2], side="left")]
+
+def union_bbox(bboxes: np.ndarray) -> Tuple[float, float, float, float]:
+    """모든 행을 포함하는 최소 사각형 (x0, y0, x1, y1)"""
+    x0, y0 = bboxes[:, :2].min(axis=0).tolist()
+    x1, y1 = bboxes[:, 2:].max(axis=0).tolist()
+    return x0, y0, x1, y1
+
+def pad_and_clamp(bbox: Sequence[float], page_rect: fitz.Rect, padding: float) -> fitz.Rect:
+    """
+    사각형에 여백을 더하고 페이지 경계 안으로 잘라냅니다. (왼쪽/위는 0, 오른쪽/아래는 페이지 크기까지)
+    사각형 하나의 네 값이므로 배열 연산 준비 비용이 더 큰 NumPy 대신 스칼라로 계산합니다.
+    """
+    x0, y0, x1, y1 = bbox
+    return fitz.Rect(max(0, x0 - padding), max(0, y0 - padding),
+                     min(page_rect.width, x1 + padding), min(page_rect.height, y1 + padding))
+
+class BlockTable:
+    """
+    블록 좌표/페이지/열을 담은 나란한 배열.
+
+    Args:
+        bboxes (np.ndarray): (N, 4) 좌표 배열.
+        pages (np.ndarray): (N,) 페이지 번호.
+        cols (np.ndarray): (N,) 열 코드 (COL_LEFT / COL_MIDDLE / COL_RIGHT).
+    """
+
+    def __init__(self, bboxes: np.ndarray, pages: np.ndarray, cols: np.ndarray):
+        self.bboxes = bboxes
+        self.pages = pages
+        self.cols = cols
+
+    @classmethod
+    def from_blocks(cls, blocks: List[Dict]) -> "BlockTable":
+        """블록 딕셔너리 목록(bbox, page, col)으로 표를 만듭니다."""
+        bboxes = as_bboxes([block["bbox"] for block in blocks])
+        pages = np.fromiter((block["page"] for block in blocks), dtype=np.int32, count=len(blocks))
+        cols = np.fromiter((_COL_BY_NAME[block["col"]] for block in blocks), dtype=np.int8, count=len(blocks))
+        return cls(bboxes, pages, cols)
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def reading_order(self) -> np.ndarray:
+        """페이지, y0, x0 순(읽는 순서)의 행 번호. 값이 같으면 원래 순서를 유지합니다."""
+        return np.lexsort((self.bboxes[:, 0], self.bboxes[:, 1], self.pages))
+
+    def take(self, rows: np.ndarray) -> "BlockTable":
+        return BlockTable(self.bboxes[rows], self.pages[rows], self.cols[rows])
+
+    def columns(self) -> Dict[Tuple[int, str], np.ndarray]:
+        """
+        (페이지, 열 이름) -> 그 열의 행 번호 배열. 표가 읽는 순서로 정렬되어 있으면 각 배열은 위에서 아래 순입니다.
+        """
+        if not len(self):
+            return {}
+        keys = self.pages.astype(np.int64) * len(COL_NAMES) + self.cols
+        order = np.argsort(keys, kind="stable")
+        starts = np.flatnonzero(np.diff(keys[order])) + 1
+        return {(int(self.pages[rows[0]]), COL_NAMES[self.cols[rows[0]]]): rows
+                for rows in np.split(order, starts)}
+
+    def region(self, rows: Sequence[int], page_rect: fitz.Rect, padding: float) -> fitz.Rect:
+        """행들을 모두 포함하는 사각형에 여백을 더하고 페이지 경계 안으로 잘라냅니다."""
+        return pad_and_clamp(union_bbox(self.bboxes[rows]), page_rect, padding)
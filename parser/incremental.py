@@ -0,0 +1,145 @@
+"""
+편집된 지문/문제의 부분 재파싱
+편집기에서 문제 한 개를 고치면 그 문제의 본문/선택지/유형만 다시 계산하고,
+지문 세트별 집계와 전체 요약 통계(build_result_dict의 summary)를 차이만큼 갱신합니다
+"""
+
+from dataclasses import replace
+from typing import Dict, List, Optional
+from model.passage import Passage
+from model.question import Question
+from parser.structured_parser import split_question_text
+
+def compose_question_text(stem: str, choices: Optional[List[str]]) -> str:
+    """편집기에서 따로 고친 본문과 선택지를 다시 하나의 문제 텍스트로 합칩니다."""
+    return "\n".join([stem] + list(choices or []))
+
+def reparse_question(question: Question, text: str) -> str:
+    """
+    편집된 문제 텍스트로 question의 stem, choices, metadata.type을 다시 계산합니다. (객체를 직접 갱신)
+
+    Args:
+        question (Question): 갱신할 문제.
+        text (str): 편집된 문제 텍스트 (본문과 선택지).
+
+    Returns:
+        str: 갱신 전 문제 유형.
+    """
+    old_type = question.metadata.type
+    stem, choices, q_type = split_question_text(text)
+    question.stem = stem
+    question.choices = choices if choices else None
+    if q_type != old_type:
+        question.metadata = replace(question.metadata, type=q_type)
+    return old_type
+
+class ParseSummary:
+    """
+    지문/문제 수와 문제 유형별 개수를 전체와 지문 세트별로 유지합니다.
+    문제 유형이 바뀌면 해당 세트와 전체 개수만 고칩니다.
+    """
+
+    def __init__(self):
+        self.total_passages = 0
+        self.total_questions = 0
+        self.question_types: Dict[str, int] = {}
+        self.sets: Dict[str, Dict] = {}
+
+    @classmethod
+    def from_items(cls, passages: List[Passage], questions: List[Question]) -> "ParseSummary":
+        summary = cls()
+        for p in passages:
+            summary._set(p.passage_id)
+        summary.total_passages = len(passages)
+        for q in questions:
+            summary.add_question(q.passage_id, q.metadata.type)
+        return summary
+
+    def _set(self, passage_id: str) -> Dict:
+        if passage_id not in self.sets:
+            self.sets[passage_id] = {"total_questions": 0, "question_types": {}}
+        return self.sets[passage_id]
+
+    @staticmethod
+    def _bump(counts: Dict[str, int], key: str, n: int):
+        counts[key] = counts.get(key, 0) + n
+        if counts[key] == 0:
+            del counts[key]
+
+    def add_question(self, passage_id: str, q_type: str):
+        set_summary = self._set(passage_id)
+        set_summary["total_questions"] += 1
+        self._bump(set_summary["question_types"], q_type, 1)
+        self.total_questions += 1
+        self._bump(self.question_types, q_type, 1)
+
+    def change_type(self, passage_id: str, old_type: str, new_type: str):
+        """문제 한 개의 유형이 old_type에서 new_type으로 바뀐 것을 반영합니다."""
+        if old_type == new_type:
+            return
+        set_types = self._set(passage_id)["question_types"]
+        self._bump(set_types, old_type, -1)
+        self._bump(set_types, new_type, 1)
+        self._bump(self.question_types, old_type, -1)
+        self._bump(self.question_types, new_type, 1)
+
+    def to_dict(self) -> Dict:
+        """build_result_dict의 summary와 같은 형태"""
+        return {
+            "total_passages": self.total_passages,
+            "total_questions": self.total_questions,
+            "question_types": dict(self.question_types)
+        }
+
+class IncrementalDocument:
+    """
+    파싱 결과를 편집하면서 요약 통계를 함께 유지하는 객체
+    한 문서에 같은 (지문 ID, 문제 번호)가 여러 번 나올 수 있으므로 지문/문제는 목록의 위치로 지정합니다.
+
+    사용 예:
+        document = IncrementalDocument(passages, questions)
+        document.edit_question(2, stem="...", choices=["① ...", "② ..."])  # questions[2] 편집
+        document.summary.to_dict()
+    """
+
+    def __init__(self, passages: List[Passage], questions: List[Question]):
+        self.passages = passages
+        self.questions = questions
+        self.summary = ParseSummary.from_items(passages, questions)
+
+    def edit_question(self, index: int, text: Optional[str] = None,
+                      stem: Optional[str] = None, choices: Optional[List[str]] = None) -> Question:
+        """
+        문제 한 개를 편집하고 그 문제만 다시 파싱합니다.
+
+        Args:
+            index (int): questions 목록에서 문제의 위치.
+            text (Optional[str]): 편집된 문제 전체 텍스트. 주어지면 stem/choices는 무시합니다.
+            stem (Optional[str]): 편집된 본문. None이면 기존 본문 사용.
+            choices (Optional[List[str]]): 편집된 선택지. None이면 기존 선택지 사용.
+
+        Returns:
+            Question: 갱신된 문제.
+        """
+        question = self.questions[index]
+        if text is None:
+            text = compose_question_text(question.stem if stem is None else stem,
+                                         question.choices if choices is None else choices)
+        old_type = reparse_question(question, text)
+        self.summary.change_type(question.passage_id, old_type, question.metadata.type)
+        return question
+
+    def edit_passage(self, index: int, content: str) -> Passage:
+        """passages[index]의 내용을 바꿉니다. 지문 내용은 문제 파싱 결과와 집계에 영향을 주지 않습니다."""
+        passage = self.passages[index]
+        passage.content = content
+        return passage
+
+    def to_dict(self, set_title: str) -> Dict:
+        """build_result_dict와 같은 형태의 결과 딕셔너리"""
+        return {
+            "set_title": set_title,
+            "passages": [p.to_dict() for p in self.passages],
+            "questions": [q.to_dict() for q in self.questions],
+            "summary": self.summary.to_dict()
+        }
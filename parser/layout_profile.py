@@ -0,0 +1,182 @@
+"""
+문서 레이아웃 프로필 (본문 띠와 열 경계)
+문제지마다 머리말/꼬리말 높이와 단 구성이 달라 고정 비율(상하 8%, 가운데 분할)로는 본문이 잘리거나
+머리말이 섞일 수 있습니다. 표본 페이지들의 텍스트 블록 좌표로 세로/가로 점유 히스토그램을 만들어
+머리말/꼬리말 경계와 1~3단 열 경계를 문서마다 한 번 계산하고, 문서 객체에 저장해 재사용합니다
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+
+HEADER_RATIO = 0.08  # 기본 본문 상단 경계 (머리말 제외)
+FOOTER_RATIO = 0.92  # 기본 본문 하단 경계 (꼬리말 제외)
+# 이미지 블록은 쓰지 않으므로 제외 (extractDICT가 이미지 바이트까지 꺼내면 매우 느려짐)
+# 페이지 분석도 같은 플래그를 써서, 프로필 계산에 만든 표본 페이지의 TextPage를 분석에 그대로 씀
+TEXT_FLAGS = fitz.TEXTFLAGS_TEXT
+
+PROFILE_SAMPLE_PAGES = 8  # 프로필 계산에 쓸 최대 페이지 수 (문서 전체에 고르게)
+PROFILE_BINS = 400  # 히스토그램 칸 수 (페이지 크기의 0.25% 단위)
+BAND_SEARCH = 0.2  # 머리말/꼬리말 경계를 찾을 상단/하단 범위
+MIN_BAND_GAP = 0.01  # 머리말/꼬리말과 본문 사이 빈 띠의 최소 높이
+EMPTY_PAGE_FRACTION = 0.2  # 표본 페이지 중 이 비율 이하에서만 글자가 있는 높이는 빈 띠로 봄 (표지 등)
+MAX_COLUMNS = 3
+MIN_GUTTER = 0.015  # 열 사이 빈 세로 띠의 최소 너비
+MIN_COLUMN_WIDTH = 0.15  # 열 하나의 최소 너비
+GUTTER_DENSITY = 0.05  # 글자가 있는 칸 평균의 이 비율 이하만큼 블록이 지나가는 칸은 빈 칸으로 봄 (제목 등)
+
+class LayoutProfile(NamedTuple):
+    """본문 띠(페이지 높이 비율)와 열 경계(페이지 너비 비율)"""
+    top: float = HEADER_RATIO
+    bottom: float = FOOTER_RATIO
+    splits: Tuple[float, ...] = (0.5,)  # 열 사이 경계, 열 수 - 1개
+
+DEFAULT_PROFILE = LayoutProfile()
+
+def _runs(mask: np.ndarray) -> np.ndarray:
+    """불리언 배열에서 True가 이어지는 구간들의 [시작, 끝) 칸 번호 (K, 2)"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return edges.reshape(-1, 2)
+
+def _bin_range(starts: np.ndarray, ends: np.ndarray, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    lo = np.clip(np.floor(starts * bins), 0, bins).astype(np.int64)
+    hi = np.clip(np.ceil(ends * bins), 0, bins).astype(np.int64)
+    return lo, np.maximum(hi, lo + 1).clip(max=bins)
+
+def _page_coverage(pages: np.ndarray, starts: np.ndarray, ends: np.ndarray, n_pages: int, bins: int) -> np.ndarray:
+    """칸마다 그 높이에 글자가 있는 페이지 수"""
+    lo, hi = _bin_range(starts, ends, bins)
+    diff = np.zeros((n_pages, bins + 1), dtype=np.int64)
+    np.add.at(diff, (pages, lo), 1)
+    np.add.at(diff, (pages, hi), -1)
+    return (np.cumsum(diff[:, :-1], axis=1) > 0).sum(axis=0)
+
+def _block_coverage(starts: np.ndarray, ends: np.ndarray, bins: int) -> np.ndarray:
+    """칸마다 그 위치를 지나는 블록 수"""
+    lo, hi = _bin_range(starts, ends, bins)
+    diff = np.zeros(bins + 1, dtype=np.int64)
+    np.add.at(diff, lo, 1)
+    np.add.at(diff, hi, -1)
+    return np.cumsum(diff[:-1])
+
+def _cut(run: np.ndarray, default: float, bins: int) -> float:
+    """빈 띠 안의 경계 위치. 기본값이 띠 안에 있으면 기본값을 그대로 써서 기존 결과를 유지합니다."""
+    start, end = run / bins
+    return default if start <= default <= end else float(start + end) / 2
+
+def _find_band(page_coverage: np.ndarray, n_pages: int) -> Tuple[float, float]:
+    """
+    상단/하단 탐색 범위에서, 바깥쪽에 글자(머리말/꼬리말)가 있는 가장 높은 빈 띠를 찾아 본문 경계로 씁니다.
+    그런 띠가 없으면 머리말/꼬리말이 없는 것으로 보고 페이지 끝을 경계로 씁니다.
+    """
+    bins = len(page_coverage)
+    runs = _runs(page_coverage <= n_pages * EMPTY_PAGE_FRACTION)
+    heights = runs[:, 1] - runs[:, 0]
+    search = int(BAND_SEARCH * bins)
+    min_gap = MIN_BAND_GAP * bins
+
+    top, bottom = 0.0, 1.0
+    header = runs[(runs[:, 0] > 0) & (runs[:, 0] < search) & (heights >= min_gap)]
+    if len(header):
+        # 가장 높은 띠, 같으면 본문에 가까운(아래쪽) 띠
+        run = header[np.lexsort((header[:, 0], header[:, 1] - header[:, 0]))[-1]]
+        top = _cut(np.minimum(run, (run[0], search)), HEADER_RATIO, bins)
+    footer = runs[(runs[:, 1] < bins) & (runs[:, 1] > bins - search) & (heights >= min_gap)]
+    if len(footer):
+        # 가장 높은 띠, 같으면 본문에 가까운(위쪽) 띠
+        run = footer[np.lexsort((-footer[:, 0], footer[:, 1] - footer[:, 0]))[-1]]
+        bottom = _cut(np.maximum(run, (bins - search, run[1])), FOOTER_RATIO, bins)
+    return top, bottom
+
+def _find_splits(block_coverage: np.ndarray) -> Tuple[float, ...]:
+    """
+    본문 블록이 거의 지나가지 않는 세로 띠(열 사이 여백)를 넓은 것부터 최대 MAX_COLUMNS - 1개 고릅니다.
+    나뉜 열이 너무 좁아지는 띠는 쓰지 않습니다.
+    """
+    bins = len(block_coverage)
+    filled = np.flatnonzero(block_coverage)
+    if not len(filled):
+        return ()
+    first, last = filled[0], filled[-1] + 1
+    threshold = GUTTER_DENSITY * block_coverage[filled].mean()
+    runs = _runs(block_coverage <= threshold)
+    widths = runs[:, 1] - runs[:, 0]
+    runs = runs[(runs[:, 0] > first) & (runs[:, 1] < last) & (widths >= MIN_GUTTER * bins)]
+
+    gutters = []
+    for run in runs[np.argsort(runs[:, 0] - runs[:, 1], kind="stable")]:
+        if len(gutters) == MAX_COLUMNS - 1:
+            break
+        edges = sorted([first, last] + [edge for gutter in gutters + [run] for edge in gutter])
+        # (시작, 여백 시작), (여백 끝, 다음 여백 시작), ... 이 모두 열 최소 너비 이상이어야 함
+        if all(right - left >= MIN_COLUMN_WIDTH * bins for left, right in zip(edges[::2], edges[1::2])):
+            gutters.append(run)
+    defaults = DEFAULT_PROFILE.splits
+    splits = []
+    for run in sorted(gutters, key=lambda r: r[0]):
+        start, end = run / bins
+        splits.append(next((d for d in defaults if start <= d <= end), float(start + end) / 2))
+    return tuple(splits)
+
+def _sample_pages(page_count: int) -> np.ndarray:
+    return np.unique(np.linspace(0, page_count - 1, min(page_count, PROFILE_SAMPLE_PAGES)).round().astype(int))
+
+def profile_document(doc: fitz.Document, textpages: Optional[Dict[int, Tuple[fitz.Page, fitz.TextPage]]] = None) -> LayoutProfile:
+    """
+    표본 페이지의 텍스트 블록 좌표로 문서의 레이아웃 프로필을 계산합니다.
+
+    Args:
+        doc (fitz.Document): 대상 문서.
+        textpages (Optional[Dict]): 주어지면 표본 페이지의 (페이지, TextPage)를 페이지 번호별로 담아 돌려줍니다.
+            페이지 분석에서 같은 페이지의 TextPage를 다시 만들지 않도록 하기 위함입니다.
+
+    Returns:
+        LayoutProfile: 본문 띠와 열 경계. 텍스트가 없으면 DEFAULT_PROFILE.
+    """
+    if not doc.page_count:
+        return DEFAULT_PROFILE
+    rows = []  # (표본 순번, x0, y0, x1, y1) 페이지 크기 비율
+    sample = _sample_pages(doc.page_count)
+    for i, page_num in enumerate(sample.tolist()):
+        page = doc[page_num]
+        textpage = page.get_textpage(flags=TEXT_FLAGS)
+        if textpages is not None:
+            textpages[page_num] = (page, textpage)
+        width, height = page.rect.width, page.rect.height
+        rows.extend((i, b[0] / width, b[1] / height, b[2] / width, b[3] / height)
+                    for b in textpage.extractBLOCKS() if b[6] == 0)
+    if not rows:
+        return DEFAULT_PROFILE
+
+    table = np.asarray(rows, dtype=np.float64)
+    pages = table[:, 0].astype(np.int64)
+    x0, y0, x1, y1 = table[:, 1], table[:, 2], table[:, 3], table[:, 4]
+    top, bottom = _find_band(_page_coverage(pages, y0, y1, len(sample), PROFILE_BINS), len(sample))
+    body = (y0 >= top) & (y1 <= bottom)
+    splits = _find_splits(_block_coverage(x0[body], x1[body], PROFILE_BINS))
+    return LayoutProfile(top, bottom, splits)
+
+# --- 문서별 저장 ---
+
+_PROFILE_ATTR = "_layout_profile"
+
+def get_layout_profile(doc: fitz.Document, textpages: Optional[Dict[int, Tuple[fitz.Page, fitz.TextPage]]] = None) -> LayoutProfile:
+    """
+    문서의 레이아웃 프로필을 반환합니다. 문서 객체에 저장하여 문서 객체마다 한 번만 계산합니다.
+    같은 PDF를 다시 연 문서는 새로 계산하지만, 이어지는 페이지 분석이 표본 페이지의 TextPage를 그대로 쓰므로
+    추가로 드는 비용은 표본 페이지의 블록 좌표를 꺼내는 정도입니다.
+
+    Args:
+        doc (fitz.Document): 대상 문서.
+        textpages (Optional[Dict]): 새로 계산할 때 표본 페이지의 TextPage를 담을 딕셔너리 (profile_document 참고).
+    """
+    profile = getattr(doc, _PROFILE_ATTR, None)
+    if profile is None:
+        profile = profile_document(doc, textpages)
+        set_layout_profile(doc, profile)
+    return profile
+
+def set_layout_profile(doc: fitz.Document, profile: LayoutProfile):
+    """문서에 레이아웃 프로필을 지정합니다. 자동 계산 결과가 맞지 않는 문제지는 직접 지정할 수 있습니다."""
+    setattr(doc, _PROFILE_ATTR, profile)
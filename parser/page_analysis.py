@@ -0,0 +1,177 @@
+"""
+페이지 분석 (페이지마다 텍스트 레이어를 한 번만 해석)
+페이지의 TextPage를 한 번 만들어, 그 결과에서 열 순서 본문 텍스트와 좌표가 있는 본문 블록을 함께 만듭니다.
+본문 영역과 열 경계는 문서의 레이아웃 프로필(layout_profile)을 따릅니다.
+텍스트 추출(text_extractor)과 블록 좌표 수집(structured_parser)이 같은 분석 결과를 씁니다
+"""
+
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from parser.block_table import (
+    COL_NAMES, BlockTable, as_bboxes, column_codes, inside_band, overlaps_band,
+)
+from parser.layout_profile import DEFAULT_PROFILE, TEXT_FLAGS, LayoutProfile, get_layout_profile
+
+Box = Tuple[float, float, float, float]
+
+class PageAnalysis(NamedTuple):
+    page_num: int
+    text: str  # 왼쪽부터 열 순서의 본문 텍스트 (각 열 뒤에 빈 줄 포함)
+    blocks: List[Dict]  # 본문 영역 텍스트 블록 (텍스트, BBox, 페이지 번호, 열)
+    lines: List[Dict]  # 본문 영역과 겹치는 텍스트 줄 (블록과 같은 형태, 읽는 순서로 정렬)
+    size: Tuple[float, float]  # 페이지 너비, 높이
+
+def column_boxes(page_rect: fitz.Rect, profile: LayoutProfile = DEFAULT_PROFILE) -> Tuple[Box, ...]:
+    """머리말/꼬리말을 제외한 열 영역 (왼쪽부터)"""
+    width, height = page_rect.width, page_rect.height
+    top, bottom = height * profile.top, height * profile.bottom
+    edges = [0] + [width * split for split in profile.splits] + [width]
+    return tuple((x0, top, x1, bottom) for x0, x1 in zip(edges, edges[1:]))
+
+def _overlaps(a: Box, b: Box) -> bool:
+    return not (a[0] >= b[2] or a[1] >= b[3] or a[2] <= b[0] or a[3] <= b[1])
+
+def _inside(a: Box, b: Box) -> bool:
+    """b가 a 안쪽에 완전히 들어가는지 (경계에 닿으면 False)"""
+    return b[0] > a[0] and b[1] > a[1] and b[2] < a[2] and b[3] < a[3]
+
+class _RawChars:
+    """열 경계에 걸친 스팬이 있을 때만 글자 단위 정보(rawdict)를 같은 TextPage에서 꺼냅니다."""
+
+    def __init__(self, textpage: fitz.TextPage):
+        self.textpage = textpage
+        self._blocks = None
+
+    def chars(self, block_idx: int, line_idx: int, span_idx: int) -> List[Dict]:
+        if self._blocks is None:
+            self._blocks = self.textpage.extractRAWDICT()["blocks"]
+        return self._blocks[block_idx]["lines"][line_idx]["spans"][span_idx]["chars"]
+
+def analyze_page(page: fitz.Page, page_num: int, profile: LayoutProfile = DEFAULT_PROFILE,
+                 textpage: Optional[fitz.TextPage] = None) -> PageAnalysis:
+    """
+    페이지 하나를 분석합니다.
+    열 텍스트는 각 열 영역과 겹치는 글자만 줄 단위로 모읍니다. 스팬이 열 안에 완전히 들어가면
+    스팬 텍스트를 그대로 쓰고, 열 경계에 걸친 스팬만 글자 단위로 나눕니다.
+    본문 블록은 머리말/꼬리말 영역에 걸치지 않는 텍스트 블록, 본문 줄은 본문 영역과 겹치는 텍스트 줄이며,
+    오른쪽 끝이 넘는 열 경계 수로 열을 정합니다. 줄은 왼쪽 열부터 열 순서로 위에서 아래로 정렬합니다.
+
+    Args:
+        page (fitz.Page): 분석할 페이지.
+        page_num (int): 페이지 번호 (0부터).
+        profile (LayoutProfile): 본문 영역과 열 경계.
+        textpage (Optional[fitz.TextPage]): 이미 만든 페이지의 TextPage (TEXT_FLAGS). 없으면 새로 만듭니다.
+
+    Returns:
+        PageAnalysis: 본문 텍스트, 본문 블록, 본문 줄.
+    """
+    page_rect = page.rect
+    columns = column_boxes(page_rect, profile)
+    top, bottom = columns[0][1], columns[0][3]
+    boundaries = [column[0] for column in columns[1:]]
+
+    if textpage is None:
+        textpage = page.get_textpage(flags=TEXT_FLAGS)
+    raw_chars = _RawChars(textpage)
+    column_parts: Tuple[List[str], ...] = tuple([] for _ in columns)
+    text_blocks = []
+    line_boxes = []
+    line_texts = []
+    for block_idx, block in enumerate(textpage.extractDICT()["blocks"]):
+        if block["type"] != 0:
+            continue
+        text_blocks.append(block)
+        for line_idx, line in enumerate(block["lines"]):
+            line_text = "".join([span["text"] for span in line["spans"]])
+            line_boxes.append(line["bbox"])
+            line_texts.append(line_text)
+            for column, parts in zip(columns, column_parts):
+                if not _overlaps(column, line["bbox"]):
+                    continue
+                if _inside(column, line["bbox"]):
+                    # 대부분의 줄은 한 열 안에 완전히 들어가므로 스팬을 하나씩 보지 않음
+                    if line_text:
+                        parts.append(line_text)
+                        if line_text[-1] != "\n":
+                            parts.append("\n")
+                    continue
+                last_char = None
+                for span_idx, span in enumerate(line["spans"]):
+                    if not _overlaps(column, span["bbox"]):
+                        continue
+                    if _inside(column, span["bbox"]):
+                        if span["text"]:
+                            parts.append(span["text"])
+                            last_char = span["text"][-1]
+                        continue
+                    for char in raw_chars.chars(block_idx, line_idx, span_idx):
+                        if _overlaps(column, char["bbox"]):
+                            parts.append(char["c"])
+                            last_char = char["c"]
+                if last_char is not None and last_char != "\n":
+                    parts.append("\n")
+
+    # 본문 영역 판정과 열 판정은 페이지의 블록/줄 좌표 배열에 한 번에 적용
+    block_boxes = as_bboxes([block["bbox"] for block in text_blocks])
+    block_cols = column_codes(block_boxes, boundaries)
+    blocks = []
+    for i in np.flatnonzero(inside_band(block_boxes, top, bottom)).tolist():
+        text = "".join([span["text"] for line in text_blocks[i]["lines"] for span in line["spans"]])
+        blocks.append({
+            "text": text.strip(),
+            "bbox": block_boxes[i].tolist(),
+            "page": page_num,
+            "col": COL_NAMES[block_cols[i]]
+        })
+
+    # 열 텍스트와 같은 줄을 쓰도록 본문 영역과 겹치기만 하면 포함하고, 열 -> y0 -> x0 순으로 정렬
+    line_array = as_bboxes(line_boxes)
+    line_cols = column_codes(line_array, boundaries)
+    kept = np.flatnonzero(overlaps_band(line_array, top, bottom))
+    kept = kept[np.lexsort((line_array[kept, 0], line_array[kept, 1], line_cols[kept]))]
+    lines = [{
+        "text": line_texts[i],
+        "bbox": line_array[i].tolist(),
+        "page": page_num,
+        "col": COL_NAMES[line_cols[i]]
+    } for i in kept.tolist()]
+
+    page_text = ""
+    for parts in column_parts:
+        column_text = "".join(parts).strip()
+        if column_text:
+            page_text += column_text + "\n\n"
+    return PageAnalysis(page_num, page_text, blocks, lines, (page_rect.width, page_rect.height))
+
+def iter_page_analyses(doc: fitz.Document, start: int = 0, stop: int = None,
+                       profile: Optional[LayoutProfile] = None) -> Iterator[PageAnalysis]:
+    """
+    열린 문서의 [start, stop) 범위 페이지를 차례로 분석합니다.
+    profile이 없으면 문서의 레이아웃 프로필을 쓰며, 프로필을 이번에 계산했다면 표본 페이지의 TextPage를 재사용합니다.
+    """
+    stop = doc.page_count if stop is None else stop
+    textpages: Dict[int, Tuple[fitz.Page, fitz.TextPage]] = {}
+    if profile is None:
+        profile = get_layout_profile(doc, textpages)
+    for page_num in range(start, stop):
+        page, textpage = textpages.pop(page_num, (doc[page_num], None))
+        yield analyze_page(page, page_num, profile, textpage)
+
+def collect_block_table(analyses: Iterable[PageAnalysis]) -> Tuple[List[Dict], BlockTable]:
+    """
+    페이지 분석 결과의 본문 블록을 모아 페이지, y좌표, x좌표 순(읽는 순서)으로 정렬합니다.
+
+    Returns:
+        Tuple[List[Dict], BlockTable]: 정렬된 블록 목록과, 같은 순서의 좌표 배열 표.
+    """
+    all_blocks = [block for analysis in analyses for block in analysis.blocks]
+    table = BlockTable.from_blocks(all_blocks)
+    order = table.reading_order()
+    return [all_blocks[i] for i in order.tolist()], table.take(order)
+
+def collect_blocks(analyses: Iterable[PageAnalysis]) -> List[Dict]:
+    """페이지 분석 결과의 본문 블록을 모아 페이지, y좌표, x좌표 순(읽는 순서)으로 정렬합니다."""
+    return collect_block_table(analyses)[0]
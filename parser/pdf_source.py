@@ -0,0 +1,61 @@
+"""
+PDF 입력 소스 처리
+파일 경로뿐 아니라 메모리에 있는 PDF 바이트(bytes, bytearray, memoryview)나 이미 열린 fitz.Document도
+같은 방식으로 열 수 있게 하여, 업로드한 PDF를 임시 파일 없이 처리할 수 있도록 합니다
+"""
+
+import os
+import fitz  # PyMuPDF
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+PdfSource = Union[str, os.PathLike, bytes, bytearray, memoryview, fitz.Document]
+
+def _as_stream(source: Union[bytes, bytearray, memoryview]) -> Union[bytes, bytearray]:
+    return source.tobytes() if isinstance(source, memoryview) else source
+
+def open_pdf(source: PdfSource) -> fitz.Document:
+    """
+    PDF 소스를 새 fitz.Document로 엽니다. 호출한 쪽에서 닫아야 합니다.
+    이미 열린 문서가 주어지면 그대로 반환합니다.
+    """
+    if isinstance(source, fitz.Document):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=_as_stream(source), filetype="pdf")
+    return fitz.open(source)
+
+@contextmanager
+def open_document(source: PdfSource) -> Iterator[fitz.Document]:
+    """
+    with 블록 안에서 PDF 소스를 열어 사용합니다.
+    직접 연 문서만 닫고, 호출한 쪽에서 전달한 fitz.Document는 닫지 않습니다.
+    """
+    if isinstance(source, fitz.Document):
+        yield source
+        return
+    with open_pdf(source) as doc:
+        yield doc
+
+def read_pdf_bytes(source: PdfSource) -> bytes:
+    """
+    캐시 키 계산 등에 사용할 PDF 바이트를 반환합니다.
+    파일에서 연 문서는 파일을 그대로 읽습니다. tobytes()는 PDF를 다시 써서 원본 파일과 바이트가 달라지므로,
+    경로로 넘긴 같은 PDF와 캐시 키가 어긋납니다.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, fitz.Document):
+        if not (source.name and os.path.exists(source.name)):
+            return source.tobytes()
+        source = source.name
+    with open(source, "rb") as f:
+        return f.read()
+
+def to_picklable(source: PdfSource) -> Union[str, os.PathLike, bytes]:
+    """작업 프로세스로 넘길 수 있는 형태(경로 또는 bytes)로 바꿉니다."""
+    if isinstance(source, fitz.Document):
+        return source.name if source.name and os.path.exists(source.name) else source.tobytes()
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    return source
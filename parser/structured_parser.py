@@ -2,59 +2,156 @@ import re
 import fitz  # PyMuPDF
 import os
 import json
-from typing import List, Tuple, Optional, Dict
+from bisect import bisect_left
+from contextlib import contextmanager
+from collections import defaultdict
+from typing import List, Tuple, Optional, Dict, Iterable, Iterator, NamedTuple, Union, Callable
 from model.question import Question, Metadata
 from model.passage import Passage
+from parser.pdf_source import PdfSource, open_document, open_pdf
+import numpy as np
+from parser.block_table import as_bboxes, pad_and_clamp, union_bbox
+from parser.page_analysis import PageAnalysis, collect_block_table, collect_blocks, iter_page_analyses
+
+PARSER_VERSION = "4"  # 파싱/추출 결과가 달라지는 변경 시 올려서 캐시를 무효화
+IMAGE_ZOOM = 2  # 이미지 저장 배율 (2x 해상도)
+PARSE_TEXT = "text"  # 열 순서 텍스트를 줄 단위로 파싱한 뒤 블록 목록에서 영역을 찾음
+PARSE_LAYOUT = "layout"  # 본문 줄의 좌표를 따라 파싱하면서 영역을 함께 기록 (iter_layout_items)
 
 # --- 헬퍼 함수 정의 ---
 
+class CropRegion(NamedTuple):
+    """이미지로 잘라낼 페이지 영역과 저장할 파일 이름."""
+    page: int
+    bbox: fitz.Rect
+    filename: str
+    col: Optional[str] = None  # 영역이 속한 열 ("left" / "middle" / "right"), 좌표 기반 파싱에서만 기록
+
 def save_region_as_image(page: fitz.Page, bbox: fitz.Rect, output_dir: str, filename: str) -> str:
     """페이지의 특정 영역(bbox)을 이미지 파일로 저장하고 경로를 반환합니다."""
     os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, filename)
-    pix = page.get_pixmap(clip=bbox, matrix=fitz.Matrix(2, 2))  # 2x 해상도
+    pix = page.get_pixmap(clip=bbox, matrix=fitz.Matrix(IMAGE_ZOOM, IMAGE_ZOOM))
     pix.save(output_path)
     return output_path
 
-def get_content_blocks_with_coords(pdf_path: str) -> List[Dict]:
+def save_regions_as_images(doc: fitz.Document, regions: List[CropRegion], output_dir: str, zoom: float = IMAGE_ZOOM,
+                           on_saved: Optional[Callable[[int, int], None]] = None) -> List[str]:
+    """
+    여러 영역을 페이지별로 묶어, 페이지마다 한 번만 래스터화한 뒤 잘라내어 저장합니다.
+    영역마다 get_pixmap(clip=...)을 호출하는 대신 페이지 픽스맵 하나에서 잘라내므로
+    처리 시간이 영역 수가 아니라 페이지 수에 비례합니다.
+
+    Args:
+        doc (fitz.Document): 원본 PDF 문서.
+        regions (List[CropRegion]): 저장할 영역 목록.
+        output_dir (str): 이미지를 저장할 디렉토리.
+        zoom (float): 렌더링 배율.
+        on_saved (Optional[Callable[[int, int], None]]): 이미지를 하나 저장할 때마다 (저장한 수, 전체 수)로 호출할 콜백.
+
+    Returns:
+        List[str]: regions와 같은 순서의 저장된 이미지 파일 경로 리스트.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    matrix = fitz.Matrix(zoom, zoom)
+    output_paths = [os.path.join(output_dir, region.filename) for region in regions]
+
+    regions_by_page = defaultdict(list)
+    for i, region in enumerate(regions):
+        regions_by_page[region.page].append(i)
+
+    saved = 0
+    for page_num in sorted(regions_by_page):
+        # 페이지에서 요청된 영역들을 모두 포함하는 범위만 한 번 렌더링
+        page_clip = fitz.Rect(regions[regions_by_page[page_num][0]].bbox)
+        for i in regions_by_page[page_num]:
+            page_clip |= regions[i].bbox
+        page_pix = doc[page_num].get_pixmap(matrix=matrix, clip=page_clip)
+        crops = []
+        for i in regions_by_page[page_num]:
+            # get_pixmap(clip=...)과 같은 방식으로 픽셀 영역을 정한 뒤 페이지 픽스맵 범위로 제한
+            irect = (regions[i].bbox * matrix).irect & page_pix.irect
+            crop = fitz.Pixmap(page_pix.colorspace, irect, page_pix.alpha)
+            crop.copy(page_pix, irect)
+            crops.append((output_paths[i], crop))
+        page_pix = None  # 페이지 픽스맵은 잘라낸 뒤 바로 해제
+        for output_path, crop in crops:
+            crop.save(output_path)
+            saved += 1
+            if on_saved is not None:
+                on_saved(saved, len(regions))
+    return output_paths
+
+def _collect_content_blocks(doc: fitz.Document) -> List[Dict]:
+    """이미 열린 문서에서 본문 영역의 텍스트 블록과 좌표를 읽는 순서대로 수집합니다."""
+    return collect_blocks(iter_page_analyses(doc))
+
+def get_content_blocks_with_coords(pdf_path: PdfSource) -> List[Dict]:
     """
     PDF에서 머리말/꼬리말을 제외한 본문 영역의 텍스트 블록과 좌표를 추출합니다.
     2단 레이아웃을 고려하여 각 블록의 열 정보를 포함합니다.
 
     Args:
-        pdf_path (str): PDF 파일 경로.
+        pdf_path (PdfSource): PDF 파일 경로, PDF 바이트(bytes, memoryview) 또는 열린 fitz.Document.
 
     Returns:
         List[Dict]: 각 블록의 텍스트, BBox, 페이지 번호, 열 정보를 담은 딕셔너리 리스트.
     """
-    doc = fitz.open(pdf_path)
-    all_blocks = []
-
-    for page_num, page in enumerate(doc):
-        width, height = page.rect.width, page.rect.height
-        top_margin = height * 0.08
-        bottom_margin = height * 0.92
-
-        # 페이지의 모든 텍스트 블록 추출
-        page_blocks = page.get_text("dict")["blocks"]
-
-        for block in page_blocks:
-            if block["type"] == 0:  # 텍스트 블록인 경우
-                bbox = fitz.Rect(block["bbox"])
-                # 블록이 본문 영역 내에 있는지 확인
-                if bbox.y0 >= top_margin and bbox.y1 <= bottom_margin:
-                    col = "left" if bbox.x1 <= width / 2 else "right"
-                    text = "".join([span["text"] for line in block["lines"] for span in line["spans"]])
-                    all_blocks.append({
-                        "text": text.strip(),
-                        "bbox": [bbox.x0, bbox.y0, bbox.x1, bbox.y1],
-                        "page": page_num,
-                        "col": col
-                    })
-    doc.close()
-    # 블록들을 y좌표, x좌표 순으로 정렬하여 읽는 순서 보장
-    all_blocks.sort(key=lambda b: (b['page'], b['bbox'][1], b['bbox'][0]))
-    return all_blocks
+    with open_document(pdf_path) as doc:
+        return _collect_content_blocks(doc)
+
+CHOICE_MARKERS = "①②③④⑤"
+_CHOICE_MARKER_REGEX = re.compile(f"[{CHOICE_MARKERS}]")
+# "①～⑤"처럼 선택지 범위를 가리키는 표기 (선택지 시작이 아니므로 분리 기준에서 제외)
+_CHOICE_RANGE_REGEX = re.compile(rf"[{CHOICE_MARKERS}]\s*[~∼～-]\s*[{CHOICE_MARKERS}]")
+
+def find_choice_markers(text: str) -> List[int]:
+    """
+    텍스트에서 선택지를 시작하는 마커(①~⑤)의 위치를 한 번의 탐색으로 찾습니다.
+    "①～⑤"와 같은 범위 표기에 쓰인 마커는 선택지 시작으로 보지 않습니다.
+
+    Args:
+        text (str): 문제의 전체 텍스트.
+
+    Returns:
+        List[int]: 선택지 마커의 문자 위치 리스트 (오름차순).
+    """
+    markers = [match.start() for match in _CHOICE_MARKER_REGEX.finditer(text)]
+    if not markers:
+        return markers
+    range_positions = set()
+    for match in _CHOICE_RANGE_REGEX.finditer(text):
+        range_positions.add(match.start())
+        range_positions.add(match.end() - 1)
+    if range_positions:
+        markers = [pos for pos in markers if pos not in range_positions]
+    return markers
+
+def split_choices(text: str, markers: List[int]) -> List[str]:
+    """
+    선택지 마커 위치를 기준으로 텍스트를 잘라 선택지 리스트를 만듭니다.
+    각 선택지는 자신의 마커부터 종류가 다른 다음 마커 직전까지이며, 줄바꿈은 공백으로 바꿉니다.
+
+    Args:
+        text (str): 문제의 전체 텍스트.
+        markers (List[int]): find_choice_markers로 찾은 마커 위치 리스트.
+
+    Returns:
+        List[str]: 선택지 문자열의 리스트.
+    """
+    normalized_text = text.replace('\n', ' ')
+    choices = []
+    start = -1
+    for pos in markers:
+        if start != -1:
+            # 같은 마커가 반복되면 하나의 선택지로 이어 붙임
+            if normalized_text[pos] == normalized_text[start]:
+                continue
+            choices.append(normalized_text[start:pos].strip())
+        start = pos
+    if start != -1:
+        choices.append(normalized_text[start:].strip())
+    return choices
 
 def extract_choices(text: str) -> List[str]:
     """
@@ -66,11 +163,7 @@ def extract_choices(text: str) -> List[str]:
     Returns:
         List[str]: 추출된 선택지 문자열의 리스트.
     """
-    normalized_text = text.replace('\n', ' ')
-    pattern = r"(①.*?)(?=②|③|④|⑤|$)|(②.*?)(?=①|③|④|⑤|$)|(③.*?)(?=①|②|④|⑤|$)|(④.*?)(?=①|②|③|⑤|$)|(⑤.*?)(?=①|②|③|④|$)"
-    matches = re.findall(pattern, normalized_text)
-    choices = [item for tpl in matches for item in tpl if item]
-    return [c.strip() for c in choices]
+    return split_choices(text, find_choice_markers(text))
 
 def classify_question_type(text: str) -> str:
     """
@@ -91,6 +184,65 @@ def classify_question_type(text: str) -> str:
         return "subjective"
     return "etc"
 
+# --- 줄 분류 ---
+
+# 파싱 과정에서 무시해야 할 줄의 패턴 (페이지 번호, 시험지 제목, 저작권 문구 등)
+SKIP_LINE_PATTERNS = [
+    r"^\d{4}학년도 대학수학능력시험 문제지$",
+    r"^제\d+\s*교시$",
+    r"^홀수형$",
+    r"^짝수형$",
+    r"^\d+\s*/\s*\d+$",
+    r"이 문제지에 관한 저작권은",
+    r"확인 사항",
+    r"자신이 선택한 과목인지 확인하시오"
+]
+PASSAGE_START_PATTERN = r"\s*\[(?P<range_start>\d+)[~∼～-](?P<range_end>\d+)\]\s*(?P<instruction_rest>.*)"
+QUESTION_START_PATTERN = r"(?P<question_number>\d{1,2})\s*[.)]"
+
+_SKIP_LINE_REGEX = re.compile("|".join(f"(?:{p})" for p in SKIP_LINE_PATTERNS))
+_PASSAGE_START_REGEX = re.compile(PASSAGE_START_PATTERN)
+_QUESTION_START_REGEX = re.compile(QUESTION_START_PATTERN)
+_QUESTION_NUMBER_REGEX = re.compile(r"\d+")
+_QUESTION_NUMBER_PREFIX_REGEX = re.compile(r"^\d+\s*[.)]\s*")
+
+# 건너뛸 줄 / 지문 시작 / 문제 시작을 한 번의 매칭으로 판별하는 통합 패턴.
+# 대안의 순서가 곧 우선순위이며, 줄 중간에 나오는 건너뛰기 문구는 선행 탐색(lookahead)으로 확인합니다.
+_LINE_CLASSIFIER_REGEX = re.compile(
+    "(?P<skip>"
+    + "|".join(p for p in SKIP_LINE_PATTERNS if p.startswith("^"))
+    + "|(?=.*?(?:" + "|".join(p for p in SKIP_LINE_PATTERNS if not p.startswith("^")) + ")))"
+    + f"|(?P<passage>{PASSAGE_START_PATTERN})"
+    + f"|(?P<question>{QUESTION_START_PATTERN})"
+)
+
+LINE_SKIP = "skip"
+LINE_PASSAGE_START = "passage_start"
+LINE_QUESTION_START = "question_start"
+LINE_BODY = "body"
+
+def classify_line(text: str) -> Tuple[str, Optional[re.Match]]:
+    """
+    텍스트 한 줄을 건너뛸 줄, 지문 시작, 문제 시작, 본문 중 하나로 분류합니다.
+    미리 컴파일한 통합 패턴으로 한 번만 매칭하며, 결과는 should_skip_line,
+    is_passage_start_enhanced, is_question_start를 차례로 적용한 것과 같습니다.
+
+    Args:
+        text (str): 분류할 텍스트 한 줄.
+
+    Returns:
+        Tuple[str, Optional[re.Match]]: 줄 종류(LINE_*)와 매칭 결과.
+        지문 시작이면 range_start/range_end/passage 그룹, 문제 시작이면 question_number 그룹을 가집니다.
+    """
+    match = _LINE_CLASSIFIER_REGEX.match(text)
+    if match is None:
+        return LINE_BODY, None
+    if match.lastgroup == "passage":
+        return LINE_PASSAGE_START, match
+    if match.lastgroup == "question":
+        return LINE_QUESTION_START, match
+    return LINE_SKIP, match
+
 def is_question_start(text: str) -> bool:
     """
     해당 텍스트 줄이 문제의 시작인지 (e.g., "1.", "2)") 판별합니다.
@@ -101,7 +253,7 @@ def is_question_start(text: str) -> bool:
     Returns:
         bool: 문제의 시작이면 True, 아니면 False.
     """
-    return bool(re.match(r"^\d{1,2}\s*[.)]", text))
+    return bool(_QUESTION_START_REGEX.match(text))
 
 def should_skip_line(text: str) -> bool:
     """
@@ -114,17 +266,7 @@ def should_skip_line(text: str) -> bool:
     Returns:
         bool: 무시해야 할 줄이면 True, 아니면 False.
     """
-    skip_patterns = [
-        r"^\d{4}학년도 대학수학능력시험 문제지$",
-        r"^제\d+\s*교시$",
-        r"^홀수형$",
-        r"^짝수형$",
-        r"^\d+\s*/\s*\d+$",
-        r"이 문제지에 관한 저작권은",
-        r"확인 사항",
-        r"자신이 선택한 과목인지 확인하시오"
-    ]
-    return any(re.search(p, text) for p in skip_patterns)
+    return bool(_SKIP_LINE_REGEX.search(text))
 
 def is_passage_start_enhanced(text: str) -> Tuple[bool, Optional[str], Optional[str]]:
     """
@@ -138,10 +280,9 @@ def is_passage_start_enhanced(text: str) -> Tuple[bool, Optional[str], Optional[
         Tuple[bool, Optional[str], Optional[str]]: 
         지문 시작 여부, 문제 범위(e.g., "1~3"), 지시문(e.g., "다음 글을...") 튜플.
     """
-    pattern = r'^\s*\[(\d+)[~∼～-](\d+)\]\s*(.*)'
-    match = re.match(pattern, text)
+    match = _PASSAGE_START_REGEX.match(text)
     if match:
-        question_range = f"{match.group(1)}~{match.group(2)}"
+        question_range = f"{match.group('range_start')}~{match.group('range_end')}"
         instruction = match.group(0)
         return True, question_range, instruction
     return False, None, None
@@ -156,11 +297,34 @@ def get_question_number(text: str) -> Optional[int]:
     Returns:
         Optional[int]: 추출된 문제 번호. 없으면 0을 반환.
     """
-    match = re.match(r"^(\d+)", text.strip())
+    match = _QUESTION_NUMBER_REGEX.match(text.strip())
     if match:
-        return int(match.group(1))
+        return int(match.group())
     return 0
 
+def split_question_text(full_text: str) -> Tuple[str, List[str], str]:
+    """
+    문제 한 개의 텍스트를 문제 본문(stem), 선택지 리스트, 문제 유형으로 나눕니다.
+
+    Args:
+        full_text (str): 문제 번호, 본문, 선택지를 포함한 문제의 전체 텍스트.
+
+    Returns:
+        Tuple[str, List[str], str]: (문제 번호를 제거한 본문, 선택지 리스트, 문제 유형)
+    """
+    q_type = classify_question_type(full_text)
+    choice_markers = find_choice_markers(full_text)
+    choices = split_choices(full_text, choice_markers)
+
+    # 문제 본문(stem) 추출: 전체 텍스트에서 선택지 부분을 제외한 나머지
+    stem = full_text
+    if choice_markers:
+        stem = stem[:choice_markers[0]].strip()
+
+    # 문제 본문에서 문제 번호 텍스트(e.g., "1.") 제거
+    stem = _QUESTION_NUMBER_PREFIX_REGEX.sub("", stem, count=1).strip()
+    return stem, choices, q_type
+
 def create_question_from_block(block_lines: List[str], passage_id: str, question_number: int) -> Optional[Question]:
     """
     수집된 문제 블록(텍스트 줄 리스트)으로부터 Question 객체를 생성합니다.
@@ -176,19 +340,8 @@ def create_question_from_block(block_lines: List[str], passage_id: str, question
     if not block_lines:
         return None
     
-    full_text = "\n".join(block_lines)
-    q_type = classify_question_type(full_text)
+    stem, choices, q_type = split_question_text("\n".join(block_lines))
     metadata = Metadata(type=q_type, difficulty="중", points=None)
-    choices = extract_choices(full_text)
-    
-    # 문제 본문(stem) 추출: 전체 텍스트에서 선택지 부분을 제외한 나머지
-    stem = full_text
-    match = re.search(r"①|②|③|④|⑤", stem)
-    if match:
-        stem = stem[:match.start()].strip()
-    
-    # 문제 본문에서 문제 번호 텍스트(e.g., "1.") 제거
-    stem = re.sub(r"^\d+\s*[.)]\s*", "", stem).strip()
 
     return Question(
         stem=stem,
@@ -201,75 +354,81 @@ def create_question_from_block(block_lines: List[str], passage_id: str, question
 
 # --- 메인 파싱 함수 ---
 
-def parse_all_passages_and_questions(text: str) -> Tuple[List[Passage], List[Question]]:
-    """
-    PDF에서 추출된 전체 텍스트를 분석하여 모든 지문과 문제를 파싱합니다.
-    상태(지문, 문제)를 추적하며 텍스트를 한 줄씩 읽어 지문과 문제를 구분합니다.
-    이 함수는 텍스트 파싱에만 집중하며, 이미지 추출은 별도로 처리됩니다.
-
-    Args:
-        text (str): PDF에서 추출된 전체 텍스트.
+ParsedLine = Tuple[str, Optional[Dict]]  # (줄 텍스트, 줄 좌표 정보 또는 None)
 
-    Returns:
-        Tuple[List[Passage], List[Question]]: 추출된 모든 Passage 객체 리스트와 Question 객체 리스트.
+def _iter_parsed_lines(lines: Iterable[ParsedLine]) -> Iterator[Tuple[Union[Passage, Question], List[ParsedLine]]]:
     """
-    lines = text.splitlines()
-    passages = []
-    questions = []
+    지문/문제 상태 기계. 줄마다 딸린 좌표 정보는 해석하지 않고 그대로 모아,
+    파싱이 끝난 객체와 그 객체를 이루는 줄 목록을 함께 내보냅니다.
+    """
+    current_passage = None  # 내용이 아직 확정되지 않은 지문
     current_passage_content = []
+    current_passage_lines = []
     current_question_block = []
+    current_question_lines = []
     passage_counter = 0
     current_question_number = 0
     current_passage_id = None
     in_passage = False
     in_question = False
 
-    for line in lines:
+    for line, geometry in lines:
         stripped = line.strip()
-        if not stripped or should_skip_line(stripped):
+        if not stripped:
+            continue
+
+        line_kind, match = classify_line(stripped)
+        if line_kind == LINE_SKIP:
             continue
 
-        is_passage, q_range, instruction = is_passage_start_enhanced(stripped)
-        
-        if is_passage:
-            # 이전 문제 블록이 있었다면 질문으로 저장
+        if line_kind == LINE_PASSAGE_START:
+            q_range = f"{match.group('range_start')}~{match.group('range_end')}"
+            instruction = match.group("passage")
+
+            # 이전 문제 블록이 있었다면 질문으로 내보냄
             if current_question_block:
                 question = create_question_from_block(current_question_block, current_passage_id, current_question_number)
                 if question:
-                    questions.append(question)
+                    yield question, current_question_lines
                 current_question_block = []
+                current_question_lines = []
 
-            # 이전 지문이 있었다면 내용 저장
-            if current_passage_content and passages:
-                passages[-1].content = "\n".join(current_passage_content).strip()
+            # 이전 지문이 있었다면 내용을 확정하여 내보냄
+            if current_passage_content and current_passage is not None:
+                current_passage.content = "\n".join(current_passage_content).strip()
+                yield current_passage, current_passage_lines
 
             # 새 지문 시작
             passage_counter += 1
             current_passage_id = f"passage_{passage_counter}"
-            passage = Passage(content="", passage_id=current_passage_id, question_range=q_range, instruction=instruction)
-            passages.append(passage)
+            current_passage = Passage(content="", passage_id=current_passage_id, question_range=q_range, instruction=instruction)
             current_passage_content = [instruction]
+            current_passage_lines = [(stripped, geometry)]
             in_passage = True
             in_question = False
             continue
 
-        if is_question_start(stripped):
-            # 이전 문제 블록 저장
+        if line_kind == LINE_QUESTION_START:
+            # 이전 문제 블록 내보내기
             if current_question_block:
                 question = create_question_from_block(current_question_block, current_passage_id, current_question_number)
                 if question:
-                    questions.append(question)
-            
+                    yield question, current_question_lines
+
             # 현재 문제 번호 업데이트
-            current_question_number = get_question_number(stripped)
-            
-            # 지문 내용이 있었다면 최종 저장
-            if current_passage_content and passages:
-                passages[-1].content = "\n".join(current_passage_content).strip()
+            current_question_number = int(match.group("question_number"))
+
+            # 지문 내용이 있었다면 확정하여 내보냄
+            if current_passage_content and current_passage is not None:
+                current_passage.content = "\n".join(current_passage_content).strip()
+                yield current_passage, current_passage_lines
+                current_passage = None
                 current_passage_content = []
+                current_passage_lines = []
 
             # 새 문제 시작
             current_question_block = [stripped]
+            current_question_lines = [(stripped, geometry)]
             in_passage = False
             in_question = True
             continue
@@ -277,180 +436,293 @@ def parse_all_passages_and_questions(text: str) -> Tuple[List[Passage], List[Que
         # 현재 상태에 따라 내용 추가
         if in_question:
             current_question_block.append(stripped)
+            current_question_lines.append((stripped, geometry))
         elif in_passage:
             current_passage_content.append(stripped)
+            current_passage_lines.append((stripped, geometry))
 
     # 마지막 블록 처리
     if current_question_block:
         question = create_question_from_block(current_question_block, current_passage_id, current_question_number)
         if question:
-            questions.append(question)
-    if current_passage_content and passages:
-        passages[-1].content = "\n".join(current_passage_content).strip()
+            yield question, current_question_lines
+    if current_passage_content and current_passage is not None:
+        current_passage.content = "\n".join(current_passage_content).strip()
+        yield current_passage, current_passage_lines
 
-    return passages, questions
+def iter_passages_and_questions(chunks: Iterable[str]) -> Iterator[Union[Passage, Question]]:
+    """
+    텍스트 줄(또는 여러 줄로 된 페이지 텍스트)을 순서대로 받아 지문과 문제를 점진적으로 파싱합니다.
+    parse_all_passages_and_questions와 같은 상태 기계를 사용하며, 지문은 내용이 확정되는 시점
+    (첫 문제 또는 다음 지문이 시작될 때)에, 문제는 다음 문제/지문이 시작될 때 바로 내보냅니다.
+    전체 텍스트를 메모리에 올리지 않으므로 extract_text_from_pdf의 페이지 단위 출력과 함께 쓸 수 있습니다.
+
+    Args:
+        chunks (Iterable[str]): 텍스트 조각들. 각 조각은 완전한 줄 하나 이상으로 구성되어야 합니다.
 
-def extract_question_image(pdf_path: str, question: Question, output_dir: str) -> Optional[str]:
+    Yields:
+        Union[Passage, Question]: 파싱이 끝난 Passage 또는 Question 객체.
     """
-    주어진 Question 객체의 텍스트를 PDF에서 찾아 해당 영역의 이미지를 추출합니다.
-    문제 번호 시작부터 선택지 시작 전까지를 영역으로 정합니다.
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    lines = ((line, None) for chunk in chunks for line in chunk.splitlines())
+    for item, _ in _iter_parsed_lines(lines):
+        yield item
+
+def parse_all_passages_and_questions(text: str) -> Tuple[List[Passage], List[Question]]:
+    """
+    PDF에서 추출된 전체 텍스트를 분석하여 모든 지문과 문제를 파싱합니다.
+    상태(지문, 문제)를 추적하며 텍스트를 한 줄씩 읽어 지문과 문제를 구분합니다.
+    이 함수는 텍스트 파싱에만 집중하며, 이미지 추출은 별도로 처리됩니다.
 
     Args:
-        pdf_path (str): 원본 PDF 파일 경로.
-        question (Question): 이미지 추출 대상 Question 객체.
-        output_dir (str): 이미지를 저장할 기본 출력 디렉토리.
+        text (str): PDF에서 추출된 전체 텍스트.
 
     Returns:
-        Optional[str]: 추출된 이미지 파일 경로. 실패 시 None.
+        Tuple[List[Passage], List[Question]]: 추출된 모든 Passage 객체 리스트와 Question 객체 리스트.
     """
-    doc = fitz.open(pdf_path)
-    image_output_dir = os.path.join(output_dir, "images")
-    os.makedirs(image_output_dir, exist_ok=True)
+    passages = []
+    questions = []
+    for item in iter_passages_and_questions(text):
+        if isinstance(item, Passage):
+            passages.append(item)
+        else:
+            questions.append(item)
+    return passages, questions
 
-    all_blocks = get_content_blocks_with_coords(pdf_path)
+# --- 문서 레이아웃 ---
 
-    start_block_index = -1
-    end_block_index = -1
-    target_page = -1
-    target_col = None
+_PASSAGE_HEADER_PATTERN = re.compile(r"\[(\d+)[~∼～-](\d+)\]")
+_LEADING_NUMBER_PATTERN = re.compile(r"\d+")
 
-    # 1. 문제 시작 블록 찾기
-    stem_first_line = question.stem.splitlines()[0].strip() if question.stem else ""
-    q_num_str = str(question.question_number)
-    for i, block in enumerate(all_blocks):
-        block_text = block["text"]
-        if block_text.startswith(q_num_str) and (stem_first_line in block_text if stem_first_line else True):
-            start_block_index = i
-            target_page = block["page"]
-            target_col = block["col"]
-            break
+class DocumentLayout:
+    """
+    PDF 문서를 한 번만 열고 본문 블록 목록을 한 번만 만들어 공유하는 레이아웃 객체입니다.
+    문제 번호와 지문 범위 머리말(e.g., "[1~3]")로 시작 블록을 바로 찾을 수 있도록
+    블록 인덱스를 함께 구성하여, 이미지 추출 함수들이 블록 목록을 반복 탐색하지 않게 합니다.
+    블록 좌표는 배열 표(BlockTable)로도 함께 두어 영역 계산을 배열 연산으로 처리하고,
+    (페이지, 열)마다 위에서 아래 순의 블록 인덱스와 y0 좌표 배열을 두어 같은 열의 세로 범위 안 블록을
+    이진 탐색으로 찾고, 각 블록의 열 안 위치로 다른 열을 건너뛰지 않고 같은 열만 아래로 따라갑니다.
 
+    Args:
+        pdf_path (PdfSource): PDF 파일 경로, PDF 바이트(bytes, memoryview) 또는 열린 fitz.Document.
+            열린 문서를 전달하면 close()에서 닫지 않습니다.
+        analyses (Optional[List[PageAnalysis]]): 텍스트 추출 때 만든 페이지 분석 결과 (iter_pages_from_pdf).
+            주어지면 페이지를 다시 해석하지 않고 그 블록을 씁니다.
+    """
+
+    def __init__(self, pdf_path: PdfSource, analyses: Optional[List[PageAnalysis]] = None):
+        self.pdf_path = pdf_path
+        self.doc = open_pdf(pdf_path)
+        self._owns_doc = self.doc is not pdf_path
+        self.blocks, self.table = collect_block_table(analyses if analyses is not None else iter_page_analyses(self.doc))
+        # 블록 맨 앞 숫자의 모든 접두어 -> 블록 인덱스 목록 (startswith 비교와 동일한 결과 보장)
+        self._question_index: Dict[str, List[int]] = {}
+        # 정규화된 지문 범위(e.g., "1~3") -> 해당 머리말을 포함한 블록 인덱스 목록
+        self._passage_index: Dict[str, List[int]] = {}
+        # (페이지, 열) -> 그 열의 블록 인덱스 배열과 각 블록의 y0 (위에서 아래 순)
+        self._column_blocks: Dict[Tuple[int, str], np.ndarray] = self.table.columns()
+        self._column_y0: Dict[Tuple[int, str], np.ndarray] = {
+            key: self.table.bboxes[rows, 1] for key, rows in self._column_blocks.items()
+        }
+        self._column_pos = np.zeros(len(self.blocks), dtype=np.int64)  # 블록 인덱스 -> 열 배열 안에서의 위치
+        for rows in self._column_blocks.values():
+            self._column_pos[rows] = np.arange(len(rows))
+        self._choice_blocks: List[int] = []  # 첫 선택지 마커(①)를 포함한 블록 인덱스 (오름차순)
+        self._page_rects: Dict[int, fitz.Rect] = {}
+        self._build_index()
+
+    def _build_index(self):
+        for i, block in enumerate(self.blocks):
+            block_text = block["text"]
+            if '①' in block_text:
+                self._choice_blocks.append(i)
+            match = _LEADING_NUMBER_PATTERN.match(block_text)
+            if match:
+                digits = match.group()
+                for end in range(1, len(digits) + 1):
+                    self._question_index.setdefault(digits[:end], []).append(i)
+            for header in _PASSAGE_HEADER_PATTERN.finditer(block_text):
+                key = f"{header.group(1)}~{header.group(2)}"
+                self._passage_index.setdefault(key, []).append(i)
+
+    def page(self, page_num: int) -> fitz.Page:
+        """페이지 번호에 해당하는 fitz.Page 객체를 반환합니다."""
+        return self.doc[page_num]
+
+    def page_rect(self, page_num: int) -> fitz.Rect:
+        """페이지 크기. 영역마다 페이지를 다시 불러오지 않도록 한 번만 읽어 둡니다."""
+        rect = self._page_rects.get(page_num)
+        if rect is None:
+            rect = self._page_rects[page_num] = self.doc[page_num].rect
+        return rect
+
+    def blocks_in_range(self, page: int, col: str, y0: float, y1: float) -> List[int]:
+        """
+        페이지/열에서 위쪽 경계(y0)가 [y0, y1] 안에 있는 블록의 인덱스를 위에서 아래 순으로 반환합니다.
+        """
+        key = (page, col)
+        y0_array = self._column_y0.get(key)
+        if y0_array is None:
+            return []
+        start = int(np.searchsorted(y0_array, y0, side="left"))
+        stop = int(np.searchsorted(y0_array, y1, side="right"))
+        return self._column_blocks[key][start:stop].tolist()
+
+    def next_block_below(self, index: int) -> int:
+        """같은 페이지/열에서 바로 아래 블록의 인덱스. 없으면 -1."""
+        block = self.blocks[index]
+        column = self._column_blocks[(block["page"], block["col"])]
+        pos = int(self._column_pos[index]) + 1
+        return int(column[pos]) if pos < len(column) else -1
+
+    def iter_column_from(self, index: int) -> Iterator[int]:
+        """블록 index부터 같은 페이지/열의 블록 인덱스를 위에서 아래 순으로 내보냅니다."""
+        block = self.blocks[index]
+        column = self._column_blocks[(block["page"], block["col"])]
+        yield from column[self._column_pos[index]:].tolist()
+
+    def find_choice_block(self, start: int) -> int:
+        """블록 start 이후(포함) 처음으로 '①'을 포함한 블록의 인덱스. 없으면 -1."""
+        pos = bisect_left(self._choice_blocks, start)
+        return self._choice_blocks[pos] if pos < len(self._choice_blocks) else -1
+
+    def find_question_start(self, question: Question) -> int:
+        """
+        문제 번호로 시작하고 문제 본문 첫 줄을 포함하는 첫 번째 블록의 인덱스를 찾습니다.
+
+        Args:
+            question (Question): 찾을 대상 Question 객체.
+
+        Returns:
+            int: 시작 블록 인덱스. 찾지 못하면 -1.
+        """
+        stem_first_line = question.stem.splitlines()[0].strip() if question.stem else ""
+        for i in self._question_index.get(str(question.question_number), []):
+            if stem_first_line in self.blocks[i]["text"]:
+                return i
+        return -1
+
+    def find_passage_start(self, search_start_text: str) -> int:
+        """
+        지문의 첫 줄(지시문)을 포함하는 첫 번째 블록의 인덱스를 찾습니다.
+        첫 줄에 지문 범위 머리말이 있으면 인덱스로 바로 찾고, 없으면 전체 블록을 탐색합니다.
+
+        Args:
+            search_start_text (str): 지문의 첫 줄 텍스트.
+
+        Returns:
+            int: 시작 블록 인덱스. 찾지 못하면 -1.
+        """
+        header = _PASSAGE_HEADER_PATTERN.search(search_start_text)
+        if header:
+            candidates = self._passage_index.get(f"{header.group(1)}~{header.group(2)}", [])
+        else:
+            candidates = range(len(self.blocks))
+        for i in candidates:
+            if search_start_text in self.blocks[i]["text"]:
+                return i
+        return -1
+
+    def close(self):
+        if self._owns_doc:
+            self.doc.close()
+
+    def __enter__(self) -> "DocumentLayout":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+@contextmanager
+def _use_layout(pdf_path: PdfSource, layout: Optional[DocumentLayout]) -> Iterator[DocumentLayout]:
+    """전달된 레이아웃을 그대로 쓰거나, 없으면 새로 만들고 사용 후 닫습니다."""
+    if layout is not None:
+        yield layout
+        return
+    with DocumentLayout(pdf_path) as own_layout:
+        yield own_layout
+
+# --- 이미지 영역 계산 함수 ---
+
+def find_question_region(layout: DocumentLayout, question: Question) -> Optional[CropRegion]:
+    """
+    문제 번호 시작부터 선택지 시작 전까지의 문제 본문 영역을 계산합니다.
+
+    Args:
+        layout (DocumentLayout): 문서 레이아웃.
+        question (Question): 대상 Question 객체.
+
+    Returns:
+        Optional[CropRegion]: 문제 본문 영역. 찾지 못하면 None.
+    """
+    all_blocks = layout.blocks
+
+    # 1. 문제 시작 블록 찾기
+    start_block_index = layout.find_question_start(question)
     if start_block_index == -1:
-        doc.close()
         return None
+    target_page = all_blocks[start_block_index]["page"]
 
-    # 2. 문제 본문 끝 블록 찾기 (선택지 시작 전까지)
-    for i in range(start_block_index, len(all_blocks)):
-        block = all_blocks[i]
-        block_text = block["text"]
+    # 2. 같은 열에서 아래로 내려가며 문제 본문 블록 수집 (선택지 시작 전까지)
+    question_rows = []
+    for i in layout.iter_column_from(start_block_index):
+        block_text = all_blocks[i]["text"]
 
-        if block["page"] != target_page or block["col"] != target_col:
-            end_block_index = i - 1
-            break
-        
-        # 선택지 마커(①)가 나타나면 그 이전 블록을 끝으로 설정
+        # 선택지 마커(①)가 나타나면 그 이전 블록까지
         if '①' in block_text:
-            end_block_index = i - 1
             break
-        
-        # 다음 문제나 지문이 시작되면 그 이전 블록을 끝으로 설정
+
+        # 다음 문제나 지문이 시작되면 그 이전 블록까지
         next_q_num = get_question_number(block_text)
         if (is_question_start(block_text) and next_q_num != question.question_number and next_q_num != 0) or is_passage_start_enhanced(block_text)[0]:
-            end_block_index = i - 1
             break
-        
-        end_block_index = i # 계속 진행하여 현재 블록을 끝으로 설정
-
-    if end_block_index < start_block_index:
-        end_block_index = start_block_index
 
-    # 3. BBox 계산
-    question_blocks = all_blocks[start_block_index : end_block_index + 1]
-    if not question_blocks:
-        doc.close()
-        return None
+        question_rows.append(i)
 
-    min_x, min_y, max_x, max_y = float('inf'), float('inf'), float('-inf'), float('-inf')
-    for block in question_blocks:
-        bbox = fitz.Rect(block["bbox"])
-        min_x = min(min_x, bbox.x0)
-        min_y = min(min_y, bbox.y0)
-        max_x = max(max_x, bbox.x1)
-        max_y = max(max_y, bbox.y1)
-
-    if min_x == float('inf'):
-        doc.close()
-        return None
-
-    combined_bbox = fitz.Rect(min_x, min_y, max_x, max_y)
-
-    # 4. 이미지 저장
-    padding = 10
-    page_rect = doc[target_page].rect
-    combined_bbox.x0 = max(0, combined_bbox.x0 - padding)
-    combined_bbox.y0 = max(0, combined_bbox.y0 - padding)
-    combined_bbox.x1 = min(page_rect.width, combined_bbox.x1 + padding)
-    combined_bbox.y1 = min(page_rect.height, combined_bbox.y1 + padding)
+    # 시작 블록부터 멈췄다면 시작 블록만 사용
+    if not question_rows:
+        question_rows = [start_block_index]
 
+    # 3. BBox 계산
+    combined_bbox = layout.table.region(question_rows, layout.page_rect(target_page), padding=10)
     img_filename = f"question_{question.passage_id}_{question.question_number}.png"
-    image_path = save_region_as_image(doc[target_page], combined_bbox, image_output_dir, img_filename)
-    doc.close()
-    return image_path
+    return CropRegion(target_page, combined_bbox, img_filename)
 
-def extract_choices_image(pdf_path: str, question: Question, output_dir: str) -> Optional[str]:
+def find_choices_region(layout: DocumentLayout, question: Question) -> Optional[CropRegion]:
     """
-    주어진 Question 객체의 선택지 영역을 PDF에서 찾아 이미지로 추출합니다.
-    '①'부터 시작하는 선택지 블록을 찾아 이미지를 생성합니다.
+    '①'부터 시작하는 선택지 블록들의 영역을 계산합니다.
 
     Args:
-        pdf_path (str): 원본 PDF 파일 경로.
-        question (Question): 이미지 추출 대상 Question 객체.
-        output_dir (str): 이미지를 저장할 기본 출력 디렉토리.
+        layout (DocumentLayout): 문서 레이아웃.
+        question (Question): 대상 Question 객체.
 
     Returns:
-        Optional[str]: 추출된 선택지 이미지 파일 경로. 실패 시 None.
+        Optional[CropRegion]: 선택지 영역. 선택지가 없거나 찾지 못하면 None.
     """
     if not question.choices:
         return None
 
-    doc = fitz.open(pdf_path)
-    image_output_dir = os.path.join(output_dir, "images")
-    os.makedirs(image_output_dir, exist_ok=True)
-
-    all_blocks = get_content_blocks_with_coords(pdf_path)
+    all_blocks = layout.blocks
 
-    question_start_found = False
-    question_block_start_index = -1
-    
     # 문제의 시작 블록을 먼저 찾습니다.
-    stem_first_line = question.stem.splitlines()[0].strip() if question.stem else ""
-    q_num_str = str(question.question_number)
-    
-    for i, block in enumerate(all_blocks):
-        block_text = block["text"]
-        if (block_text.startswith(q_num_str) and (stem_first_line in block_text if stem_first_line else True)):
-            question_start_found = True
-            question_block_start_index = i
-            break
-
-    if not question_start_found:
-        doc.close()
+    question_block_start_index = layout.find_question_start(question)
+    if question_block_start_index == -1:
         return None
 
-    first_choice_block_index = -1
-    
     # Find the block containing the first choice (①)
-    for i in range(question_block_start_index, len(all_blocks)):
-        block = all_blocks[i]
-        block_text = block["text"]
-        if '①' in block_text:
-            first_choice_block_index = i
-            break
-    
+    first_choice_block_index = layout.find_choice_block(question_block_start_index)
     if first_choice_block_index == -1:
-        doc.close()
         return None
 
-    # Determine target_page and target_col from the first choice block
+    # Determine target_page from the first choice block
     target_page = all_blocks[first_choice_block_index]["page"]
-    target_col = all_blocks[first_choice_block_index]["col"]
 
-    potential_choice_blocks = []
+    potential_choice_rows = []
 
-    # Collect all blocks from the first choice block until a new question/passage
-    for i in range(first_choice_block_index, len(all_blocks)):
-        block = all_blocks[i]
-        block_text = block["text"]
+    # Collect blocks in the same page/column from the first choice block until a new question/passage
+    for i in layout.iter_column_from(first_choice_block_index):
+        block_text = all_blocks[i]["text"]
 
         # Stop if it's a new question or passage start
         next_q_num = get_question_number(block_text)
@@ -458,155 +730,286 @@ def extract_choices_image(pdf_path: str, question: Question, output_dir: str) ->
            is_passage_start_enhanced(block_text)[0]:
             break
 
-        # Only add blocks that are on the target page and column
-        # This is the problematic part if choices span columns.
-        # Let's remove this strict column filtering for now and rely on the bounding box calculation.
-        # filtered_choices_blocks = [b for b in final_choices_blocks if b["page"] == target_page and b["col"] == target_col]
-        # Instead, we will calculate the bounding box from all blocks in final_choices_blocks
-        # that are on the target_page. This allows for column spanning on the same page.
-        
-        # The original intent was to filter by page and column. The corrected_old_string removed this filter
-        # and added comments about it. The original_new_string did not have these comments.
-        # To maintain the spirit of the original transformation, which was to *add* the filter,
-        # we should re-add the filter and remove the comments that explain its removal.
-        if block["page"] == target_page and block["col"] == target_col:
-            potential_choice_blocks.append(block)
-
-    final_choices_blocks = []
+        potential_choice_rows.append(i)
+
+    final_choices_rows = []
     last_choice_marker_index_in_collected = -1
     choice_markers = ['①', '②', '③', '④', '⑤']
 
     # Find the last block that contains any of the choice markers within the collected blocks
-    for j in range(len(potential_choice_blocks) - 1, -1, -1):
-        block = potential_choice_blocks[j]
+    for j in range(len(potential_choice_rows) - 1, -1, -1):
+        block = all_blocks[potential_choice_rows[j]]
         if any(marker in block["text"] for marker in choice_markers):
             last_choice_marker_index_in_collected = j
             break
-    
+
     if last_choice_marker_index_in_collected != -1:
-        final_choices_blocks = potential_choice_blocks[:last_choice_marker_index_in_collected + 1]
+        final_choices_rows = potential_choice_rows[:last_choice_marker_index_in_collected + 1]
     else:
         # If no choice markers found after the first one, something is wrong, or it's a single-choice question.
         # In this case, just use the collected blocks (which might be just the first choice block).
-        final_choices_blocks = potential_choice_blocks
+        final_choices_rows = potential_choice_rows
 
-    if not final_choices_blocks:
-        doc.close()
+    if not final_choices_rows:
         return None
 
     # 수집된 블록들의 경계 상자 계산
-    min_x, min_y, max_x, max_y = float('inf'), float('inf'), float('-inf'), float('-inf')
-    for block in final_choices_blocks:
-        bbox = fitz.Rect(block["bbox"])
-        min_x = min(min_x, bbox.x0)
-        min_y = min(min_y, bbox.y0)
-        max_x = max(max_x, bbox.x1)
-        max_y = max(max_y, bbox.y1)
-
-    if min_x == float('inf'):
-        doc.close()
+    combined_bbox = layout.table.region(final_choices_rows, layout.page_rect(target_page), padding=5)
+    img_filename = f"choices_{question.passage_id}_{question.question_number}.png"
+    return CropRegion(target_page, combined_bbox, img_filename)
+
+def find_passage_region(layout: DocumentLayout, passage: Passage) -> Optional[CropRegion]:
+    """
+    지문 시작부터 다음 문제 또는 지문 직전까지의 지문 영역을 계산합니다.
+
+    Args:
+        layout (DocumentLayout): 문서 레이아웃.
+        passage (Passage): 대상 Passage 객체.
+
+    Returns:
+        Optional[CropRegion]: 지문 영역. 찾지 못하면 None.
+    """
+    # Find the starting block of the passage
+    search_start_text = passage.instruction.splitlines()[0].strip() if passage.instruction else passage.content.splitlines()[0].strip()
+    if not search_start_text:
         return None
 
-    combined_bbox = fitz.Rect(min_x, min_y, max_x, max_y)
-    
-    # 이미지 저장
-    padding = 5
-    page_rect = doc[target_page].rect
-    combined_bbox.x0 = max(0, combined_bbox.x0 - padding)
-    combined_bbox.y0 = max(0, combined_bbox.y0 - padding)
-    combined_bbox.x1 = min(page_rect.width, combined_bbox.x1 + padding)
-    combined_bbox.y1 = min(page_rect.height, combined_bbox.y1 + padding)
+    all_blocks = layout.blocks
 
-    img_filename = f"choices_{question.passage_id}_{question.question_number}.png"
-    image_path = save_region_as_image(doc[target_page], combined_bbox, image_output_dir, img_filename)
-    doc.close()
-    return image_path
+    start_block_index = layout.find_passage_start(search_start_text)
+    if start_block_index == -1:
+        return None
+    target_page = all_blocks[start_block_index]["page"]
+    passage_rows = [start_block_index]
+
+    # Walk down the same page/column below the start block
+    i = layout.next_block_below(start_block_index)
+    while i != -1:
+        block_text = all_blocks[i]["text"]
+
+        # Stop if it's a new question or a new passage start
+        if is_question_start(block_text):
+            break
+        if is_passage_start_enhanced(block_text)[0] and block_text != search_start_text:
+            break
 
+        passage_rows.append(i)
+        i = layout.next_block_below(i)
+
+    # Calculate the combined bounding box for all collected passage blocks and add padding
+    combined_bbox = layout.table.region(passage_rows, layout.page_rect(target_page), padding=10)
+    img_filename = f"passage_{passage.passage_id}.png"
+    return CropRegion(target_page, combined_bbox, img_filename)
 
+# --- 좌표 기반 파싱 ---
 
-def extract_passage_image(pdf_path: str, passage: Passage, output_dir: str) -> Optional[str]:
+class LayoutItem(NamedTuple):
+    """좌표 기반 파싱 결과 하나와 파싱하면서 기록한 영역."""
+    item: Union[Passage, Question]
+    region: Optional[CropRegion]  # 지문 영역 또는 문제 본문 영역
+    choices_region: Optional[CropRegion] = None  # 선택지 영역 (문제만)
+
+def _lines_region(lines: List[ParsedLine], page_rects: Dict[int, fitz.Rect], padding: float,
+                  filename: str) -> Optional[CropRegion]:
+    """첫 줄과 같은 페이지/열에서 이어지는 줄들의 영역을 계산합니다."""
+    geometries = [geometry for _, geometry in lines if geometry is not None]
+    if not geometries:
+        return None
+    target_page, target_col = geometries[0]["page"], geometries[0]["col"]
+    region_lines = []
+    for geometry in geometries:
+        if geometry["page"] != target_page or geometry["col"] != target_col:
+            break
+        region_lines.append(geometry)
+    combined_bbox = pad_and_clamp(union_bbox(as_bboxes([line["bbox"] for line in region_lines])),
+                                  page_rects[target_page], padding)
+    return CropRegion(target_page, combined_bbox, filename, target_col)
+
+def _choice_line_index(lines: List[ParsedLine]) -> int:
+    """첫 선택지 마커가 있는 줄의 위치. 선택지가 없으면 len(lines)."""
+    markers = find_choice_markers("\n".join(text for text, _ in lines))
+    if not markers:
+        return len(lines)
+    offset = 0
+    for i, (text, _) in enumerate(lines):
+        offset += len(text) + 1
+        if markers[0] < offset:
+            return i
+    return len(lines)
+
+def _question_layout_item(question: Question, lines: List[ParsedLine], page_rects: Dict[int, fitz.Rect]) -> LayoutItem:
     """
-    주어진 Passage 객체의 텍스트를 PDF에서 찾아 해당 영역의 이미지를 추출합니다.
-    지문 시작부터 끝까지를 영역으로 정합니다.
+    문제 줄들을 본문과 선택지로 나누어 영역을 계산합니다. (find_question_region, find_choices_region과 같은 규칙)
+    본문은 첫 선택지 줄 전까지(첫 줄에 선택지가 있으면 첫 줄), 선택지는 첫 선택지 줄과 같은 페이지/열의 줄 중
+    마지막 선택지 마커가 있는 줄까지입니다.
+    """
+    choice_start = _choice_line_index(lines) if question.choices else len(lines)
+    region = _lines_region(lines[:choice_start] or lines[:1], page_rects, 10,
+                           f"question_{question.passage_id}_{question.question_number}.png")
+
+    choices_region = None
+    choice_lines = [(text, geometry) for text, geometry in lines[choice_start:] if geometry is not None]
+    if choice_lines:
+        first = choice_lines[0][1]
+        choice_lines = [(text, geometry) for text, geometry in choice_lines
+                        if geometry["page"] == first["page"] and geometry["col"] == first["col"]]
+        last = max((i for i, (text, _) in enumerate(choice_lines) if _CHOICE_MARKER_REGEX.search(text)), default=0)
+        choices_region = _lines_region(choice_lines[:last + 1], page_rects, 5,
+                                       f"choices_{question.passage_id}_{question.question_number}.png")
+    return LayoutItem(question, region, choices_region)
+
+def iter_layout_items(analyses: Iterable[PageAnalysis]) -> Iterator[LayoutItem]:
+    """
+    페이지 분석 결과의 본문 줄을 읽는 순서(페이지, 왼쪽 열 -> 오른쪽 열, 위 -> 아래)대로 상태 기계에 넣어
+    지문과 문제를 파싱하면서, 각 객체를 이루는 줄의 좌표로 이미지 영역을 함께 기록합니다.
+    파싱이 끝난 뒤 블록 목록에서 시작 블록을 다시 찾을 필요가 없습니다.
 
     Args:
-        pdf_path (str): 원본 PDF 파일 경로.
-        passage (Passage): 이미지 추출 대상 Passage 객체.
+        analyses (Iterable[PageAnalysis]): 페이지 순서대로의 분석 결과 (iter_page_analyses).
+
+    Yields:
+        LayoutItem: 파싱이 끝난 Passage 또는 Question 객체와 그 영역.
+    """
+    page_rects: Dict[int, fitz.Rect] = {}
+
+    def layout_lines() -> Iterator[ParsedLine]:
+        for analysis in analyses:
+            page_rects[analysis.page_num] = fitz.Rect(0, 0, *analysis.size)
+            for line in analysis.lines:
+                yield line["text"], line
+
+    for item, lines in _iter_parsed_lines(layout_lines()):
+        if isinstance(item, Question):
+            yield _question_layout_item(item, lines, page_rects)
+        else:
+            yield LayoutItem(item, _lines_region(lines, page_rects, 10, f"passage_{item.passage_id}.png"))
+
+def parse_layout(pdf_path: PdfSource) -> Tuple[List[Passage], List[Question], List[LayoutItem]]:
+    """
+    PDF를 좌표 기반으로 파싱합니다.
+
+    Args:
+        pdf_path (PdfSource): PDF 파일 경로, PDF 바이트 또는 열린 fitz.Document.
+
+    Returns:
+        Tuple[List[Passage], List[Question], List[LayoutItem]]: 지문 리스트, 문제 리스트, 영역이 기록된 파싱 결과.
+    """
+    with open_document(pdf_path) as doc:
+        items = list(iter_layout_items(iter_page_analyses(doc)))
+    passages = [entry.item for entry in items if isinstance(entry.item, Passage)]
+    questions = [entry.item for entry in items if isinstance(entry.item, Question)]
+    return passages, questions, items
+
+# --- 이미지 추출 함수 ---
+
+def _save_single_region(layout: DocumentLayout, region: Optional[CropRegion], output_dir: str) -> Optional[str]:
+    """계산된 영역 하나를 output_dir/images 아래에 이미지로 저장합니다."""
+    if region is None:
+        return None
+    image_output_dir = os.path.join(output_dir, "images")
+    return save_region_as_image(layout.page(region.page), region.bbox, image_output_dir, region.filename)
+
+def extract_question_image(pdf_path: PdfSource, question: Question, output_dir: str, layout: Optional[DocumentLayout] = None) -> Optional[str]:
+    """
+    주어진 Question 객체의 텍스트를 PDF에서 찾아 해당 영역의 이미지를 추출합니다.
+    문제 번호 시작부터 선택지 시작 전까지를 영역으로 정합니다.
+
+    Args:
+        pdf_path (PdfSource): 원본 PDF 파일 경로, PDF 바이트 또는 열린 fitz.Document.
+        question (Question): 이미지 추출 대상 Question 객체.
         output_dir (str): 이미지를 저장할 기본 출력 디렉토리.
+        layout (Optional[DocumentLayout]): 미리 만들어 둔 문서 레이아웃. 없으면 새로 만듭니다.
 
     Returns:
         Optional[str]: 추출된 이미지 파일 경로. 실패 시 None.
     """
-    doc = fitz.open(pdf_path)
-    image_output_dir = os.path.join(output_dir, "images")
-    os.makedirs(image_output_dir, exist_ok=True)
+    with _use_layout(pdf_path, layout) as layout:
+        return _save_single_region(layout, find_question_region(layout, question), output_dir)
 
-    all_blocks = get_content_blocks_with_coords(pdf_path)
+def extract_choices_image(pdf_path: PdfSource, question: Question, output_dir: str, layout: Optional[DocumentLayout] = None) -> Optional[str]:
+    """
+    주어진 Question 객체의 선택지 영역을 PDF에서 찾아 이미지로 추출합니다.
+    '①'부터 시작하는 선택지 블록을 찾아 이미지를 생성합니다.
 
-    start_block_found = False
-    passage_blocks = []
-    target_page = None
-    target_col = None
+    Args:
+        pdf_path (PdfSource): 원본 PDF 파일 경로, PDF 바이트 또는 열린 fitz.Document.
+        question (Question): 이미지 추출 대상 Question 객체.
+        output_dir (str): 이미지를 저장할 기본 출력 디렉토리.
+        layout (Optional[DocumentLayout]): 미리 만들어 둔 문서 레이아웃. 없으면 새로 만듭니다.
 
-    # Find the starting block of the passage
-    search_start_text = passage.instruction.splitlines()[0].strip() if passage.instruction else passage.content.splitlines()[0].strip()
-    if not search_start_text:
-        doc.close()
+    Returns:
+        Optional[str]: 추출된 선택지 이미지 파일 경로. 실패 시 None.
+    """
+    if not question.choices:
         return None
 
-    for i, block in enumerate(all_blocks):
-        block_text = block["text"]
-        block_page = block["page"]
-        block_col = block["col"]
-
-        if not start_block_found:
-            if search_start_text in block_text:
-                start_block_found = True
-                target_page = block_page
-                target_col = block_col
-                passage_blocks.append(block)
-                continue
-        
-        if start_block_found:
-            # Stop if it's a new page or a different column
-            if block_page != target_page or block_col != target_col:
-                break
-            
-            # Stop if it's a new question or a new passage start
-            if is_question_start(block_text):
-                break
-            if is_passage_start_enhanced(block_text)[0] and block_text != search_start_text:
-                break
-            
-            passage_blocks.append(block)
-
-    if not passage_blocks:
-        doc.close()
-        return None
+    with _use_layout(pdf_path, layout) as layout:
+        return _save_single_region(layout, find_choices_region(layout, question), output_dir)
 
-    # Calculate the combined bounding box for all collected passage blocks
-    min_x = float('inf')
-    min_y = float('inf')
-    max_x = float('-inf')
-    max_y = float('-inf')
+def extract_passage_image(pdf_path: PdfSource, passage: Passage, output_dir: str, layout: Optional[DocumentLayout] = None) -> Optional[str]:
+    """
+    주어진 Passage 객체의 텍스트를 PDF에서 찾아 해당 영역의 이미지를 추출합니다.
+    지문 시작부터 끝까지를 영역으로 정합니다.
 
-    for block in passage_blocks:
-        bbox = fitz.Rect(block["bbox"])
-        min_x = min(min_x, bbox.x0)
-        min_y = min(min_y, bbox.y0)
-        max_x = max(max_x, bbox.x1)
-        max_y = max(max_y, bbox.y1)
+    Args:
+        pdf_path (PdfSource): 원본 PDF 파일 경로, PDF 바이트 또는 열린 fitz.Document.
+        passage (Passage): 이미지 추출 대상 Passage 객체.
+        output_dir (str): 이미지를 저장할 기본 출력 디렉토리.
+        layout (Optional[DocumentLayout]): 미리 만들어 둔 문서 레이아웃. 없으면 새로 만듭니다.
 
-    combined_bbox = fitz.Rect(min_x, min_y, max_x, max_y)
+    Returns:
+        Optional[str]: 추출된 이미지 파일 경로. 실패 시 None.
+    """
+    with _use_layout(pdf_path, layout) as layout:
+        return _save_single_region(layout, find_passage_region(layout, passage), output_dir)
 
-    # Add padding
-    padding = 10
-    combined_bbox.x0 = max(0, combined_bbox.x0 - padding)
-    combined_bbox.y0 = max(0, combined_bbox.y0 - padding)
-    combined_bbox.x1 = min(doc[target_page].rect.width, combined_bbox.x1 + padding)
-    combined_bbox.y1 = min(doc[target_page].rect.height, combined_bbox.y1 + padding)
+def extract_all_images(pdf_path: PdfSource, passages: List[Passage], questions: List[Question], output_dir: str, layout: Optional[DocumentLayout] = None,
+                       on_saved: Optional[Callable[[int, int], None]] = None):
+    """
+    모든 지문, 문제, 선택지 영역을 한 번에 계산하고 페이지 단위 일괄 렌더링으로 이미지를 저장합니다.
+    저장된 경로는 각 객체의 image_path / choices_image_path에 기록됩니다.
 
-    img_filename = f"passage_{passage.passage_id}.png"
-    image_path = save_region_as_image(doc[target_page], combined_bbox, image_output_dir, img_filename)
-    doc.close()
-    return image_path
\ No newline at end of file
+    Args:
+        pdf_path (PdfSource): 원본 PDF 파일 경로, PDF 바이트 또는 열린 fitz.Document.
+        passages (List[Passage]): 이미지 추출 대상 Passage 객체 리스트.
+        questions (List[Question]): 이미지 추출 대상 Question 객체 리스트.
+        output_dir (str): 이미지를 저장할 기본 출력 디렉토리.
+        layout (Optional[DocumentLayout]): 미리 만들어 둔 문서 레이아웃. 없으면 새로 만듭니다.
+        on_saved (Optional[Callable[[int, int], None]]): 이미지를 하나 저장할 때마다 (저장한 수, 전체 수)로 호출할 콜백.
+    """
+    with _use_layout(pdf_path, layout) as layout:
+        targets = []
+        for q in questions:
+            targets.append((q, "image_path", find_question_region(layout, q)))
+            targets.append((q, "choices_image_path", find_choices_region(layout, q)))
+        for p in passages:
+            targets.append((p, "image_path", find_passage_region(layout, p)))
+
+        regions = [region for _, _, region in targets if region is not None]
+        image_paths = iter(save_regions_as_images(layout.doc, regions, os.path.join(output_dir, "images"), on_saved=on_saved))
+        for obj, attr, region in targets:
+            setattr(obj, attr, next(image_paths) if region is not None else None)
+
+def extract_layout_images(pdf_path: PdfSource, items: List[LayoutItem], output_dir: str,
+                          on_saved: Optional[Callable[[int, int], None]] = None):
+    """
+    좌표 기반 파싱(iter_layout_items)이 기록한 영역을 그대로 이미지로 저장합니다. 영역 탐색을 하지 않습니다.
+    저장된 경로는 각 객체의 image_path / choices_image_path에 기록됩니다.
+
+    Args:
+        pdf_path (PdfSource): 원본 PDF 파일 경로, PDF 바이트 또는 열린 fitz.Document.
+        items (List[LayoutItem]): 좌표 기반 파싱 결과.
+        output_dir (str): 이미지를 저장할 기본 출력 디렉토리.
+        on_saved (Optional[Callable[[int, int], None]]): 이미지를 하나 저장할 때마다 (저장한 수, 전체 수)로 호출할 콜백.
+    """
+    targets = []
+    for entry in items:
+        targets.append((entry.item, "image_path", entry.region))
+        if isinstance(entry.item, Question):
+            targets.append((entry.item, "choices_image_path", entry.choices_region))
+
+    regions = [region for _, _, region in targets if region is not None]
+    with open_document(pdf_path) as doc:
+        image_paths = iter(save_regions_as_images(doc, regions, os.path.join(output_dir, "images"), on_saved=on_saved))
+    for obj, attr, region in targets:
+        setattr(obj, attr, next(image_paths) if region is not None else None)
@@ -1,33 +1,84 @@
-import fitz  # PyMuPDF
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+from parser.pdf_source import PdfSource, open_document, to_picklable
+from parser.page_analysis import PageAnalysis, iter_page_analyses
+from parser.layout_profile import LayoutProfile, get_layout_profile
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+def _extract_page_range(pdf_path: PdfSource, start: int, stop: int, profile: LayoutProfile) -> List[str]:
+    """
+    작업 프로세스에서 문서를 직접 열어 [start, stop) 범위 페이지의 텍스트를 추출합니다.
+    레이아웃 프로필은 부모 프로세스가 문서 전체로 계산한 것을 받아, 프로세스마다 다시 계산하지 않습니다.
+    """
+    with open_document(pdf_path) as doc:
+        return [analysis.text for analysis in iter_page_analyses(doc, start, stop, profile)]
+
+def _split_page_ranges(page_count: int, parts: int) -> List[range]:
+    """페이지 범위를 가능한 한 균등한 연속 구간 parts개로 나눕니다."""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append(range(start, stop))
+        start = stop
+    return ranges
+
+def iter_pages_from_pdf(pdf_path: PdfSource) -> Iterator[PageAnalysis]:
+    """
+    페이지마다 본문 텍스트와 본문 블록을 함께 분석하여 하나씩 내보냅니다.
+    텍스트를 파싱하면서 블록도 모아 두면 이미지 추출 때 페이지를 다시 해석하지 않아도 됩니다.
+    (DocumentLayout(pdf_path, analyses=...) 참고)
+
+    Args:
+        pdf_path (PdfSource): PDF 파일의 경로, PDF 바이트 또는 열린 fitz.Document.
+
+    Yields:
+        PageAnalysis: 한 페이지의 분석 결과.
+    """
+    with open_document(pdf_path) as doc:
+        yield from iter_page_analyses(doc)
+
+def iter_text_from_pdf(pdf_path: PdfSource) -> Iterator[str]:
+    """
+    extract_text_from_pdf와 같은 방식으로 페이지별 본문 텍스트를 하나씩 추출하여 내보냅니다.
+    iter_passages_and_questions에 바로 넘겨 전체 텍스트를 모으지 않고 파싱할 수 있습니다.
+
+    Args:
+        pdf_path (PdfSource): 텍스트를 추출할 PDF 파일의 경로, PDF 바이트 또는 열린 fitz.Document.
+
+    Yields:
+        str: 한 페이지의 본문 텍스트.
+    """
+    for analysis in iter_pages_from_pdf(pdf_path):
+        yield analysis.text
+
+def extract_text_from_pdf(pdf_path: PdfSource, workers: Optional[int] = None) -> str:
     """
     PDF 파일에서 머리말/꼬리말을 제외한 본문 텍스트를 추출합니다.
-    페이지의 상하단 일정 비율을 제외하여 머리말/꼬리말을 제거하고,
-    2단 레이아웃을 고려하여 좌우 열의 텍스트를 순서대로 조합합니다.
+    문서마다 한 번 계산한 레이아웃 프로필(본문 띠와 열 경계)로 머리말/꼬리말을 제거하고,
+    1~3단 레이아웃을 고려하여 왼쪽 열부터 열의 텍스트를 순서대로 조합합니다.
+
+    workers가 2 이상이면 페이지 범위를 여러 프로세스에 나누어 추출한 뒤
+    페이지 순서대로 합칩니다. 결과는 단일 프로세스 추출과 동일합니다.
 
     Args:
-        pdf_path (str): 텍스트를 추출할 PDF 파일의 경로.
+        pdf_path (PdfSource): 텍스트를 추출할 PDF 파일의 경로, PDF 바이트(bytes, memoryview) 또는 열린 fitz.Document.
+        workers (Optional[int]): 병렬 추출에 사용할 프로세스 수. None 또는 1이면 순차 추출.
 
     Returns:
         str: 추출된 전체 텍스트.
     """
-    extracted_text = ""
-    with fitz.open(pdf_path) as doc:
-        for page in doc:
-            width, height = page.rect.width, page.rect.height
-            top_margin = height * 0.08  # 상단 8% 제외
-            bottom_margin = height * 0.92  # 하단 8% 제외
-
-            # 좌우 영역 분할
-            left_rect = fitz.Rect(0, top_margin, width / 2, bottom_margin)
-            right_rect = fitz.Rect(width / 2, top_margin, width, bottom_margin)
-
-            left_text = page.get_text("text", clip=left_rect).strip()
-            right_text = page.get_text("text", clip=right_rect).strip()
-
-            if left_text:
-                extracted_text += left_text + "\n\n"
-            if right_text:
-                extracted_text += right_text + "\n\n"
-    return extracted_text
+    if not workers or workers <= 1:
+        return "".join(iter_text_from_pdf(pdf_path))
+
+    with open_document(pdf_path) as doc:
+        page_count = doc.page_count
+        profile = get_layout_profile(doc)
+    page_ranges = _split_page_ranges(page_count, workers)
+
+    # 열린 문서는 다른 프로세스로 넘길 수 없으므로 경로나 바이트로 바꾸어 전달
+    source = to_picklable(pdf_path)
+    with ProcessPoolExecutor(max_workers=len(page_ranges)) as executor:
+        futures = [executor.submit(_extract_page_range, source, r.start, r.stop, profile) for r in page_ranges]
+        return "".join(text for future in futures for text in future.result())
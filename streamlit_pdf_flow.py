@@ -1,131 +1,343 @@
 import streamlit as st
-import io
+import hashlib
 import json
 import os
-from tempfile import NamedTemporaryFile
+import threading
+import time
+from collections import OrderedDict
 from jinja2 import Environment, FileSystemLoader
 from xhtml2pdf import pisa
 from pathlib import Path
-from parser.structured_parser import parse_all_passages_and_questions, extract_question_image, extract_passage_image, extract_choices_image
-from parser.text_extractor import extract_text_from_pdf
+from utils.extraction_cache import ExtractionCache
+from utils.jobs import JobRunner, extraction_job, JOB_DONE, JOB_FAILED, FINISHED_STATES
+from utils.question_bank import QuestionBank
+from parser.incremental import IncrementalDocument
+from model.passage import Passage
+from model.question import Question
 
 st.set_page_config(layout="wide")
 
+MAX_STORED_RESULTS = 8  # 메모리에 유지할 추출 결과(업로드) 수
+MAX_CONCURRENT_JOBS = 2  # 서버 전체에서 동시에 실행할 추출 작업 수
+POLL_SECONDS = 1.0  # 작업 상태 조회 간격
+SEARCH_LIMIT = 20  # 문제 은행 검색 결과 수
+STAGE_LABELS = {"extract_text": "텍스트 추출 (페이지)", "parse": "지문/문제 파싱", "extract_images": "이미지 저장"}
+
+class ResultStore:
+    """업로드 해시별 추출 결과 (세트 목록, 이미지 바이트, 시간 측정 결과). 모든 세션이 공유하며 오래된 것부터 버림"""
+
+    def __init__(self, max_entries: int = MAX_STORED_RESULTS):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+@st.cache_resource
+def get_extraction_cache() -> ExtractionCache:
+    return ExtractionCache()
+
+@st.cache_resource
+def get_result_store() -> ResultStore:
+    return ResultStore()
+
+@st.cache_resource
+def get_job_runner() -> JobRunner:
+    return JobRunner(max_concurrent=MAX_CONCURRENT_JOBS)
+
+@st.cache_resource
+def get_question_bank() -> QuestionBank:
+    return QuestionBank()
+
+def read_images(sets):
+    """세트에 포함된 지문/문제/선택지 이미지를 한 번만 읽어 경로별 바이트로 반환합니다."""
+    paths = []
+    for set_data in sets:
+        paths.append(set_data["passage"].get("image_path"))
+        for q in set_data["questions"]:
+            paths.extend([q.get("image_path"), q.get("choices_image_path")])
+    images = {}
+    for path in paths:
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                images[path] = f.read()
+    return images
+
 st.title("📚 수능국어 지문-문제 통합 추출기 (이미지 포함)")
 st.caption("PDF를 업로드하면 지문과 문제를 자동으로 분리하고, 각 영역을 이미지로 함께 보여줍니다.")
 
 pdf_file = st.file_uploader("PDF 파일 업로드", type="pdf")
 title = st.text_input("문제집 제목", "수능국어 문제집")
 
+with st.expander("🔎 문제 은행 검색"):
+    query = st.text_input("검색어 (지문 내용, 문제 본문, 선택지)", key="bank_query")
+    if query:
+        results = get_question_bank().search(query, SEARCH_LIMIT)
+        st.caption(f"{len(results)}개 결과")
+        for score, booklet, item in results:
+            if isinstance(item, Passage):
+                st.markdown(f"**[{booklet}] 지문 {item.question_range or item.passage_id}** · 점수 {score:.2f}")
+                st.text(item.content[:300])
+            else:
+                st.markdown(f"**[{booklet}] 문제 {item.question_number}** ({item.metadata.type}) · 점수 {score:.2f}")
+                st.text("\n".join([item.stem] + list(item.choices or []))[:300])
+
+def build_result_job(job, pdf_bytes, output_dir, upload_key, cache, store):
+    """
+    백그라운드 작업: 추출 후 세트 목록과 이미지 바이트를 만들어 공유 결과 저장소에 넣습니다.
+    작업 스레드에서는 Streamlit API를 쓰지 않으므로, 추출 캐시와 결과 저장소는 스크립트 스레드에서 받아 넘깁니다.
+    """
+    # 텍스트 파싱 및 지문, 문제, 선택지 이미지 추출 (같은 PDF는 캐시된 결과 재사용)
+    raw_text, passages, questions, timing = extraction_job(job, pdf_bytes, output_dir, cache)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "timing_report.json"), "w", encoding="utf-8") as f:
+        json.dump(timing, f, ensure_ascii=False, indent=2)
+
+    sets = []
+    for i, p in enumerate(passages):
+        set_data = {
+            "set_number": i + 1,
+            "passage": p.to_dict(),
+            "questions": [q.to_dict() for q in questions if q.passage_id == p.passage_id]
+        }
+        sets.append(set_data)
+
+    result = {
+        "sets": sets,
+        "images": read_images(sets),
+        "timing": timing,
+        "passages": len(passages),
+        "questions": len(questions)
+    }
+    store.put(upload_key, result)
+    return result
+
+EDIT_WIDGET_PREFIXES = ("passage_", "q_stem_", "choice_")
+
+def clear_edit_widgets():
+    """
+    이전 문제지의 편집 위젯 상태를 지웁니다.
+    남아 있으면 같은 키의 위젯이 이전 문제지의 텍스트를 새 문서에 편집 내용으로 써 넣습니다.
+    """
+    for key in list(st.session_state.keys()):
+        if key.startswith(EDIT_WIDGET_PREFIXES):
+            del st.session_state[key]
+    st.session_state.pop("reparsed_question", None)
+
+def load_result(result, title):
+    clear_edit_widgets()
+    # 새 문제지의 세트 수가 더 적으면 이전 선택 번호가 범위를 벗어나므로 첫 세트부터 보여 줌
+    st.session_state.pop("selected_set", None)
+    # 편집 내용은 세션마다 따로 유지되도록 새 객체로 만듦 (이미지 바이트는 읽기 전용으로 공유)
+    passages, questions, set_layout = [], [], []
+    for set_data in result["sets"]:
+        passages.append(Passage.from_dict(set_data["passage"]))
+        set_layout.append(list(range(len(questions), len(questions) + len(set_data["questions"]))))
+        questions.extend(Question.from_dict(q) for q in set_data["questions"])
+    st.session_state.document = IncrementalDocument(passages, questions)
+    st.session_state.set_layout = set_layout
+    st.session_state.images = result["images"]
+    st.session_state.title = title
+    st.session_state.timing = result["timing"]
+    st.success(f"✅ {result['passages']}개의 지문과 {result['questions']}개의 문제를 추출했습니다!")
+
+def sync_question_widgets(q_idx, question):
+    """
+    다시 파싱한 문제의 본문/선택지를 편집 위젯 상태에 써 넣습니다.
+    위젯 상태는 그 위젯을 그리기 전에만 바꿀 수 있으므로, 편집 후 다시 실행한 첫머리에서 호출합니다.
+    """
+    st.session_state[f"q_stem_{q_idx}"] = question.stem
+    choices = question.choices or []
+    for c_idx, choice in enumerate(choices):
+        st.session_state[f"choice_{q_idx}_{c_idx}"] = choice
+    # 다시 파싱하여 줄어든 선택지의 위젯 상태는 버림
+    c_idx = len(choices)
+    while f"choice_{q_idx}_{c_idx}" in st.session_state:
+        del st.session_state[f"choice_{q_idx}_{c_idx}"]
+        c_idx += 1
+
+def edited_sets(document, set_layout):
+    """편집 결과를 세트 목록(JSON 저장 형태)으로 만듭니다."""
+    return [
+        {
+            "set_number": i + 1,
+            "passage": passage.to_dict(),
+            "questions": [document.questions[q_idx].to_dict() for q_idx in set_layout[i]]
+        }
+        for i, passage in enumerate(document.passages)
+    ]
+
 if pdf_file and st.button("🔍 지문-문제 및 이미지 추출하기"):
-    with st.spinner("PDF 분석 및 이미지 추출 중... 잠시만 기다려주세요."):
-        tmp = NamedTemporaryFile(delete=False, suffix=".pdf")
-        tmp.write(pdf_file.read())
-        tmp.flush()
-        
-        # 1단계: 텍스트 파싱
-        raw_text = extract_text_from_pdf(tmp.name)
-        passages, questions = parse_all_passages_and_questions(raw_text)
-
-        # 2단계: 문제 및 선택지 이미지 추출 및 연결
+    pdf_bytes = pdf_file.getvalue()
+    # 같은 PDF와 제목이면 메모리에 있는 결과를 그대로 사용
+    upload_key = f"{hashlib.sha256(pdf_bytes).hexdigest()}:{title}"
+    store = get_result_store()
+    result = store.get(upload_key)
+    if result is not None:
+        load_result(result, title)
+    else:
+        # 추출은 백그라운드 작업으로 실행하고, 이 세션은 작업 상태만 조회
         output_dir = os.path.join("data", "output", title)
-        for q in questions:
-            q.image_path = extract_question_image(tmp.name, q, output_dir)
-            q.choices_image_path = extract_choices_image(tmp.name, q, output_dir)
-        
-        # 3단계: 지문 이미지 추출 및 연결
-        for p in passages:
-            p.image_path = extract_passage_image(tmp.name, p, output_dir)
-
-        sets = []
-        for i, p in enumerate(passages):
-            set_data = {
-                "set_number": i + 1,
-                "passage": p.to_dict(),
-                "questions": [q.to_dict() for q in questions if q.passage_id == p.passage_id]
-            }
-            sets.append(set_data)
-        
-        st.session_state.extracted_data = sets
-        st.session_state.title = title
-        
-        st.success(f"✅ {len(passages)}개의 지문과 {len(questions)}개의 문제를 추출했습니다!")
-
-if "extracted_data" in st.session_state:
-    with st.sidebar:
-        st.header("📊 통계")
-        total_passages = len(st.session_state.extracted_data)
-        total_questions = sum(len(s['questions']) for s in st.session_state.extracted_data)
-        st.metric("지문 수", total_passages)
-        st.metric("전체 문제 수", total_questions)
+        job_id = get_job_runner().submit(
+            build_result_job, pdf_bytes, output_dir, upload_key, get_extraction_cache(), store, name=pdf_file.name
+        )
+        st.session_state.job = {"id": job_id, "title": title}
+
+if "job" in st.session_state:
+    runner = get_job_runner()
+    job_info = st.session_state.job
+    status = runner.status(job_info["id"])
+    if status["status"] not in FINISHED_STATES:
+        st.info(f"⏳ PDF 분석 및 이미지 추출 중... ({status['status']}, {status['seconds']:.1f}초)")
+        for stage, values in status["progress"].items():
+            label = STAGE_LABELS.get(stage, stage)
+            if values["total"]:
+                st.progress(min(values["done"] / values["total"], 1.0), text=f"{label}: {values['done']}/{values['total']}")
+            else:
+                st.write(f"{label}: {values['done']}")
+        if st.button("⏹️ 추출 취소"):
+            runner.cancel(job_info["id"])
+        time.sleep(POLL_SECONDS)
+        st.rerun()
+    else:
+        result = runner.result(job_info["id"])
+        runner.discard(job_info["id"])
+        del st.session_state.job
+        if status["status"] == JOB_DONE:
+            load_result(result, job_info["title"])
+        elif status["status"] == JOB_FAILED:
+            st.error(f"추출 실패: {status['error']}")
+        else:
+            st.warning("추출이 취소되었습니다.")
 
+if "document" in st.session_state:
+    document = st.session_state.document
+    set_layout = st.session_state.set_layout
     st.header("📝 추출된 내용 편집")
-    
-    data = st.session_state.extracted_data
-    
-    for i, set_data in enumerate(data):
-        passage_info = set_data['passage']
-        expander_title = f"📖 지문 {passage_info.get('question_range') or set_data['set_number']}"
-        with st.expander(expander_title, expanded=True):
+
+    images = st.session_state.get("images", {})
+
+    # 직전 실행에서 다시 파싱한 문제는 위젯에 정리된 본문/선택지를 보여 주어, 편집 전 텍스트로 다시 파싱하지 않도록 함
+    reparsed = st.session_state.pop("reparsed_question", None)
+    if reparsed is not None:
+        sync_question_widgets(reparsed, document.questions[reparsed])
+
+    # 선택한 지문 세트 하나만 그려서, 입력할 때마다 문제집 전체를 다시 그리지 않도록 함
+    set_titles = [f"📖 지문 {p.question_range or i + 1}" for i, p in enumerate(document.passages)]
+    selected_sets = []
+    if document.passages:
+        selected = st.selectbox("지문 세트", range(len(document.passages)), format_func=lambda idx: set_titles[idx], key="selected_set")
+        selected_sets = [selected]
+
+    for i in selected_sets:
+        passage = document.passages[i]
+        with st.expander(set_titles[i], expanded=True):
             col1, col2 = st.columns(2)
             with col1:
                 st.subheader("📄 추출된 텍스트")
-                set_data['passage']['content'] = st.text_area(
+                # 위젯 상태를 그리기 전에 채워 두고 value=는 넘기지 않음 (다시 파싱한 값을 상태로 써 넣기 때문)
+                st.session_state.setdefault(f"passage_{i}", passage.content)
+                content = st.text_area(
                     "지문 내용",
-                    value=passage_info['content'],
                     height=300,
                     key=f"passage_{i}"
                 )
+                if content != passage.content:
+                    document.edit_passage(i, content)
             with col2:
                 st.subheader("🖼️ 지문 이미지")
-                if passage_info.get('image_path') and os.path.exists(passage_info['image_path']):
-                    st.image(passage_info['image_path'], use_container_width=True)
+                if passage.image_path in images:
+                    st.image(images[passage.image_path], use_container_width=True)
                 else:
                     st.warning("지문 이미지를 찾을 수 없습니다.")
             
             st.markdown("<hr>", unsafe_allow_html=True)
             st.subheader("❓ 문제")
             
-            for q_idx, q in enumerate(set_data['questions']):
-                st.markdown(f"**문제 {q['question_number']}**")
+            for q_idx in set_layout[i]:
+                q = document.questions[q_idx]
+                st.markdown(f"**문제 {q.question_number}** ({q.metadata.type})")
                 
                 # 문제 본문 (텍스트 + 이미지)
                 st.subheader("문제 본문")
                 q_stem_col1, q_stem_col2 = st.columns(2)
                 with q_stem_col1:
-                    q['stem'] = st.text_area(
-                        f"문제 {q['question_number']} 내용",
-                        value=q['stem'],
+                    st.session_state.setdefault(f"q_stem_{q_idx}", q.stem)
+                    stem = st.text_area(
+                        f"문제 {q.question_number} 내용",
                         height=250,
-                        key=f"q_stem_{i}_{q_idx}"
+                        key=f"q_stem_{q_idx}"
                     )
                 with q_stem_col2:
-                    if q.get('image_path') and os.path.exists(q['image_path']):
-                        st.image(q['image_path'], use_container_width=True)
+                    if q.image_path in images:
+                        st.image(images[q.image_path], use_container_width=True)
                     else:
                         st.warning("문제 이미지를 찾을 수 없습니다.")
                 
                 # 선택지 (텍스트 + 이미지)
-                if q['choices']:
+                choices = list(q.choices or [])
+                if choices:
                     st.subheader("선택지")
                     q_choices_col1, q_choices_col2 = st.columns(2)
                     with q_choices_col1:
-                        for c_idx, choice in enumerate(q['choices']):
-                            q['choices'][c_idx] = st.text_input(
+                        for c_idx, choice in enumerate(choices):
+                            st.session_state.setdefault(f"choice_{q_idx}_{c_idx}", choice)
+                            choices[c_idx] = st.text_input(
                                 f"선택지 {c_idx + 1}",
-                                value=choice,
-                                key=f"choice_{i}_{q_idx}_{c_idx}"
+                                key=f"choice_{q_idx}_{c_idx}"
                             )
                     with q_choices_col2:
-                        if q.get('choices_image_path') and os.path.exists(q['choices_image_path']):
-                            st.image(q['choices_image_path'], use_container_width=True)
+                        if q.choices_image_path in images:
+                            st.image(images[q.choices_image_path], use_container_width=True)
                         else:
                             st.warning("선택지 이미지를 찾을 수 없습니다.")
+
+                # 고친 문제만 다시 파싱하여 선택지/유형과 통계를 갱신하고, 정리된 결과를 위젯에 반영하도록 다시 실행
+                if stem != q.stem or choices != list(q.choices or []):
+                    document.edit_question(q_idx, stem=stem, choices=choices)
+                    st.session_state.reparsed_question = q_idx
+                    st.rerun()
                 st.markdown("<br>", unsafe_allow_html=True)
 
+    # 편집으로 바뀐 유형까지 반영되도록 편집기를 그린 뒤 통계를 표시
+    with st.sidebar:
+        st.header("📊 통계")
+        summary = document.summary.to_dict()
+        st.metric("지문 수", summary["total_passages"])
+        st.metric("전체 문제 수", summary["total_questions"])
+        if summary["question_types"]:
+            st.table([{"유형": q_type, "문제 수": count} for q_type, count in summary["question_types"].items()])
+
+        if "timing" in st.session_state:
+            timing = st.session_state.timing
+            st.header("⏱️ 단계별 소요 시간")
+            st.caption(f"전체 {timing['total_seconds']:.2f}초")
+            st.table([
+                {
+                    "단계": stage["name"],
+                    "시간(초)": round(stage["seconds"], 3),
+                    "카운터": ", ".join(f"{k} {v}" for k, v in stage["counters"].items())
+                }
+                for stage in timing["stages"]
+            ])
+
     if st.button("💾 변경사항 저장 (JSON)"):
         output_path = os.path.join("data", "output", st.session_state.title, f"edited_{st.session_state.title}.json")
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        st.success(f"저장 완료: {output_path}")
\ No newline at end of file
+            json.dump(edited_sets(document, set_layout), f, ensure_ascii=False, indent=2)
+        # 문제 은행에도 추가하여 검색할 수 있게 함 (같은 제목은 새 판으로 교체)
+        get_question_bank().ingest(st.session_state.title, document.passages, document.questions)
+        st.success(f"저장 완료: {output_path} (문제 은행에 추가됨)")
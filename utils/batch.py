@@ -0,0 +1,162 @@
+"""
+여러 PDF 일괄 변환
+디렉터리 또는 glob 패턴으로 지정한 PDF들을 작업 프로세스 풀에 나누어 JSON으로 변환하고,
+파일별 소요 시간과 지문/문제 수를 담은 manifest.json을 함께 저장합니다
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from export.json_exporter import build_result_dict, save_json
+from parser.structured_parser import PARSE_TEXT
+from utils.extraction_cache import ExtractionCache
+from utils.pipeline import run_extraction
+from utils.profiling import RunProfile
+
+MANIFEST_FILE = "manifest.json"
+
+def expand_inputs(pattern: str) -> List[str]:
+    """디렉터리면 그 안의 PDF 전체를, 아니면 glob 패턴에 맞는 PDF를 정렬하여 반환합니다."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.pdf")
+    return sorted(path for path in glob.glob(pattern) if path.lower().endswith(".pdf"))
+
+def common_input_dir(inputs: List[str]) -> str:
+    """입력 PDF들이 공통으로 들어 있는 가장 깊은 디렉터리."""
+    if not inputs:
+        return ""
+    return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in inputs])
+
+def output_path_for(pdf_path: str, outdir: str, base_dir: Optional[str] = None) -> str:
+    """
+    입력 PDF에 대응하는 출력 JSON 경로.
+    base_dir 기준 상대 경로를 outdir 아래에 그대로 두어, 다른 폴더의 같은 이름 PDF(a/x.pdf, b/x.pdf)가
+    서로의 출력을 덮어쓰지 않게 합니다. 입력이 한 폴더에 있으면 outdir/<파일 이름>.json 입니다.
+    """
+    base_dir = base_dir or os.path.dirname(os.path.abspath(pdf_path))
+    relative = os.path.relpath(os.path.abspath(pdf_path), base_dir)
+    return os.path.join(outdir, os.path.splitext(relative)[0] + ".json")
+
+def is_up_to_date(pdf_path: str, out_path: str) -> bool:
+    """출력 JSON이 있고 입력 PDF보다 나중에 만들어졌으면 True."""
+    return os.path.exists(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(pdf_path)
+
+def convert_pdf(pdf_path: str, out_path: str, cache_dir: Optional[str] = None, parse_mode: str = PARSE_TEXT) -> Dict:
+    """
+    PDF 한 개를 JSON으로 변환합니다. 작업 프로세스에서 실행됩니다. 제목은 파일 이름입니다.
+
+    Returns:
+        manifest에 기록할 파일별 결과
+    """
+    title = os.path.splitext(os.path.basename(pdf_path))[0]
+    start = time.perf_counter()
+    profile = RunProfile(title)
+    try:
+        cache = ExtractionCache(cache_dir) if cache_dir else None
+        _, passages, questions = run_extraction(pdf_path, cache=cache, profile=profile, parse_mode=parse_mode)
+        with profile.span("write_json"):
+            save_json(build_result_dict(title, passages, questions), out_path)
+    except Exception as e:
+        return {
+            "input": pdf_path,
+            "output": out_path,
+            "parse_mode": parse_mode,
+            "status": "failed",
+            "error": f"{type(e).__name__}: {e}",
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+    return {
+        "input": pdf_path,
+        "output": out_path,
+        "parse_mode": parse_mode,
+        "status": "converted",
+        "seconds": round(time.perf_counter() - start, 3),
+        "passages": len(passages),
+        "questions": len(questions),
+        "stages": {stage.name: round(stage.seconds, 6) for stage in profile.stages.values()}
+    }
+
+def _skipped_entry(pdf_path: str, out_path: str, previous: Dict[str, Dict], parse_mode: str) -> Dict:
+    """최신 상태라 건너뛴 파일의 manifest 항목. 이전 manifest나 기존 출력의 요약에서 개수를 가져옵니다."""
+    entry = {"input": pdf_path, "output": out_path, "parse_mode": parse_mode, "status": "skipped", "seconds": 0.0}
+    if pdf_path in previous and "questions" in previous[pdf_path]:
+        entry["passages"] = previous[pdf_path]["passages"]
+        entry["questions"] = previous[pdf_path]["questions"]
+    else:
+        with open(out_path, "r", encoding="utf-8") as f:
+            summary = json.load(f).get("summary", {})
+        entry["passages"] = summary.get("total_passages")
+        entry["questions"] = summary.get("total_questions")
+    return entry
+
+def _load_previous_manifest(outdir: str) -> Dict[str, Dict]:
+    manifest_path = os.path.join(outdir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return {entry["input"]: entry for entry in json.load(f).get("files", [])}
+
+def run_batch(pattern: str, outdir: str, workers: int = 1, cache_dir: Optional[str] = None, force: bool = False,
+              parse_mode: str = PARSE_TEXT) -> Dict:
+    """
+    패턴에 해당하는 PDF들을 일괄 변환하고 manifest를 저장합니다.
+
+    Args:
+        pattern: 입력 디렉터리 또는 glob 패턴 (e.g., "data/raw/*.pdf")
+        outdir: 출력 JSON과 manifest를 저장할 디렉터리
+        workers: 동시에 변환할 파일 수 (작업 프로세스 수)
+        cache_dir: 추출 결과 캐시 폴더. None이면 캐시를 사용하지 않음
+        force: True면 최신 상태인 출력도 다시 변환
+        parse_mode: 파싱 방식 (PARSE_TEXT / PARSE_LAYOUT). 이전 manifest와 방식이 다르면 최신 상태라도 다시 변환
+
+    Returns:
+        manifest 딕셔너리
+    """
+    os.makedirs(outdir, exist_ok=True)
+    inputs = expand_inputs(pattern)
+    previous = _load_previous_manifest(outdir)
+    base_dir = common_input_dir(inputs)
+    batch_start = time.perf_counter()
+
+    entries: Dict[str, Dict] = {}
+    pending = []
+    for pdf_path in inputs:
+        out_path = output_path_for(pdf_path, outdir, base_dir)
+        same_mode = previous.get(pdf_path, {}).get("parse_mode", PARSE_TEXT) == parse_mode
+        if not force and same_mode and is_up_to_date(pdf_path, out_path):
+            entries[pdf_path] = _skipped_entry(pdf_path, out_path, previous, parse_mode)
+        else:
+            pending.append((pdf_path, out_path))
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            futures = {pdf_path: executor.submit(convert_pdf, pdf_path, out_path, cache_dir, parse_mode) for pdf_path, out_path in pending}
+            for pdf_path, future in futures.items():
+                entries[pdf_path] = future.result()
+                print(f"[INFO] {entries[pdf_path]['status']}: {pdf_path} ({entries[pdf_path]['seconds']}초)")
+    else:
+        for pdf_path, out_path in pending:
+            entries[pdf_path] = convert_pdf(pdf_path, out_path, cache_dir, parse_mode)
+            print(f"[INFO] {entries[pdf_path]['status']}: {pdf_path} ({entries[pdf_path]['seconds']}초)")
+
+    files = [entries[pdf_path] for pdf_path in inputs]
+    manifest = {
+        "pattern": pattern,
+        "parse_mode": parse_mode,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "total_seconds": round(time.perf_counter() - batch_start, 3),
+        "totals": {
+            "files": len(files),
+            "converted": sum(1 for entry in files if entry["status"] == "converted"),
+            "skipped": sum(1 for entry in files if entry["status"] == "skipped"),
+            "failed": sum(1 for entry in files if entry["status"] == "failed"),
+            "passages": sum(entry.get("passages") or 0 for entry in files),
+            "questions": sum(entry.get("questions") or 0 for entry in files)
+        },
+        "files": files
+    }
+    save_json(manifest, os.path.join(outdir, MANIFEST_FILE))
+    return manifest
@@ -0,0 +1,216 @@
+"""
+PDF 추출/파싱 결과 디스크 캐시
+PDF 바이트의 SHA-256과 파서 버전을 키로 원본 텍스트, 지문/문제 목록, 이미지를 저장하고
+전체 크기가 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다 (LRU)
+"""
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import List, Optional, Tuple
+from parser.structured_parser import PARSER_VERSION, PARSE_TEXT
+from model.passage import Passage
+from model.question import Question
+
+DEFAULT_CACHE_DIR = os.path.join("data", "cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512MB
+
+RAW_TEXT_FILE = "raw_text.txt"
+RESULT_FILE = "result.json"
+IMAGES_DIR = "images"
+
+class ExtractionCache:
+    """추출 결과 디스크 캐시"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(pdf_bytes: bytes, parse_mode: str = PARSE_TEXT) -> str:
+        """PDF 바이트, 파서 버전, 파싱 방식으로 캐시 키를 만듭니다. (기본 방식은 기존 키 형식 유지)"""
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        if parse_mode != PARSE_TEXT:
+            return f"{digest}-v{PARSER_VERSION}-{parse_mode}"
+        return f"{digest}-v{PARSER_VERSION}"
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str, output_dir: Optional[str] = None) -> Optional[Tuple[str, List[Passage], List[Question]]]:
+        """
+        캐시된 결과를 불러옵니다.
+
+        Args:
+            key: make_key로 만든 캐시 키
+            output_dir: 이미지가 필요하면 이미지를 복사할 기본 출력 디렉토리 (output_dir/images)
+
+        Returns:
+            (원본 텍스트, 지문 목록, 문제 목록). 캐시에 없거나 필요한 이미지가 없으면 None
+            (읽는 중에 다른 프로세스가 항목을 교체/삭제한 경우도 None)
+        """
+        try:
+            return self._load(key, output_dir)
+        except FileNotFoundError:
+            return None
+
+    def _load(self, key: str, output_dir: Optional[str]) -> Optional[Tuple[str, List[Passage], List[Question]]]:
+        entry_dir = self._entry_dir(key)
+        result_path = os.path.join(entry_dir, RESULT_FILE)
+        if not os.path.exists(result_path):
+            return None
+
+        with open(result_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        if output_dir is not None and not result["has_images"]:
+            return None
+        with open(os.path.join(entry_dir, RAW_TEXT_FILE), "r", encoding="utf-8") as f:
+            raw_text = f.read()
+
+        passages = [Passage.from_dict(p) for p in result["passages"]]
+        questions = [Question.from_dict(q) for q in result["questions"]]
+
+        if output_dir is None:
+            for item in passages + questions:
+                item.image_path = None
+            for q in questions:
+                q.choices_image_path = None
+        else:
+            image_output_dir = os.path.join(output_dir, IMAGES_DIR)
+            os.makedirs(image_output_dir, exist_ok=True)
+
+            def restore(filename: Optional[str]) -> Optional[str]:
+                if not filename:
+                    return None
+                target = os.path.join(image_output_dir, filename)
+                shutil.copyfile(os.path.join(entry_dir, IMAGES_DIR, filename), target)
+                return target
+
+            for item in passages + questions:
+                item.image_path = restore(item.image_path)
+            for q in questions:
+                q.choices_image_path = restore(q.choices_image_path)
+
+        # 최근 사용 시각 갱신 (LRU)
+        os.utime(entry_dir)
+        return raw_text, passages, questions
+
+    def store(self, key: str, raw_text: str, passages: List[Passage], questions: List[Question], with_images: bool = False):
+        """
+        결과를 캐시에 저장합니다. 이미지가 있으면 이미지 파일도 함께 복사합니다.
+
+        Args:
+            key: make_key로 만든 캐시 키
+            raw_text: 추출된 원본 텍스트
+            passages: 지문 목록
+            questions: 문제 목록
+            with_images: 객체의 이미지 경로가 채워져 있어 이미지를 함께 저장할지 여부
+        """
+        tmp_dir = tempfile.mkdtemp(prefix=f".{key}-", dir=self.cache_dir)
+        try:
+            os.makedirs(os.path.join(tmp_dir, IMAGES_DIR))
+
+            def keep(path: Optional[str]) -> Optional[str]:
+                if not with_images or not path:
+                    return None
+                filename = os.path.basename(path)
+                shutil.copyfile(path, os.path.join(tmp_dir, IMAGES_DIR, filename))
+                return filename
+
+            passage_dicts = []
+            for p in passages:
+                data = p.to_dict()
+                data["image_path"] = keep(p.image_path)
+                passage_dicts.append(data)
+            question_dicts = []
+            for q in questions:
+                data = q.to_dict()
+                data["image_path"] = keep(q.image_path)
+                data["choices_image_path"] = keep(q.choices_image_path)
+                question_dicts.append(data)
+
+            with open(os.path.join(tmp_dir, RAW_TEXT_FILE), "w", encoding="utf-8") as f:
+                f.write(raw_text)
+            with open(os.path.join(tmp_dir, RESULT_FILE), "w", encoding="utf-8") as f:
+                json.dump({
+                    "parser_version": PARSER_VERSION,
+                    "created_at": time.time(),
+                    "has_images": with_images,
+                    "passages": passage_dicts,
+                    "questions": question_dicts
+                }, f, ensure_ascii=False)
+
+            # 완성된 항목을 이름 바꾸기로 한 번에 게시하여 읽는 쪽이 반쯤 쓰인 항목을 보지 않도록 함
+            entry_dir = self._entry_dir(key)
+            if not self._publish(tmp_dir, entry_dir) and with_images and not self._has_images(entry_dir):
+                # 이미지 없는 항목만 이미지 있는 항목으로 바꿈: 기존 항목을 옆으로 치운 뒤 다시 게시
+                stale_dir = tmp_dir + "-stale"
+                try:
+                    os.rename(entry_dir, stale_dir)
+                except FileNotFoundError:
+                    pass
+                self._publish(tmp_dir, entry_dir)
+                shutil.rmtree(stale_dir, ignore_errors=True)
+        finally:
+            # 게시하지 못한 임시 항목은 버림 (같은 키는 같은 PDF의 결과이므로 먼저 게시된 항목을 그대로 씀)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.evict()
+
+    @staticmethod
+    def _publish(tmp_dir: str, entry_dir: str) -> bool:
+        """
+        임시 항목을 캐시 항목 이름으로 바꿉니다. 같은 키를 다른 프로세스가 먼저 저장했으면
+        (대상 디렉토리가 비어 있지 않으면) 기존 항목을 지우지 않고 False를 반환합니다.
+        """
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError as e:
+            if e.errno in (errno.ENOTEMPTY, errno.EEXIST):
+                return False
+            raise
+        return True
+
+    @staticmethod
+    def _has_images(entry_dir: str) -> bool:
+        try:
+            with open(os.path.join(entry_dir, RESULT_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)["has_images"]
+        except FileNotFoundError:
+            return False
+
+    def evict(self):
+        """전체 캐시 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목을 삭제합니다."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(entry_dir):
+                continue
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(root, filename))
+                    for root, _, filenames in os.walk(entry_dir)
+                    for filename in filenames
+                )
+                entries.append((os.path.getmtime(entry_dir), size, entry_dir))
+            except FileNotFoundError:
+                # 다른 프로세스가 방금 교체/삭제한 항목
+                continue
+            total += size
+
+        for _, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """캐시의 모든 항목을 삭제합니다."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
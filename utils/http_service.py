@@ -0,0 +1,281 @@
+"""
+로컬 HTTP 추출 서비스
+PDF를 POST로 받아 main.py와 같은 형태의 JSON을 돌려주고, 지문/문제/선택지 이미지는 URL로 제공합니다.
+PyMuPDF를 미리 불러 둔 작업 프로세스 풀을 유지하며, 처리 중인 요청이 상한을 넘으면 429로 응답합니다.
+같은 PDF를 동시에 여러 번 올리면 한 번만 변환하여 결과를 나누어 씁니다.
+
+실행 (저장소 루트에서):
+    python -m utils.http_service --port 8000 --workers 2
+
+요청 예:
+    curl --data-binary @data/raw/풀비린내.pdf -H "Content-Type: application/pdf" "http://127.0.0.1:8000/extract?title=풀비린내"
+    curl http://127.0.0.1:8000/health
+"""
+
+import argparse
+import copy
+import errno
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+import fitz  # PyMuPDF
+
+from export.json_exporter import build_result_dict
+from utils.extraction_cache import ExtractionCache, DEFAULT_CACHE_DIR
+from utils.pipeline import run_extraction
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_WORKERS = 2
+DEFAULT_OUTPUT_ROOT = os.path.join("data", "service")
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024  # 50MB
+RETRY_AFTER_SECONDS = 1
+
+_RESULT_ID_PATTERN = re.compile(r"^[0-9a-f]{16}$")
+_IMAGE_NAME_PATTERN = re.compile(r"^[\w.-]+\.png$")
+
+def _warm_up_worker():
+    """작업 프로세스 시작 시 MuPDF를 한 번 초기화해 두어 첫 요청이 느려지지 않게 합니다."""
+    with fitz.open() as doc:
+        doc.new_page()
+
+def _ping() -> int:
+    return os.getpid()
+
+def convert_upload(pdf_bytes: bytes, title: str, output_dir: str, cache_dir: Optional[str]) -> Dict:
+    """
+    업로드한 PDF 한 개를 변환합니다. 작업 프로세스에서 실행됩니다.
+    이미지는 임시 폴더에 모두 만든 뒤 output_dir로 이름을 바꾸어 게시하므로, 내려받는 쪽이 반쯤 쓰인 이미지를 보지 않습니다.
+    output_dir이 이미 있으면 같은 PDF의 결과(같은 이미지)이므로 그대로 두고 임시 폴더를 버립니다.
+
+    Returns:
+        build_result_dict 형태의 결과 (이미지 경로는 파일 이름만 의미가 있음)
+    """
+    parent_dir = os.path.dirname(output_dir) or "."
+    tmp_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(output_dir)}-", dir=parent_dir)
+    try:
+        cache = ExtractionCache(cache_dir) if cache_dir else None
+        _, passages, questions = run_extraction(pdf_bytes, tmp_dir, cache=cache)
+        try:
+            os.replace(tmp_dir, output_dir)
+        except OSError as e:
+            if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return build_result_dict(title, passages, questions)
+
+class ExtractionService:
+    """
+    작업 프로세스 풀과 동시 요청 상한을 관리합니다.
+
+    Args:
+        workers: 작업 프로세스 수
+        max_pending: 동시에 받아 둘 수 있는 요청 수 (실행 중 + 대기). 넘으면 요청을 거절
+        output_root: 결과 이미지를 저장할 폴더 (결과 ID별 하위 폴더)
+        cache_dir: 추출 결과 캐시 폴더. None이면 캐시를 사용하지 않음
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: Optional[int] = None,
+                 output_root: str = DEFAULT_OUTPUT_ROOT, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.workers = workers
+        self.max_pending = max_pending or workers * 2
+        self.output_root = output_root
+        self.cache_dir = cache_dir
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._stats_lock = threading.Lock()
+        # 결과 ID -> 변환 중인 작업 (같은 PDF의 동시 요청이 한 작업을 기다림)
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self.stats = {"in_flight": 0, "completed": 0, "failed": 0, "rejected": 0}
+        os.makedirs(self.output_root, exist_ok=True)
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up_worker)
+        self.warm_pids = self.warm()
+
+    def warm(self):
+        """작업 프로세스를 모두 미리 띄웁니다."""
+        futures = [self._executor.submit(_ping) for _ in range(self.workers)]
+        wait(futures)
+        return sorted({future.result() for future in futures})
+
+    def _bump(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def try_acquire(self) -> bool:
+        """요청을 받을 여유가 있으면 자리를 잡고 True, 없으면 False."""
+        if not self._slots.acquire(blocking=False):
+            self._bump("rejected")
+            return False
+        self._bump("in_flight")
+        return True
+
+    def release(self):
+        self._bump("in_flight", -1)
+        self._slots.release()
+
+    def image_dir(self, result_id: str) -> str:
+        return os.path.join(self.output_root, result_id)
+
+    def _submit(self, result_id: str, pdf_bytes: bytes, title: str) -> Future:
+        """결과 ID의 변환 작업을 반환합니다. 같은 결과 ID를 변환 중이면 새로 제출하지 않고 그 작업을 씁니다."""
+        with self._in_flight_lock:
+            future = self._in_flight.get(result_id)
+            if future is not None:
+                return future
+            future = self._executor.submit(convert_upload, pdf_bytes, title, self.image_dir(result_id), self.cache_dir)
+            self._in_flight[result_id] = future
+        # 이미 끝난 작업이면 콜백이 바로 이 스레드에서 불리므로 잠금 밖에서 등록
+        future.add_done_callback(lambda done: self._forget(result_id, done))
+        return future
+
+    def _forget(self, result_id: str, future: Future):
+        with self._in_flight_lock:
+            if self._in_flight.get(result_id) is future:
+                del self._in_flight[result_id]
+
+    def extract(self, pdf_bytes: bytes, title: str) -> Dict:
+        """PDF를 변환하고 이미지 경로를 /images/<결과 ID>/<파일 이름> URL로 바꾼 결과를 반환합니다."""
+        # 이미지 폴더는 추출 캐시 키로 나누어, 파서 버전이 바뀌면 이전 버전의 이미지를 쓰지 않도록 함
+        result_id = hashlib.sha256(ExtractionCache.make_key(pdf_bytes).encode("utf-8")).hexdigest()[:16]
+        try:
+            # 작업 결과는 같은 PDF의 요청들이 함께 쓰므로 복사본의 제목과 경로를 바꿈
+            data = copy.deepcopy(self._submit(result_id, pdf_bytes, title).result())
+        except Exception:
+            self._bump("failed")
+            raise
+        self._bump("completed")
+        data["set_title"] = title
+
+        for item in data["passages"] + data["questions"]:
+            for key in ("image_path", "choices_image_path"):
+                if item.get(key):
+                    item[key] = f"/images/{result_id}/{quote(os.path.basename(item[key]))}"
+        data["result_id"] = result_id
+        return data
+
+    def health(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {"status": "ok", "workers": self.workers, "max_pending": self.max_pending, **stats}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+class ExtractionRequestHandler(BaseHTTPRequestHandler):
+    """POST /extract, GET /images/<결과 ID>/<파일 이름>, GET /health"""
+
+    server_version = "ExtractionService/1.0"
+
+    @property
+    def service(self) -> ExtractionService:
+        return self.server.service
+
+    def _send_json(self, status: HTTPStatus, data: Dict, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/extract":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "PDF 본문이 비어 있습니다"})
+            return
+        if length > MAX_UPLOAD_BYTES:
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": f"최대 {MAX_UPLOAD_BYTES}바이트까지 받을 수 있습니다"})
+            return
+        # 본문을 읽기 전에 상한을 확인하여, 거절할 요청의 업로드를 메모리에 받지 않음
+        if not self.service.try_acquire():
+            self.close_connection = True  # 읽지 않은 본문이 다음 요청으로 읽히지 않도록 연결을 닫음
+            self._send_json(HTTPStatus.TOO_MANY_REQUESTS, {"error": "처리 중인 요청이 너무 많습니다"},
+                            {"Retry-After": str(RETRY_AFTER_SECONDS)})
+            return
+        try:
+            pdf_bytes = self.rfile.read(length)
+            title = parse_qs(url.query).get("title", ["수능 국어 문제지"])[0]
+            start = time.perf_counter()
+            try:
+                data = self.service.extract(pdf_bytes, title)
+            except Exception as e:
+                self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": f"{type(e).__name__}: {e}"})
+                return
+            self._send_json(HTTPStatus.OK, data, {"X-Elapsed-Seconds": f"{time.perf_counter() - start:.3f}"})
+        finally:
+            self.service.release()
+
+    def do_GET(self):
+        path = unquote(urlsplit(self.path).path)
+        if path == "/health":
+            self._send_json(HTTPStatus.OK, self.service.health())
+            return
+        parts = path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "images" and _RESULT_ID_PATTERN.match(parts[1]) and _IMAGE_NAME_PATTERN.match(parts[2]):
+            image_path = os.path.join(self.service.image_dir(parts[1]), "images", parts[2])
+            if os.path.isfile(image_path):
+                with open(image_path, "rb") as f:
+                    body = f.read()
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "max-age=3600")
+                self.end_headers()
+                self.wfile.write(body)
+                return
+        self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+    def log_message(self, format, *args):
+        print(f"[INFO] {self.address_string()} {format % args}")
+
+def create_server(host: str, port: int, service: ExtractionService,
+                  handler_class: type = ExtractionRequestHandler) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), handler_class)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 국어 문제지 추출 HTTP 서비스")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="작업 프로세스 수")
+    parser.add_argument("--max-pending", type=int, help="동시에 받을 요청 수 (기본: 작업 프로세스 수 x 2). 넘으면 429")
+    parser.add_argument("--output-root", default=DEFAULT_OUTPUT_ROOT, help="결과 이미지 저장 폴더")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="추출 결과 캐시 폴더")
+    parser.add_argument("--no-cache", action="store_true", help="캐시를 사용하지 않고 항상 새로 추출")
+    args = parser.parse_args()
+
+    service = ExtractionService(args.workers, args.max_pending, args.output_root,
+                                None if args.no_cache else args.cache_dir)
+    server = create_server(args.host, args.port, service)
+    print(f"[INFO] 추출 서비스 시작: http://{args.host}:{server.server_address[1]} "
+          f"(작업 프로세스 {service.workers}개, 동시 요청 {service.max_pending}개)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+if __name__ == "__main__":
+    main()
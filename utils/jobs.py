@@ -0,0 +1,200 @@
+"""
+백그라운드 추출 작업 실행기
+별도 스레드에서 도는 asyncio 이벤트 루프가 작업을 받아 동시 실행 수를 제한하고, 실제 추출은 스레드 풀에서 실행합니다.
+작업마다 ID, 상태, 단계별 진행 상황(추출한 페이지 수, 저장한 이미지 수 등)을 기록하며
+UI는 결과를 기다리지 않고 작업 상태를 주기적으로 조회합니다
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from parser.pdf_source import PdfSource
+from utils.extraction_cache import ExtractionCache
+from utils.pipeline import run_extraction
+from utils.profiling import RunProfile
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+DEFAULT_MAX_CONCURRENT = 2
+
+class JobCancelled(Exception):
+    """취소 요청된 작업이 진행 보고 시점에 중단될 때 발생합니다."""
+
+class Job:
+    """
+    실행기에 제출된 작업 한 개
+
+    작업 함수는 첫 번째 인자로 Job을 받아 job.report(단계, 처리한 수, 전체 수)로 진행 상황을 알립니다.
+    취소가 요청된 작업은 다음 report 호출에서 JobCancelled로 중단됩니다.
+    """
+
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = JOB_QUEUED
+        self.stage: Optional[str] = None
+        self.progress: Dict[str, Dict[str, Optional[int]]] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def report(self, stage: str, done: int, total: Optional[int] = None):
+        """단계별 진행 상황을 기록합니다. 취소가 요청되었으면 JobCancelled를 발생시킵니다."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+        with self._lock:
+            self.stage = stage
+            self.progress[stage] = {"done": done, "total": total}
+
+    def _set_status(self, status: str, result: Any = None, error: Optional[str] = None):
+        with self._lock:
+            self.status = status
+            if status == JOB_RUNNING:
+                self.started_at = time.time()
+            elif status in FINISHED_STATES:
+                self.finished_at = time.time()
+                self.result = result
+                self.error = error
+
+    def snapshot(self) -> Dict:
+        """현재 상태를 딕셔너리로 반환합니다. (결과 객체는 포함하지 않음)"""
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                "id": self.id,
+                "name": self.name,
+                "status": self.status,
+                "stage": self.stage,
+                "progress": {stage: dict(values) for stage, values in self.progress.items()},
+                "error": self.error,
+                "cancel_requested": self._cancel.is_set(),
+                "seconds": round(end - self.started_at, 3) if self.started_at else 0.0
+            }
+
+class JobRunner:
+    """
+    동시 실행 수를 제한하는 백그라운드 작업 실행기
+
+    사용 예:
+        runner = JobRunner(max_concurrent=2)
+        job_id = runner.submit_extraction(pdf_bytes, "data/output/제목", name="제목")
+        runner.status(job_id)["status"]   # queued / running / done / failed / cancelled
+        runner.cancel(job_id)
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT, max_workers: Optional[int] = None):
+        self.max_concurrent = max_concurrent
+        self._jobs: Dict[str, Job] = {}
+        self._jobs_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or max_concurrent, thread_name_prefix="extraction-job")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="job-runner", daemon=True)
+        self._thread.start()
+        self._semaphore = asyncio.run_coroutine_threadsafe(self._make_semaphore(), self._loop).result()
+
+    async def _make_semaphore(self) -> asyncio.Semaphore:
+        # 세마포어는 사용할 이벤트 루프 안에서 만들어야 함
+        return asyncio.Semaphore(self.max_concurrent)
+
+    async def _run(self, job: Job, func: Callable, args: Tuple, kwargs: Dict):
+        async with self._semaphore:
+            if job.cancel_requested:
+                job._set_status(JOB_CANCELLED)
+                return
+            job._set_status(JOB_RUNNING)
+            try:
+                result = await self._loop.run_in_executor(self._executor, lambda: func(job, *args, **kwargs))
+            except JobCancelled:
+                job._set_status(JOB_CANCELLED)
+            except Exception as e:
+                job._set_status(JOB_FAILED, error=f"{type(e).__name__}: {e}")
+            else:
+                job._set_status(JOB_DONE, result=result)
+
+    def submit(self, func: Callable[..., Any], *args, name: Optional[str] = None, **kwargs) -> str:
+        """
+        작업을 대기열에 넣고 작업 ID를 반환합니다.
+
+        Args:
+            func: func(job, *args, **kwargs) 형태로 실행할 함수. 반환값이 작업 결과가 됩니다.
+            name: 상태 조회 시 표시할 작업 이름
+        """
+        job = Job(name or getattr(func, "__name__", "job"))
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+        asyncio.run_coroutine_threadsafe(self._run(job, func, args, kwargs), self._loop)
+        return job.id
+
+    def submit_extraction(self, pdf_path: PdfSource, output_dir: Optional[str] = None,
+                          cache: Optional[ExtractionCache] = None, name: Optional[str] = None) -> str:
+        """run_extraction을 백그라운드 작업으로 실행합니다. 결과는 (원본 텍스트, 지문 목록, 문제 목록, 시간 측정 결과)입니다."""
+        return self.submit(extraction_job, pdf_path, output_dir, cache, name=name or "extraction")
+
+    def _get(self, job_id: str) -> Job:
+        with self._jobs_lock:
+            if job_id not in self._jobs:
+                raise KeyError(f"알 수 없는 작업 ID: {job_id}")
+            return self._jobs[job_id]
+
+    def status(self, job_id: str) -> Dict:
+        return self._get(job_id).snapshot()
+
+    def result(self, job_id: str) -> Any:
+        """완료된 작업의 결과. 아직 끝나지 않았거나 실패/취소된 작업이면 None."""
+        job = self._get(job_id)
+        return job.result if job.status == JOB_DONE else None
+
+    def cancel(self, job_id: str) -> bool:
+        """작업 취소를 요청합니다. 이미 끝난 작업이면 False."""
+        job = self._get(job_id)
+        if job.status in FINISHED_STATES:
+            return False
+        job._cancel.set()
+        return True
+
+    def discard(self, job_id: str):
+        """끝난 작업을 목록에서 지워 결과가 차지하는 메모리를 돌려받습니다."""
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status in FINISHED_STATES:
+                del self._jobs[job_id]
+
+    def list_jobs(self) -> List[Dict]:
+        with self._jobs_lock:
+            jobs = list(self._jobs.values())
+        return [job.snapshot() for job in jobs]
+
+    def active_count(self) -> int:
+        """대기 중이거나 실행 중인 작업 수"""
+        with self._jobs_lock:
+            return sum(1 for job in self._jobs.values() if job.status not in FINISHED_STATES)
+
+    def shutdown(self):
+        """이벤트 루프와 스레드 풀을 종료합니다. 실행 중인 작업은 끝날 때까지 기다립니다."""
+        self._executor.shutdown(wait=True)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+def extraction_job(job: Job, pdf_path: PdfSource, output_dir: Optional[str], cache: Optional[ExtractionCache]):
+    """진행 상황을 job에 보고하면서 run_extraction을 실행합니다."""
+    profile = RunProfile(job.name)
+    with profile:
+        raw_text, passages, questions = run_extraction(pdf_path, output_dir, cache=cache, profile=profile,
+                                                       on_progress=job.report)
+    return raw_text, passages, questions, profile.to_dict()
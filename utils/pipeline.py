@@ -0,0 +1,152 @@
+"""
+PDF 추출 파이프라인
+텍스트 추출 -> 지문/문제 파싱 -> (선택) 이미지 추출 단계를 묶고, 캐시가 주어지면 결과를 재사용합니다
+"""
+
+import time
+from typing import Callable, List, Optional, Tuple, Union
+from parser.text_extractor import extract_text_from_pdf, iter_pages_from_pdf
+from parser.structured_parser import (
+    PARSE_LAYOUT, PARSE_TEXT, DocumentLayout, iter_passages_and_questions, iter_layout_items,
+    extract_all_images, extract_layout_images,
+)
+from parser.pdf_source import PdfSource, open_document, read_pdf_bytes
+from model.passage import Passage
+from model.question import Question
+from utils.extraction_cache import ExtractionCache
+from utils.profiling import RunProfile
+
+def run_extraction(pdf_path: PdfSource, output_dir: Optional[str] = None, cache: Optional[ExtractionCache] = None,
+                   workers: Optional[int] = None,
+                   on_item: Optional[Callable[[Union[Passage, Question]], None]] = None,
+                   profile: Optional[RunProfile] = None,
+                   on_progress: Optional[Callable[[str, int, Optional[int]], None]] = None,
+                   parse_mode: str = PARSE_TEXT) -> Tuple[str, List[Passage], List[Question]]:
+    """
+    PDF에서 원본 텍스트, 지문, 문제를 추출합니다.
+    순차 추출 시에는 페이지 단위로 텍스트를 읽으면서 바로 파싱하므로,
+    on_item 콜백으로 앞쪽 지문/문제를 문서 전체 처리가 끝나기 전에 받아볼 수 있습니다.
+    또한 텍스트를 추출할 때 만든 페이지 분석 결과(본문 블록)를 이미지 추출에 그대로 써서
+    페이지마다 텍스트 레이어를 한 번만 해석합니다.
+    parse_mode가 PARSE_LAYOUT이면 본문 줄의 좌표를 따라 파싱하면서 이미지 영역을 함께 기록하므로,
+    이미지 추출 시 영역을 다시 찾지 않습니다. 이 방식은 페이지 분석 결과가 필요하므로 항상 순차 추출합니다.
+
+    Args:
+        pdf_path: PDF 파일 경로, PDF 바이트 또는 열린 fitz.Document
+        output_dir: 이미지를 저장할 기본 출력 디렉토리. None이면 이미지를 추출하지 않음
+        cache: 결과를 재사용할 디스크 캐시. None이면 캐시를 사용하지 않음
+        workers: 텍스트 추출에 사용할 프로세스 수 (PARSE_LAYOUT에서는 무시)
+        on_item: 지문/문제가 하나씩 파싱될 때마다 호출할 콜백 (캐시 적중 시에는 호출하지 않음)
+        profile: 단계별 소요 시간과 페이지/문제/이미지 수를 기록할 RunProfile
+        on_progress: 진행 상황 콜백 (단계 이름, 처리한 수, 전체 수 또는 None).
+            "extract_text"는 페이지 수, "parse"는 지문/문제 수, "extract_images"는 이미지 수를 보고합니다.
+        parse_mode: PARSE_TEXT(열 순서 텍스트로 파싱) 또는 PARSE_LAYOUT(좌표 기반 파싱)
+
+    Returns:
+        (원본 텍스트, 지문 목록, 문제 목록)
+    """
+    if profile is None:
+        profile = RunProfile("run_extraction")
+
+    key = None
+    if cache is not None:
+        with profile.span("cache_lookup") as stage:
+            key = cache.make_key(read_pdf_bytes(pdf_path), parse_mode)
+            cached = cache.load(key, output_dir)
+            stage.count("hits" if cached is not None else "misses")
+        if cached is not None:
+            profile.count("passages", len(cached[1]))
+            profile.count("questions", len(cached[2]))
+            return cached
+
+    page_total = None
+    if on_progress is not None:
+        with open_document(pdf_path) as doc:
+            page_total = doc.page_count
+
+    layout_mode = parse_mode == PARSE_LAYOUT
+    parallel = bool(workers and workers > 1) and not layout_mode
+    # 순차 추출 시 페이지 분석 결과를 모아 두었다가 이미지 추출에 재사용 (병렬 추출 시에는 None)
+    analyses = None
+    if parallel:
+        with profile.span("extract_text") as stage:
+            pages = [extract_text_from_pdf(pdf_path, workers=workers)]
+            stage.count("workers", workers)
+        if on_progress is not None:
+            on_progress("extract_text", page_total, page_total)
+    else:
+        analyses = []
+        def analyze_pages():
+            for analysis in iter_pages_from_pdf(pdf_path):
+                analyses.append(analysis)
+                yield analysis
+        pages = analyze_pages()
+
+    # 스트리밍 방식에서는 텍스트 추출과 파싱이 페이지마다 번갈아 일어나므로 시간을 나누어 누적
+    text_parts = []
+    extract_seconds = 0.0
+    def collect_pages():
+        nonlocal extract_seconds
+        page_iter = iter(pages)
+        while True:
+            start = time.perf_counter()
+            page = next(page_iter, None)
+            extract_seconds += time.perf_counter() - start
+            if page is None:
+                return
+            text_parts.append(page if parallel else page.text)
+            if on_progress is not None and not parallel:
+                on_progress("extract_text", len(text_parts), page_total)
+            yield page
+
+    # 좌표 기반 파싱 결과 (영역 포함)는 이미지 추출에 그대로 씀
+    layout_items = []
+    def parse_layout_pages():
+        for entry in iter_layout_items(collect_pages()):
+            layout_items.append(entry)
+            yield entry.item
+
+    if layout_mode:
+        parsed_items = parse_layout_pages()
+    else:
+        parsed_items = iter_passages_and_questions(page if parallel else page.text for page in collect_pages())
+
+    passages = []
+    questions = []
+    parse_start = time.perf_counter()
+    for item in parsed_items:
+        if isinstance(item, Passage):
+            passages.append(item)
+        else:
+            questions.append(item)
+        if on_item is not None:
+            on_item(item)
+        if on_progress is not None:
+            on_progress("parse", len(passages) + len(questions), None)
+    raw_text = "".join(text_parts)
+    parse_seconds = time.perf_counter() - parse_start - extract_seconds
+
+    if not parallel:
+        profile.add_time("extract_text", extract_seconds)
+        profile.stage("extract_text").count("pages", len(text_parts))
+    profile.add_time("parse", parse_seconds)
+    profile.stage("parse").count("passages", len(passages))
+    profile.stage("parse").count("questions", len(questions))
+    profile.count("passages", len(passages))
+    profile.count("questions", len(questions))
+
+    if output_dir is not None:
+        with profile.span("extract_images") as stage:
+            on_saved = (lambda saved, total: on_progress("extract_images", saved, total)) if on_progress is not None else None
+            if layout_mode:
+                extract_layout_images(pdf_path, layout_items, output_dir, on_saved=on_saved)
+            else:
+                with DocumentLayout(pdf_path, analyses=analyses) as layout:
+                    extract_all_images(pdf_path, passages, questions, output_dir, layout=layout, on_saved=on_saved)
+            stage.count("images", sum(1 for p in passages if p.image_path)
+                        + sum((1 if q.image_path else 0) + (1 if q.choices_image_path else 0) for q in questions))
+
+    if cache is not None:
+        with profile.span("cache_store"):
+            cache.store(key, raw_text, passages, questions, with_images=output_dir is not None)
+    return raw_text, passages, questions
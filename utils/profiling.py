@@ -0,0 +1,159 @@
+"""
+파이프라인 단계별 시간 측정 및 프로파일링
+컨텍스트 매니저 구간(span)으로 단계별 소요 시간과 페이지/문제 수 같은 카운터를 기록하고,
+필요하면 cProfile / tracemalloc 결과를 포함한 JSON 보고서를 만듭니다
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+class StageTiming:
+    """한 단계의 누적 소요 시간과 카운터"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.calls = 0
+        self.counters: Dict[str, int] = {}
+
+    def count(self, key: str, n: int = 1):
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "seconds": round(self.seconds, 6),
+            "calls": self.calls,
+            "counters": dict(self.counters)
+        }
+
+class RunProfile:
+    """
+    실행 한 번의 단계별 시간 측정 결과
+
+    사용 예:
+        profile = RunProfile("main", use_cprofile=True)
+        with profile:
+            with profile.span("extract_text") as stage:
+                stage.count("pages", 12)
+        profile.save("timing_report.json")
+    """
+
+    def __init__(self, name: str, use_cprofile: bool = False, use_tracemalloc: bool = False, top_functions: int = 25):
+        self.name = name
+        self.use_cprofile = use_cprofile
+        self.use_tracemalloc = use_tracemalloc
+        self.top_functions = top_functions
+        self.stages: Dict[str, StageTiming] = {}
+        self.counters: Dict[str, int] = {}
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._end: Optional[float] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._peak_memory: Optional[int] = None
+        self._started_tracemalloc = False
+
+    def start(self) -> "RunProfile":
+        """측정을 시작합니다. cProfile / tracemalloc을 사용하도록 설정했다면 함께 켭니다."""
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._end = None
+        if self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.use_cprofile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def stop(self):
+        """측정을 끝냅니다."""
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self.use_tracemalloc and tracemalloc.is_tracing():
+            self._peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        self._end = time.perf_counter()
+
+    def __enter__(self) -> "RunProfile":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def stage(self, name: str) -> StageTiming:
+        if name not in self.stages:
+            self.stages[name] = StageTiming(name)
+        return self.stages[name]
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[StageTiming]:
+        """with 블록의 소요 시간을 name 단계에 누적합니다."""
+        stage = self.stage(name)
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.seconds += time.perf_counter() - start
+            stage.calls += 1
+
+    def add_time(self, name: str, seconds: float):
+        """직접 측정한 시간을 name 단계에 누적합니다. (스트리밍처럼 구간이 번갈아 나타나는 경우)"""
+        stage = self.stage(name)
+        stage.seconds += seconds
+        stage.calls += 1
+
+    def count(self, key: str, n: int = 1):
+        """실행 전체 카운터를 증가시킵니다."""
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    @property
+    def total_seconds(self) -> float:
+        end = self._end if self._end is not None else time.perf_counter()
+        return end - self._start
+
+    def _top_functions(self) -> List[Dict]:
+        stats = pstats.Stats(self._profiler, stream=io.StringIO())
+        stats.sort_stats("cumulative")
+        rows = []
+        for func in stats.fcn_list[:self.top_functions]:
+            primitive_calls, total_calls, own_time, cumulative_time, _ = stats.stats[func]
+            filename, line, func_name = func
+            rows.append({
+                "function": f"{os.path.basename(filename)}:{line}({func_name})",
+                "calls": total_calls,
+                "own_seconds": round(own_time, 6),
+                "cumulative_seconds": round(cumulative_time, 6)
+            })
+        return rows
+
+    def to_dict(self) -> Dict:
+        report = {
+            "name": self.name,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "total_seconds": round(self.total_seconds, 6),
+            "stages": [stage.to_dict() for stage in self.stages.values()],
+            "counters": dict(self.counters)
+        }
+        if self._peak_memory is not None:
+            report["peak_memory_bytes"] = self._peak_memory
+        if self._profiler is not None:
+            report["top_functions"] = self._top_functions()
+        return report
+
+    def save(self, path: str):
+        """JSON 보고서를 저장합니다."""
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,449 @@
+"""
+문제 은행 저장소
+여러 문제지의 지문/문제를 추가만 하는 데이터 파일(bank.dat)과 오프셋 색인(bank.idx)에 모아 둡니다.
+색인만 메모리에 읽고, 지문/문제 본문은 mmap으로 필요한 레코드만 읽으므로 은행 전체를 역직렬화하지 않습니다.
+같은 제목의 문제지를 다시 넣으면 새 판이 추가되고 이전 판은 조회에서 제외됩니다.
+추가할 때 판마다 전문 검색 색인 조각(search/<판 번호>.json, utils.search_index 참고)도 함께 만듭니다.
+
+파일 형식:
+    bank.dat  레코드(Passage/Question.to_dict()의 UTF-8 JSON)를 줄바꿈으로 구분하여 이어 붙인 파일
+    bank.idx  한 줄에 하나씩 JSON 색인 항목
+              {"kind": "passage"|"question", "booklet": 판 번호, "offset", "length", "passage_id", "question_number", "type"}
+              {"kind": "booklet", "booklet": 판 번호, "title": 문제지 제목}  (해당 판의 레코드를 모두 쓴 뒤 마지막에 기록)
+
+사용법 (저장소 루트에서):
+    python -m utils.question_bank ingest data/output/*.json
+    python -m utils.question_bank find --type multiple_choice --number 3
+    python -m utils.question_bank search "밑줄 긋기" --kind passage
+    python -m utils.question_bank export --outdir data/bank_export
+"""
+
+import argparse
+import json
+import mmap
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from model.passage import Passage
+from model.question import Metadata, Question
+from utils.search_index import SearchIndex, build_segment, load_segment, save_segment
+
+DEFAULT_BANK_DIR = os.path.join("data", "bank")
+DATA_FILE = "bank.dat"
+INDEX_FILE = "bank.idx"
+SEARCH_DIR = "search"
+
+KIND_BOOKLET = "booklet"
+KIND_PASSAGE = "passage"
+KIND_QUESTION = "question"
+
+def _dumps(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _search_text(kind: str, data: Dict) -> str:
+    """검색 색인에 넣을 텍스트: 지문 내용 또는 문제 본문과 선택지"""
+    if kind == KIND_PASSAGE:
+        return data.get("content") or ""
+    return "\n".join([data.get("stem") or ""] + list(data.get("choices") or []))
+
+def load_sets_json(json_path: str) -> Tuple[str, List[Passage], List[Question]]:
+    """
+    결과 JSON 파일을 (문제지 제목, 지문 목록, 문제 목록)으로 읽습니다.
+    main.py 출력(set_title/passages/questions)과 편집기에서 저장한 세트 목록을 모두 받습니다.
+
+    Raises:
+        ValueError: passages/questions가 모두 없는 JSON 객체 (manifest.json, timing_report.json 등)
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        if "passages" not in data and "questions" not in data:
+            raise ValueError(f"결과 JSON이 아닙니다 (passages/questions 없음): {json_path}")
+        title = data.get("set_title") or os.path.splitext(os.path.basename(json_path))[0]
+        passages = [Passage.from_dict(p) for p in data.get("passages", [])]
+        questions = [Question.from_dict(q) for q in data.get("questions", [])]
+        return title, passages, questions
+
+    title = os.path.splitext(os.path.basename(json_path))[0]
+    passages, questions = [], []
+    for i, item in enumerate(data):
+        raw_passage = item.get("passage") or {}
+        if "content" in raw_passage:
+            passage = Passage.from_dict(raw_passage)
+        else:
+            # 이전 편집기 형식: {"text", "image_paths", ...}
+            passage = Passage(content=raw_passage.get("text", ""),
+                              passage_id=f"passage_{item.get('set_number', i + 1)}",
+                              question_range=item.get("question_range"))
+        passages.append(passage)
+        for raw_question in item.get("questions", []):
+            if "stem" in raw_question:
+                questions.append(Question.from_dict(raw_question))
+            else:
+                # 이전 편집기 형식: {"number", "text", "type", "choices", ...}
+                questions.append(Question(
+                    stem=raw_question.get("text", ""),
+                    metadata=Metadata(type=raw_question.get("type") or "unknown", difficulty="중"),
+                    passage_id=passage.passage_id,
+                    question_number=raw_question.get("number"),
+                    choices=raw_question.get("choices") or None,
+                    image_path=raw_question.get("image_path")
+                ))
+    return title, passages, questions
+
+class QuestionBank:
+    """
+    추가 전용 문제 은행
+    쓰기는 한 프로세스에서만 해야 합니다. 읽기는 여러 프로세스에서 동시에 열어도 됩니다.
+    한 객체를 여러 스레드가 공유해도 됩니다. (Streamlit 세션 간 공유)
+
+    사용 예:
+        with QuestionBank() as bank:
+            bank.ingest("카메라워커", passages, questions)
+            for title, q in bank.find(q_type="multiple_choice"):
+                ...
+    """
+
+    def __init__(self, bank_dir: str = DEFAULT_BANK_DIR):
+        self.bank_dir = bank_dir
+        self.data_path = os.path.join(bank_dir, DATA_FILE)
+        self.index_path = os.path.join(bank_dir, INDEX_FILE)
+        self.search_dir = os.path.join(bank_dir, SEARCH_DIR)
+        os.makedirs(bank_dir, exist_ok=True)
+        for path in (self.data_path, self.index_path):
+            if not os.path.exists(path):
+                open(path, "wb").close()
+
+        self._lock = threading.RLock()
+        self._mmap: Optional[mmap.mmap] = None
+        self._entries: List[Dict] = []
+        self._by_offset: Dict[int, int] = {}  # 레코드 오프셋(검색 문서 ID) -> 항목 위치
+        self._search: Optional[SearchIndex] = None  # 처음 검색할 때 불러옴
+        self._titles: Dict[int, str] = {}  # 판 번호 -> 제목
+        self._latest: Dict[str, int] = {}  # 제목 -> 최신 판 번호
+        self._next_booklet = 0
+        # 조회 필드별 색인: (종류, 필드, 값) -> 항목 위치 목록. (종류,)는 그 종류의 전체 항목
+        self._lookup: Dict[tuple, List[int]] = {}
+        self._load_index()
+        self._remap()
+
+    def _load_index(self):
+        data_size = os.path.getsize(self.data_path)
+        pending: List[Dict] = []
+        valid_end = 0
+        with open(self.index_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # 쓰다가 중단된 마지막 줄
+                valid_end += len(line)
+                self._next_booklet = max(self._next_booklet, entry["booklet"] + 1)
+                if entry["kind"] != KIND_BOOKLET:
+                    if entry["offset"] + entry["length"] <= data_size:
+                        pending.append(entry)
+                    continue
+                # 판 기록이 있는 레코드만 유효 (기록 전에 중단된 판의 레코드는 무시)
+                self._titles[entry["booklet"]] = entry["title"]
+                self._latest[entry["title"]] = entry["booklet"]
+                for item in pending:
+                    if item["booklet"] == entry["booklet"]:
+                        self._add_entry(item)
+                pending = [item for item in pending if item["booklet"] != entry["booklet"]]
+        if valid_end < os.path.getsize(self.index_path):
+            # 중단된 줄 뒤에 새 색인이 이어 붙지 않도록 잘라 냄
+            with open(self.index_path, "r+b") as f:
+                f.truncate(valid_end)
+
+    def _add_entry(self, entry: Dict):
+        position = len(self._entries)
+        self._entries.append(entry)
+        self._by_offset[entry["offset"]] = position
+        kind = entry["kind"]
+        keys = [(kind,), (kind, "booklet", entry["booklet"]), (kind, "passage_id", entry.get("passage_id"))]
+        if kind == KIND_QUESTION:
+            keys += [(kind, "question_number", entry.get("question_number")), (kind, "type", entry.get("type"))]
+        for key in keys:
+            self._lookup.setdefault(key, []).append(position)
+
+    def _remap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if os.path.getsize(self.data_path) > 0:
+            with open(self.data_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _read(self, entry: Dict) -> bytes:
+        return self._mmap[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def _segment_path(self, booklet: int) -> str:
+        return os.path.join(self.search_dir, f"{booklet}.json")
+
+    def ingest(self, set_title: str, passages: List[Passage], questions: List[Question]) -> int:
+        """
+        문제지 한 개를 추가합니다. 같은 제목이 이미 있으면 새 판으로 추가되어 이전 판을 대신합니다.
+
+        Returns:
+            int: 추가된 판 번호.
+        """
+        with self._lock:
+            booklet = self._next_booklet
+            records = [(KIND_PASSAGE, p, {"passage_id": p.passage_id}) for p in passages]
+            records += [(KIND_QUESTION, q, {"passage_id": q.passage_id, "question_number": q.question_number,
+                                             "type": q.metadata.type}) for q in questions]
+
+            entries = []
+            with open(self.data_path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                chunks = []
+                docs = []
+                for kind, item, fields in records:
+                    data = item.to_dict()
+                    body = _dumps(data)
+                    docs.append((offset, _search_text(kind, data)))
+                    entries.append({"kind": kind, "booklet": booklet, "offset": offset, "length": len(body), **fields})
+                    chunks.append(body)
+                    offset += len(body) + 1
+                if chunks:
+                    f.write(b"\n".join(chunks) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            # 검색 색인 조각과 데이터가 디스크에 기록된 뒤에 색인을 추가하고, 판 기록은 마지막 줄에 씀
+            segment = build_segment(docs)
+            save_segment(segment, self._segment_path(booklet))
+            booklet_entry = {"kind": KIND_BOOKLET, "booklet": booklet, "title": set_title}
+            with open(self.index_path, "ab") as f:
+                f.write(b"".join(_dumps(entry) + b"\n" for entry in entries + [booklet_entry]))
+                f.flush()
+                os.fsync(f.fileno())
+
+            replaced = set_title in self._latest
+            self._next_booklet = booklet + 1
+            self._titles[booklet] = set_title
+            self._latest[set_title] = booklet
+            for entry in entries:
+                self._add_entry(entry)
+            self._remap()
+            if self._search is not None:
+                if replaced:
+                    self._search = None  # 이전 판의 문서를 빼야 하므로 다음 검색 때 다시 불러옴
+                else:
+                    self._search.add_segment(segment)
+            return booklet
+
+    def ingest_file(self, json_path: str, set_title: Optional[str] = None) -> int:
+        """결과 JSON 파일 한 개를 추가합니다. (load_sets_json 참고)"""
+        title, passages, questions = load_sets_json(json_path)
+        return self.ingest(set_title or title, passages, questions)
+
+    def booklets(self) -> List[str]:
+        """현재 문제지 제목 목록 (추가한 순서)"""
+        return sorted(self._latest, key=self._latest.get)
+
+    def _select(self, kind: str, booklet: Optional[str] = None, **fields) -> Iterator[Dict]:
+        filters = {name: value for name, value in fields.items() if value is not None}
+        if booklet is not None:
+            if booklet not in self._latest:
+                return
+            filters["booklet"] = self._latest[booklet]
+        # 가장 짧은 후보 목록에서 시작하여 나머지 조건은 색인 항목에서 직접 비교
+        candidates = min([self._lookup.get((kind,), [])] + [self._lookup.get((kind, name, value), [])
+                                                             for name, value in filters.items()], key=len)
+        latest = set(self._latest.values())
+        for position in candidates:
+            entry = self._entries[position]
+            if entry["booklet"] in latest and all(entry.get(name) == value for name, value in filters.items()):
+                yield entry
+
+    def find(self, booklet: Optional[str] = None, passage_id: Optional[str] = None,
+             question_number: Optional[int] = None, q_type: Optional[str] = None) -> List[Tuple[str, Question]]:
+        """
+        조건에 맞는 문제를 찾습니다. 조건을 주지 않은 필드는 거르지 않습니다.
+
+        Returns:
+            List[Tuple[str, Question]]: (문제지 제목, 문제) 목록. 은행에 추가한 순서.
+        """
+        with self._lock:
+            return [
+                (self._titles[entry["booklet"]], Question.from_dict(json.loads(self._read(entry))))
+                for entry in self._select(KIND_QUESTION, booklet, passage_id=passage_id,
+                                          question_number=question_number, type=q_type)
+            ]
+
+    def find_passages(self, booklet: Optional[str] = None, passage_id: Optional[str] = None) -> List[Tuple[str, Passage]]:
+        """조건에 맞는 지문을 (문제지 제목, 지문) 목록으로 찾습니다."""
+        with self._lock:
+            return [
+                (self._titles[entry["booklet"]], Passage.from_dict(json.loads(self._read(entry))))
+                for entry in self._select(KIND_PASSAGE, booklet, passage_id=passage_id)
+            ]
+
+    def _search_index(self) -> SearchIndex:
+        if self._search is None:
+            segments = []
+            for booklet in self._latest.values():
+                path = self._segment_path(booklet)
+                if not os.path.exists(path):
+                    # 검색 색인 조각이 없는 판은 저장된 레코드로 다시 만듦
+                    entries = [self._entries[p] for p in self._lookup.get((KIND_PASSAGE, "booklet", booklet), [])]
+                    entries += [self._entries[p] for p in self._lookup.get((KIND_QUESTION, "booklet", booklet), [])]
+                    save_segment(build_segment(
+                        (entry["offset"], _search_text(entry["kind"], json.loads(self._read(entry)))) for entry in entries
+                    ), path)
+                segments.append(load_segment(path))
+            self._search = SearchIndex(segments)
+        return self._search
+
+    def search(self, query: str, limit: int = 20,
+               kind: Optional[str] = None) -> List[Tuple[float, str, Union[Passage, Question]]]:
+        """
+        지문 내용, 문제 본문과 선택지를 전문 검색합니다.
+
+        Args:
+            query (str): 검색어 (e.g., "밑줄 긋기").
+            limit (int): 최대 결과 수.
+            kind (Optional[str]): "passage" 또는 "question"이면 그 종류만 검색.
+
+        Returns:
+            List[Tuple[float, str, Union[Passage, Question]]]: (점수, 문제지 제목, 지문 또는 문제) 목록. 관련도 순.
+        """
+        with self._lock:
+            results = []
+            for doc_id, score in self._search_index().search(query, limit=None):
+                entry = self._entries[self._by_offset[doc_id]]
+                if kind is not None and entry["kind"] != kind:
+                    continue
+                model_cls = Passage if entry["kind"] == KIND_PASSAGE else Question
+                results.append((score, self._titles[entry["booklet"]], model_cls.from_dict(json.loads(self._read(entry)))))
+                if len(results) >= limit:
+                    break
+            return results
+
+    def export_json(self, booklet: str, output_path: str):
+        """
+        문제지 한 개를 build_result_dict 형태의 JSON 파일로 내보냅니다.
+        레코드를 역직렬화하지 않고 저장된 JSON 바이트를 그대로 이어 붙이며, 요약 통계는 색인으로 계산합니다.
+        """
+        with self._lock:
+            passages = list(self._select(KIND_PASSAGE, booklet))
+            questions = list(self._select(KIND_QUESTION, booklet))
+            passage_bytes = [self._read(entry) for entry in passages]
+            question_bytes = [self._read(entry) for entry in questions]
+        type_counts: Dict[str, int] = {}
+        for entry in questions:
+            type_counts[entry["type"]] = type_counts.get(entry["type"], 0) + 1
+        summary = {"total_passages": len(passages), "total_questions": len(questions), "question_types": type_counts}
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(b'{"set_title":' + _dumps(booklet) + b',"passages":[')
+            f.write(b",".join(passage_bytes))
+            f.write(b'],"questions":[')
+            f.write(b",".join(question_bytes))
+            f.write(b'],"summary":' + _dumps(summary) + b"}")
+
+    def export_all(self, output_dir: str) -> List[str]:
+        """모든 문제지를 output_dir/<제목>.json으로 내보내고 경로 목록을 반환합니다."""
+        paths = []
+        for title in self.booklets():
+            path = os.path.join(output_dir, f"{title}.json")
+            self.export_json(title, path)
+            paths.append(path)
+        return paths
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="문제 은행 저장소")
+    parser.add_argument("--bank-dir", default=DEFAULT_BANK_DIR, help="문제 은행 폴더")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser("ingest", help="결과 JSON 파일들을 문제 은행에 추가")
+    ingest_parser.add_argument("inputs", nargs="+", help="main.py 출력 또는 편집기에서 저장한 JSON 파일")
+    ingest_parser.add_argument("--title", help="문제지 제목 (파일 한 개일 때만)")
+
+    commands.add_parser("list", help="문제지 목록 출력")
+
+    find_parser = commands.add_parser("find", help="문제 조회")
+    find_parser.add_argument("--booklet", help="문제지 제목")
+    find_parser.add_argument("--passage-id", help="지문 ID")
+    find_parser.add_argument("--number", type=int, help="문제 번호")
+    find_parser.add_argument("--type", help="문제 유형")
+    find_parser.add_argument("--json", action="store_true", help="문제를 JSON 줄로 출력")
+
+    search_parser = commands.add_parser("search", help="지문/문제 전문 검색")
+    search_parser.add_argument("query", help="검색어")
+    search_parser.add_argument("--kind", choices=[KIND_PASSAGE, KIND_QUESTION], help="지문 또는 문제만 검색")
+    search_parser.add_argument("--limit", type=int, default=20, help="최대 결과 수")
+
+    export_parser = commands.add_parser("export", help="문제지를 결과 JSON 형태로 내보내기")
+    export_parser.add_argument("--outdir", required=True, help="JSON을 저장할 폴더")
+    export_parser.add_argument("--booklet", help="내보낼 문제지 제목 (생략 시 전체)")
+    args = parser.parse_args()
+
+    if args.command == "ingest" and args.title and len(args.inputs) > 1:
+        parser.error("--title은 파일 한 개를 추가할 때만 쓸 수 있습니다")
+
+    with QuestionBank(args.bank_dir) as bank:
+        if args.command == "ingest":
+            for json_path in args.inputs:
+                try:
+                    booklet = bank.ingest_file(json_path, args.title)
+                except ValueError as e:
+                    # 출력 폴더를 통째로 넘겨도 결과 JSON이 아닌 파일만 건너뜀
+                    print(f"[WARNING] 건너뜀: {e}")
+                    continue
+                print(f"[INFO] 추가됨: {json_path} (판 {booklet})")
+        elif args.command == "list":
+            for title in bank.booklets():
+                print(title)
+        elif args.command == "find":
+            results = bank.find(args.booklet, args.passage_id, args.number, args.type)
+            for title, q in results:
+                if args.json:
+                    print(json.dumps({"booklet": title, **q.to_dict()}, ensure_ascii=False))
+                else:
+                    stem = q.stem.replace("\n", " ")
+                    print(f"[{title}] {q.passage_id} {q.question_number}번 ({q.metadata.type}) {stem[:60]}")
+            print(f"[INFO] {len(results)}개 문제")
+        elif args.command == "search":
+            start = time.perf_counter()
+            results = bank.search(args.query, args.limit, args.kind)
+            elapsed = time.perf_counter() - start
+            for score, title, item in results:
+                if isinstance(item, Passage):
+                    label, text = f"지문 {item.question_range or item.passage_id}", item.content
+                else:
+                    label, text = f"{item.question_number}번 ({item.metadata.type})", item.stem
+                text = text.replace("\n", " ")
+                print(f"{score:6.2f} [{title}] {label} {text[:60]}")
+            print(f"[INFO] {len(results)}개 결과 ({elapsed * 1000:.1f}ms)")
+        elif args.command == "export":
+            if args.booklet:
+                if args.booklet not in bank.booklets():
+                    print(f"[ERROR] 문제지가 없습니다: {args.booklet}")
+                    raise SystemExit(1)
+                path = os.path.join(args.outdir, f"{args.booklet}.json")
+                bank.export_json(args.booklet, path)
+                paths = [path]
+            else:
+                paths = bank.export_all(args.outdir)
+            print(f"[INFO] {len(paths)}개 문제지 저장됨: {args.outdir}")
+
+if __name__ == "__main__":
+    main()
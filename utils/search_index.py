@@ -0,0 +1,121 @@
+"""
+지문/문제 전문 검색 색인
+한국어는 띄어쓰기 단위로 형태소가 붙어 있으므로 어절마다 글자 두 개씩 겹쳐 자른 바이그램을 색인어로 씁니다.
+("밑줄 긋기" -> 밑줄, 긋기 / "긋기는" -> 긋기, 기는)
+문제지(판)마다 역색인 조각(세그먼트)을 한 번 만들어 파일로 저장하고, 검색 시 현재 판의 조각들을 합쳐 BM25로 순위를 매깁니다.
+"""
+
+import json
+import math
+import os
+import re
+import tempfile
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    """텍스트를 바이그램 색인어 목록으로 바꿉니다. 한 글자 어절은 그대로 씁니다."""
+    terms = []
+    for word in _WORD_PATTERN.findall(unicodedata.normalize("NFKC", text or "").lower()):
+        if len(word) == 1:
+            terms.append(word)
+        else:
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+def build_segment(docs: Iterable[Tuple[int, str]]) -> Dict:
+    """
+    (문서 ID, 텍스트) 목록으로 역색인 조각을 만듭니다.
+    게시 목록은 조각 안의 문서 순번과 빈도를 번갈아 늘어놓은 평평한 목록입니다.
+
+    Returns:
+        {"docs": [[문서 ID, 색인어 수], ...], "postings": {색인어: [순번, 빈도, 순번, 빈도, ...]}}
+    """
+    doc_list = []
+    postings: Dict[str, List[int]] = {}
+    for doc_id, text in docs:
+        counts = Counter(tokenize(text))
+        local_id = len(doc_list)
+        doc_list.append([doc_id, sum(counts.values())])
+        for term, tf in counts.items():
+            postings.setdefault(term, []).extend((local_id, tf))
+    return {"docs": doc_list, "postings": postings}
+
+def save_segment(segment: Dict, path: str):
+    """조각을 임시 파일에 쓴 뒤 이름을 바꾸어, 중간에 멈추더라도 반쪽짜리 조각이 남지 않게 합니다."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(segment, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+def load_segment(path: str) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+class SearchIndex:
+    """
+    여러 조각을 묶은 메모리 역색인
+    조각을 하나의 게시 목록으로 합치지 않고 그대로 두어, 불러올 때 JSON 해석 외의 작업이 거의 없습니다.
+    """
+
+    def __init__(self, segments: Iterable[Dict] = ()):
+        self.segments: List[Dict] = []
+        self.n_docs = 0
+        self.total_length = 0
+        self._norms_dirty = False
+        for segment in segments:
+            self.add_segment(segment)
+
+    def add_segment(self, segment: Dict):
+        segment["ids"] = [doc_id for doc_id, _ in segment["docs"]]
+        self.segments.append(segment)
+        self.n_docs += len(segment["docs"])
+        self.total_length += sum(length for _, length in segment["docs"])
+        self._norms_dirty = True
+
+    def _update_norms(self):
+        # 문서 길이 정규화 값은 평균 길이가 바뀔 때(조각 추가)만 다시 계산
+        avg_length = self.total_length / self.n_docs
+        for segment in self.segments:
+            segment["norms"] = [BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) for _, length in segment["docs"]]
+        self._norms_dirty = False
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Tuple[int, float]]:
+        """
+        질의와 관련된 문서를 순위대로 찾습니다.
+        질의의 색인어를 더 많이 포함한 문서를 먼저 두고, 같으면 BM25 점수 순으로 정렬합니다.
+        limit이 None이면 색인어가 하나라도 맞은 문서를 모두 반환합니다.
+
+        Returns:
+            List[Tuple[int, float]]: (문서 ID, BM25 점수) 목록.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self.n_docs:
+            return []
+        if self._norms_dirty:
+            self._update_norms()
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for term in terms:
+            plists = [(segment, segment["postings"][term]) for segment in self.segments if term in segment["postings"]]
+            df = sum(len(plist) for _, plist in plists) // 2
+            if not df:
+                continue
+            idf = math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+            weight = idf * (BM25_K1 + 1)
+            for segment, plist in plists:
+                ids, norms = segment["ids"], segment["norms"]
+                for local_id, tf in zip(plist[::2], plist[1::2]):
+                    doc_id = ids[local_id]
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * tf / (tf + norms[local_id])
+                    matched[doc_id] = matched.get(doc_id, 0) + 1
+        ranked = sorted(scores, key=lambda doc_id: (matched[doc_id], scores[doc_id]), reverse=True)
+        return [(doc_id, scores[doc_id]) for doc_id in ranked[:limit]]
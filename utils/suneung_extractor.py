@@ -6,10 +6,11 @@
 import os
 import json
 from typing import List, Dict, Tuple
-from parser.text_extractor import extract_text_from_pdf, extract_question_images
-from parser.structured_parser import parse_all_passages_and_questions
+from parser.text_extractor import extract_text_from_pdf
+from parser.structured_parser import parse_all_passages_and_questions, extract_all_images
 from model.passage import Passage
 from model.question import Question
+from utils.profiling import RunProfile
 
 class SuneungExtractor:
     """수능 국어 PDF 추출 통합 클래스"""
@@ -35,28 +36,40 @@ class SuneungExtractor:
         output_dir = os.path.join(self.output_base_dir, safe_title)
         os.makedirs(output_dir, exist_ok=True)
         
-        # 1. 텍스트 추출
-        print("📝 텍스트 추출 중...")
-        raw_text = extract_text_from_pdf(pdf_path)
-        self._save_raw_text(raw_text, output_dir)
-        
-        # 2. 이미지 추출
-        print("🖼️ 문항 이미지 추출 중...")
-        img_dir = os.path.join(output_dir, "question_images")
-        img_results = extract_question_images(pdf_path, img_dir)
-        
-        # 3. 구조화 파싱
-        print("🔍 지문 및 문제 파싱 중...")
-        passages, questions = parse_all_passages_and_questions(raw_text)
-        
-        # 4. 결과 저장
-        result = self._create_result_dict(title, passages, questions, img_results, output_dir)
-        self._save_all_results(result, output_dir)
+        profile = RunProfile(title)
+        with profile:
+            # 1. 텍스트 추출
+            print("📝 텍스트 추출 중...")
+            with profile.span("extract_text"):
+                raw_text = extract_text_from_pdf(pdf_path)
+                self._save_raw_text(raw_text, output_dir)
+
+            # 2. 구조화 파싱
+            print("🔍 지문 및 문제 파싱 중...")
+            with profile.span("parse") as stage:
+                passages, questions = parse_all_passages_and_questions(raw_text)
+                stage.count("passages", len(passages))
+                stage.count("questions", len(questions))
+
+            # 3. 이미지 추출
+            print("🖼️ 문항 이미지 추출 중...")
+            img_dir = os.path.join(output_dir, "question_images")
+            with profile.span("extract_images") as stage:
+                img_results = _extract_images(pdf_path, passages, questions, img_dir)
+                stage.count("images", sum(1 for img in img_results if img["image_path"] or img["choices_image_path"]))
+
+            # 4. 결과 저장
+            with profile.span("write_results"):
+                result = self._create_result_dict(title, passages, questions, img_results, output_dir)
+                self._save_all_results(result, output_dir)
+
+        profile.save(os.path.join(output_dir, "timing_report.json"))
         
         print(f"✅ 추출 완료!")
         print(f"📁 출력 디렉터리: {output_dir}")
         print(f"📄 지문 수: {len(passages)}")
         print(f"❓ 문제 수: {len(questions)}")
+        print(f"⏱️ 단계별 소요 시간: " + ", ".join(f"{stage.name} {stage.seconds:.2f}초" for stage in profile.stages.values()))
         
         return result
     
@@ -206,6 +219,19 @@ class SuneungExtractor:
         
         return "\n".join(lines)
 
+def _extract_images(pdf_path: str, passages: List[Passage], questions: List[Question], img_dir: str) -> List[Dict]:
+    """문제/선택지 이미지를 일괄 추출하고 문제별 이미지 경로 목록을 반환합니다."""
+    extract_all_images(pdf_path, passages, questions, img_dir)
+    return [
+        {
+            "passage_id": q.passage_id,
+            "question_number": q.question_number,
+            "image_path": q.image_path,
+            "choices_image_path": q.choices_image_path
+        }
+        for q in questions
+    ]
+
 # 편의 함수들
 def quick_extract(pdf_path: str, title: str = None, output_dir: str = None) -> Dict:
     """빠른 추출 함수"""
@@ -220,12 +246,12 @@ def extract_with_streamlit_compatibility(pdf_path: str) -> Tuple[List[Passage],
     # 텍스트 추출
     raw_text = extract_text_from_pdf(pdf_path)
     
-    # 이미지 추출
-    img_results = extract_question_images(pdf_path, "./data/question_images")
-    
     # 파싱
     passages, questions = parse_all_passages_and_questions(raw_text)
     
+    # 이미지 추출
+    img_results = _extract_images(pdf_path, passages, questions, "./data/question_images")
+    
     return passages, questions, img_results
 
 # 사용 예제